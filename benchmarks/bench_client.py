@@ -0,0 +1,181 @@
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.server import PASSWORD, USERNAME, StandInServer
+from tui.async_client import AsyncBackend
+from tui.client import Backend
+from tui.domain import Password, Username, short
+from tui.metrics import percentile
+from tui.transport import TransportConfig
+
+
+def _succeeded(result) -> bool:
+    return result[0] if isinstance(result, tuple) else bool(result)
+
+
+def summarize(latencies: list, elapsed: float, failures: int = 0) -> dict:
+    ms = 1000
+    return {
+        "count": len(latencies),
+        "failures": failures,
+        "elapsed_s": elapsed,
+        "ops_per_s": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * ms,
+        "p95_ms": percentile(latencies, 95) * ms,
+        "p99_ms": percentile(latencies, 99) * ms,
+    }
+
+
+def bench(fn, items) -> dict:
+    latencies = []
+    failures = 0
+    start = time.perf_counter()
+    for item in items:
+        t = time.perf_counter()
+        result = fn(item)
+        latencies.append(time.perf_counter() - t)
+        failures += not _succeeded(result)
+    return summarize(latencies, time.perf_counter() - start, failures)
+
+
+def bench_concurrent(backend: Backend, method: str, items, concurrency: int) -> dict:
+    latencies = []
+
+    async def run():
+        async with AsyncBackend(backend, concurrency=concurrency) as client:
+            call = getattr(client, method)
+
+            async def timed(item):
+                t = time.perf_counter()
+                result = await call(item)
+                latencies.append(time.perf_counter() - t)
+                return result
+
+            return await client.map(timed, items)
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    failures = sum(not _succeeded(r) for r in results)
+    return summarize(latencies, elapsed, failures)
+
+
+def run_scenario(links: int, ops: int, list_repeat: int, concurrency: int) -> dict:
+    with StandInServer() as server:
+        server.store.seed(links)
+        config = TransportConfig(base_url=server.base_url, pool_maxsize=concurrency)
+        backend = Backend(cache_ttl=0, config=config)
+        user, pw = Username(USERNAME), Password(PASSWORD)
+        results = {}
+
+        results["login"] = bench(lambda _: backend.login(user, pw), range(ops))
+
+        def full_list(_):
+            backend.validators.clear()
+            backend.sync_mark = None
+            return backend.getShortUrl(refresh=True)
+
+        def delta_list(_):
+            backend.validators.clear()
+            return backend.sync()
+
+        results["list"] = bench(full_list, range(list_repeat))
+        results["list_delta"] = bench(delta_list, range(list_repeat))
+        results["list_not_modified"] = bench(
+            lambda _: backend.getShortUrl(refresh=True), range(list_repeat)
+        )
+
+        def first_row(_):
+            rows = backend.iter_short_urls()
+            next(rows, None)
+            rows.close()
+            return True
+
+        results["list_first_row"] = bench(first_row, range(list_repeat))
+
+        new = [short(f"https://example.com/new/{n}", f"new {n}") for n in range(ops)]
+        results["create"] = bench(backend.createUrl, new)
+        results["create_concurrent"] = bench_concurrent(
+            backend, "createUrl", new, concurrency
+        )
+
+        backend.sync_mark = None
+        created = backend.getShortUrl(refresh=True)[1][links:]
+        half = len(created) // 2
+        results["lookup"] = bench(lambda s: backend.get_short(s.code), created)
+        results["edit"] = bench(
+            lambda s: backend.edit_fields(s, {"label": "edited", "private": True}),
+            created,
+        )
+        results["delete"] = bench(backend.deleteUrl, created[:half])
+        results["delete_concurrent"] = bench_concurrent(
+            backend, "deleteUrl", created[half:], concurrency
+        )
+
+        return {
+            "links": links,
+            "results": results,
+            "client_metrics": backend.session.report(),
+        }
+
+
+def print_table(run: dict) -> None:
+    print(f"\n{run['links']} links")
+    header = f"{'OPERATION':<20} | {'OPS/S':>10} | {'P50 MS':>8} | {'P95 MS':>8} | {'P99 MS':>8} | {'FAIL':>4}"
+    print(header)
+    print("-" * len(header))
+    for name, r in run["results"].items():
+        print(
+            f"{name:<20} | {r['ops_per_s']:>10.1f} | {r['p50_ms']:>8.2f} | "
+            f"{r['p95_ms']:>8.2f} | {r['p99_ms']:>8.2f} | {r['failures']:>4}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the ShortCat client against a local stand-in server"
+    )
+    parser.add_argument(
+        "--links",
+        default="1000,10000",
+        help="comma separated number of links to seed (e.g. 1000,100000,1000000)",
+    )
+    parser.add_argument("--ops", type=int, default=200, help="calls per operation")
+    parser.add_argument(
+        "--list-repeat", type=int, default=5, help="full list downloads per run"
+    )
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--output", default="bench_output.json")
+    args = parser.parse_args(argv)
+
+    counts = [int(n) for n in args.links.split(",") if n.strip()]
+    runs = []
+    for links in counts:
+        run = run_scenario(links, args.ops, args.list_repeat, args.concurrency)
+        print_table(run)
+        runs.append(run)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "ops": args.ops,
+            "list_repeat": args.list_repeat,
+            "concurrency": args.concurrency,
+        },
+        "runs": runs,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
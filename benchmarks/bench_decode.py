@@ -0,0 +1,99 @@
+import argparse
+import json
+import sys
+import time
+
+from tui.domain import ShortUrl, parse_datetime
+
+
+def make_rows(count: int) -> list:
+    return [
+        {
+            "code": f"b{n:07x}",
+            "target": f"https://example.com/campaign/{n}?utm_source=bench",
+            "label": f"link {n}",
+            "private": n % 3 == 0,
+            "expired_at": f"2030-01-{n % 28 + 1:02d}T12:00:00Z" if n % 2 else None,
+            "created_at": f"2025-06-{n % 28 + 1:02d}T08:30:00.{n % 1000:06d}Z",
+            "updated_at": f"2025-07-{n % 28 + 1:02d}T09:45:00.{n % 997:06d}Z",
+        }
+        for n in range(count)
+    ]
+
+
+def per_row(items: list) -> list:
+    return [
+        ShortUrl(
+            code=item["code"],
+            target=item["target"],
+            label=item.get("label", ""),
+            private=item.get("private", False),
+            expired_at=item.get("expired_at"),
+            created_at=item.get("created_at"),
+            updated_at=item.get("updated_at"),
+            user=None,
+        )
+        for item in items
+    ]
+
+
+def per_row_parsed(items: list) -> list:
+    return [
+        ShortUrl(
+            code=item["code"],
+            target=item["target"],
+            label=item.get("label", ""),
+            private=item.get("private", False),
+            expired_at=parse_datetime(item.get("expired_at")),
+            created_at=parse_datetime(item.get("created_at")),
+            updated_at=parse_datetime(item.get("updated_at")),
+            user=None,
+        )
+        for item in items
+    ]
+
+
+DECODERS = {
+    "constructor_raw": per_row,
+    "constructor_parsed": per_row_parsed,
+    "from_api_batch": ShortUrl.from_api_batch,
+}
+
+
+def bench_decoder(fn, items: list, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(items)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    return {"best_s": best, "objects_per_s": len(items) / best if best else 0.0}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark decoding API rows into ShortUrl objects"
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args(argv)
+
+    items = make_rows(args.rows)
+    results = {
+        name: bench_decoder(fn, items, args.repeat) for name, fn in DECODERS.items()
+    }
+
+    print(f"\n{args.rows} rows, best of {args.repeat}")
+    print(f"{'DECODER':<20} | {'OBJECTS/S':>12} | {'BEST MS':>9}")
+    for name, r in results.items():
+        print(f"{name:<20} | {r['objects_per_s']:>12.0f} | {r['best_s'] * 1000:>9.2f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"rows": args.rows, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import argparse
+import csv
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+from tui.bulk import read_rows
+from tui.validators import validate_urls
+
+
+def write_file(path: Path, rows: int) -> None:
+    with path.open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["target", "label", "expired_at", "private"])
+        for n in range(rows):
+            writer.writerow(
+                [
+                    f"https://example.com/campaign/{n}?utm_source=bench",
+                    f"link {n}",
+                    "2031-01-01 10:00" if n % 2 else "",
+                    "yes" if n % 3 == 0 else "",
+                ]
+            )
+
+
+def urlparse_each(urls: list) -> list:
+    # the per-row check the import used before the batch validators
+    results = []
+    for url in urls:
+        parsed = urlparse(url)
+        results.append(parsed.scheme in ("http", "https") and bool(parsed.netloc))
+    return results
+
+
+def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def run(rows: int) -> dict:
+    urls = [f"https://example.com/campaign/{n}?utm_source=bench" for n in range(rows)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "import.csv"
+        write_file(path, rows)
+        timings = {
+            "urlparse_each": timed(urlparse_each, urls),
+            "validate_urls": timed(validate_urls, urls),
+            "read_rows": timed(lambda: sum(1 for _ in read_rows(path))),
+        }
+    return {
+        name: {"best_s": elapsed, "rows_per_s": rows / elapsed if elapsed else 0.0}
+        for name, elapsed in timings.items()
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark validating an import file without any network call"
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args(argv)
+
+    results = run(args.rows)
+
+    print(f"\n{args.rows} rows")
+    print(f"{'STEP':<16} | {'ROWS/S':>12} | {'TOTAL MS':>10}")
+    for name, r in results.items():
+        print(f"{name:<16} | {r['rows_per_s']:>12.0f} | {r['best_s'] * 1000:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"rows": args.rows, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+
+from benchmarks.bench_decode import make_rows
+from tui.domain import ShortUrl
+from tui.table import ShortUrlTable
+
+CONTAINERS = {
+    "list[ShortUrl]": ShortUrl.from_api_batch,
+    "ShortUrlTable": ShortUrlTable.from_api_batch,
+}
+
+
+def measure(build, payload: bytes) -> int:
+    # decode inside the traced region and drop the rows afterwards so the
+    # figure is what the container keeps alive, strings included
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        items = json.loads(payload)
+        container = build(items)
+        del items
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del container
+    return after - before
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compare the memory held by ShortUrl lists and ShortUrlTable"
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args(argv)
+
+    rows = make_rows(args.rows)
+    payload = json.dumps(rows).encode()
+    # the UTF-8 text of code, target and label has to be kept by any container
+    text = sum(
+        len(row["code"].encode())
+        + len(row["target"].encode())
+        + len(row["label"].encode())
+        for row in rows
+    ) / max(1, args.rows)
+    del rows
+
+    results = {}
+    for name, build in CONTAINERS.items():
+        used = measure(build, payload)
+        per_link = used / max(1, args.rows)
+        results[name] = {
+            "bytes": used,
+            "bytes_per_link": per_link,
+            "overhead_per_link": per_link - text,
+        }
+
+    print(f"\n{args.rows} links, {text:.1f} bytes of text per link")
+    print(f"{'CONTAINER':<16} | {'MB':>9} | {'BYTES/LINK':>10} | {'OVERHEAD/LINK':>13}")
+    for name, r in results.items():
+        print(
+            f"{name:<16} | {r['bytes'] / 2**20:>9.1f} | {r['bytes_per_link']:>10.1f} | "
+            f"{r['overhead_per_link']:>13.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"rows": args.rows, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+import argparse
+import json
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+from tui.checks import BOUNDARY, OFF, STRICT, trusted, validation_policy
+from tui.domain import Email, Password, ShortUrl, Username, short
+from tui.menu import Description, Entry, Key
+
+NOW = datetime(2025, 1, 1)
+
+OBJECTS = {
+    "Username": lambda n: Username(f"user{n}"),
+    "Password": lambda n: Password(f"Secret{n}!pass"),
+    "Email": lambda n: Email(f"user{n}@example.com"),
+    "Key": lambda n: Key(str(n % 10)),
+    "Description": lambda n: Description(f"MENU ENTRY {n % 10}"),
+    "Entry.create": lambda n: Entry.create(str(n % 10), "MENU ENTRY"),
+    "ShortUrl": lambda n: ShortUrl(
+        code=f"c{n}", label="x", target="https://a.it", user=None, updated_at=NOW
+    ),
+    "short": lambda n: short("https://a.it", f"label {n}"),
+}
+
+# tier name -> (policy, whether objects are built inside trusted())
+TIERS = {
+    "strict": (STRICT, False),
+    "boundary": (BOUNDARY, False),
+    "trusted": (BOUNDARY, True),
+    "off": (OFF, False),
+}
+
+
+def bench_object(build, count: int, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for n in range(count):
+            build(n)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count / best if best else 0.0
+
+
+def run(count: int, repeat: int) -> dict:
+    results = {}
+    for tier, (policy, inside) in TIERS.items():
+        with validation_policy(policy), trusted() if inside else nullcontext():
+            results[tier] = {
+                name: bench_object(build, count, repeat)
+                for name, build in OBJECTS.items()
+            }
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark value object construction under each validation tier"
+    )
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="")
+    args = parser.parse_args(argv)
+
+    results = run(args.count, args.repeat)
+
+    print(f"\n{args.count} objects each, best of {args.repeat}, objects/s")
+    header = f"{'OBJECT':<14}" + "".join(f" | {tier.upper():>10}" for tier in TIERS)
+    print(header)
+    print("-" * len(header))
+    for name in OBJECTS:
+        print(
+            f"{name:<14}"
+            + "".join(f" | {results[tier][name]:>10.0f}" for tier in TIERS)
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"count": args.count, "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+import json
+import secrets
+import threading
+from datetime import datetime, timedelta, timezone
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+API_PREFIX = "/api/v1"
+USERNAME = "bench"
+PASSWORD = "BenchPass1!"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _parse(stamp: str) -> datetime:
+    return datetime.fromisoformat(stamp.replace("Z", "+00:00"))
+
+
+class Store:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.links = {}
+        self.users = {USERNAME: PASSWORD}
+        self.sessions = set()
+        self.tombstones = {}
+        self.version = 0
+        self._counter = 0
+
+    def _next_code(self) -> str:
+        self._counter += 1
+        return f"b{self._counter:07x}"
+
+    def seed(self, count: int) -> None:
+        expiry = (datetime.now(timezone.utc) + timedelta(days=365)).isoformat()
+        with self.lock:
+            stamp = _now()
+            for n in range(count):
+                code = self._next_code()
+                self.links[code] = {
+                    "code": code,
+                    "target": f"https://example.com/campaign/{n}?utm_source=bench",
+                    "label": f"link {n}",
+                    "private": n % 3 == 0,
+                    "expired_at": expiry if n % 2 else None,
+                    "created_at": stamp,
+                    "updated_at": stamp,
+                }
+            self.version += 1
+
+    def create(self, fields: dict) -> dict:
+        with self.lock:
+            code = self._next_code()
+            stamp = _now()
+            item = {
+                "code": code,
+                "target": fields.get("target", ""),
+                "label": fields.get("label", ""),
+                "private": str(fields.get("private", "")).lower() in ("true", "1"),
+                "expired_at": fields.get("expired_at") or None,
+                "created_at": stamp,
+                "updated_at": stamp,
+            }
+            self.links[code] = item
+            self.version += 1
+            return dict(item)
+
+    def update(self, code: str, fields: dict):
+        with self.lock:
+            item = self.links.get(code)
+            if item is None:
+                return None
+            for key in ("target", "label", "private", "expired_at"):
+                if key in fields:
+                    item[key] = fields[key]
+            item["updated_at"] = _now()
+            self.version += 1
+            return dict(item)
+
+    def delete(self, code: str) -> bool:
+        with self.lock:
+            if self.links.pop(code, None) is None:
+                return False
+            self.tombstones[code] = _now()
+            self.version += 1
+            return True
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ShortCatStandIn/1.0"
+    disable_nagle_algorithm = True
+
+    @property
+    def store(self) -> Store:
+        return self.server.store
+
+    def log_message(self, *args):
+        pass
+
+    def _cookies(self) -> dict:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return {key: morsel.value for key, morsel in cookie.items()}
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if not raw:
+            return {}
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            return json.loads(raw)
+        return {key: values[-1] for key, values in parse_qs(raw.decode()).items()}
+
+    def _send(self, status: int, payload=None, headers=()) -> None:
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        for key, value in headers:
+            self.send_header(key, value)
+        if payload is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        if self._cookies().get("sessionid") in self.store.sessions:
+            return True
+        self._send(403, {"detail": "Authentication credentials were not provided."})
+        return False
+
+    def _route(self):
+        parts = urlsplit(self.path)
+        path = parts.path
+        if not path.startswith(API_PREFIX):
+            return None, None, parts
+        path = path[len(API_PREFIX) :].strip("/")
+        segments = path.split("/") if path else []
+        if segments[:1] == ["shorts"] and len(segments) == 2:
+            return "short", segments[1], parts
+        return "/".join(segments), None, parts
+
+    def do_POST(self):
+        route, _, _ = self._route()
+        fields = self._body()
+        if route == "auth/login":
+            username = fields.get("username")
+            if self.store.users.get(username) != fields.get("password"):
+                return self._send(400, {"non_field_errors": ["Unable to log in."]})
+            session_id = secrets.token_hex(16)
+            self.store.sessions.add(session_id)
+            cookies = [
+                ("Set-Cookie", f"sessionid={session_id}; Path=/"),
+                ("Set-Cookie", f"csrftoken={secrets.token_hex(16)}; Path=/"),
+            ]
+            return self._send(200, {"key": session_id}, headers=cookies)
+        if route == "auth/logout":
+            self.store.sessions.discard(self._cookies().get("sessionid"))
+            return self._send(200, {"detail": "Successfully logged out."})
+        if route == "shorts":
+            if self._authorized():
+                self._send(201, self.store.create(fields))
+            return
+        self._send(404, {"detail": "Not found."})
+
+    def do_GET(self):
+        route, code, parts = self._route()
+        if route == "auth/user":
+            if self._authorized():
+                self._send(200, {"username": USERNAME})
+            return
+        if route == "short":
+            if self._authorized():
+                item = self.store.links.get(code)
+                if item is None:
+                    return self._send(404, {"detail": "Not found."})
+                self._send(200, item)
+            return
+        if route == "shorts":
+            if self._authorized():
+                self._list(parse_qs(parts.query))
+            return
+        self._send(404, {"detail": "Not found."})
+
+    def _changes(self, since: datetime) -> list:
+        with self.store.lock:
+            items = [
+                dict(item)
+                for item in self.store.links.values()
+                if _parse(item["updated_at"]) > since
+            ]
+            items += [
+                {"code": code, "deleted": True, "updated_at": stamp}
+                for code, stamp in self.store.tombstones.items()
+                if _parse(stamp) > since
+            ]
+        return items
+
+    def _list(self, query: dict) -> None:
+        with self.store.lock:
+            etag = f'"{self.store.version}"'
+            items = list(self.store.links.values())
+        if "updated_since" in query:
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, headers=[("ETag", etag)])
+            since = _parse(query["updated_since"][0])
+            return self._send(200, self._changes(since), headers=[("ETag", etag)])
+
+        if "page" not in query and self.headers.get("If-None-Match") == etag:
+            return self._send(304, headers=[("ETag", etag)])
+
+        if "page" not in query:
+            return self._send(200, items, headers=[("ETag", etag)])
+
+        page = max(1, int(query["page"][0]))
+        size = max(1, int(query.get("page_size", ["100"])[0]))
+        start = (page - 1) * size
+        next_url = None
+        if start + size < len(items):
+            host = self.headers.get("Host")
+            params = urlencode({"page": page + 1, "page_size": size})
+            next_url = f"http://{host}{API_PREFIX}/shorts/?{params}"
+        self._send(
+            200,
+            {
+                "count": len(items),
+                "next": next_url,
+                "previous": None,
+                "results": items[start : start + size],
+            },
+        )
+
+    def do_PATCH(self):
+        route, code, _ = self._route()
+        if route != "short":
+            return self._send(404, {"detail": "Not found."})
+        if self._authorized():
+            item = self.store.update(code, self._body())
+            if item is None:
+                return self._send(404, {"detail": "Not found."})
+            self._send(200, item)
+
+    def do_DELETE(self):
+        route, code, _ = self._route()
+        if route != "short":
+            return self._send(404, {"detail": "Not found."})
+        if self._authorized():
+            if not self.store.delete(code):
+                return self._send(404, {"detail": "Not found."})
+            self._send(204)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), Handler)
+        self.store = Store()
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -1,9 +1,12 @@
+import json
 from datetime import datetime
 
 from unittest.mock import patch, MagicMock
 from valid8 import ValidationError
 
-from tui.domain import short
+from tui.client import Backend
+from tui.domain import ShortUrl, short
+from tui.table import ShortUrlTable
 from tui.app import (
     modify_target,
     modify_expire,
@@ -25,17 +28,100 @@ from tui.app import (
     edit_url,
     delete_url,
     url_history,
+    import_urls,
+    select_urls,
+    save_edit,
+    discard_edit,
+    browse,
+    search_urls,
+    remove_url,
+    import_profile,
+    resume_session,
+    LazyBackend,
     convert_url
 )
 
 import pytest
 
+@patch("tui.app.resume_session")
 @patch("tui.app.build_main_menu")
-def test_main_calls_build_main_menu_when_main(mock_build):
+def test_main_calls_build_main_menu_when_main(mock_build, mock_resume):
     main("__main__")
+    mock_resume.assert_called_once()
     mock_build.assert_called_once()
 
 
+@patch("tui.app.submenu")
+@patch("tui.app.client")
+@patch("tui.sessions.has_saved_session", return_value=True)
+def test_resume_session_opens_user_menu(mock_saved, mock_client, mock_submenu):
+    mock_client.resume_session.return_value = "Utente"
+
+    assert resume_session() is True
+
+    mock_client.open_session_store.assert_called_once()
+    mock_client.open_mirror.assert_called_once_with("Utente")
+    mock_submenu.assert_called_once()
+
+
+@patch("tui.app.submenu")
+@patch("tui.app.client")
+@patch("tui.sessions.has_saved_session", return_value=True)
+def test_resume_session_falls_back_to_login(mock_saved, mock_client, mock_submenu):
+    mock_client.resume_session.return_value = None
+
+    assert resume_session() is False
+
+    mock_submenu.assert_not_called()
+
+
+@patch("tui.app.client")
+@patch("tui.sessions.has_saved_session", return_value=False)
+def test_resume_session_skips_backend_without_saved_session(mock_saved, mock_client):
+    assert resume_session() is False
+
+    mock_client.open_session_store.assert_not_called()
+
+
+@patch("tui.app.import_profile")
+@patch("tui.app.build_main_menu")
+def test_main_import_profile(mock_build, mock_profile):
+    main("__main__", ["--import-profile", "--runs", "1"])
+
+    mock_profile.assert_called_once_with(["--import-profile", "--runs", "1"])
+    mock_build.assert_not_called()
+
+
+@patch("tui.startup.profile_imports")
+def test_import_profile_prints_and_writes_json(mock_profile, tmp_path, capsys):
+    mock_profile.return_value = {
+        "module": "tui.app",
+        "runs": 1,
+        "total_ms": 12.5,
+        "network": [],
+        "modules": {"tui.app": {"self_ms": 1.0, "cumulative_ms": 12.5}},
+    }
+    output = tmp_path / "profile.json"
+
+    import_profile(["--import-profile", "--runs", "1", "--output", str(output)])
+
+    mock_profile.assert_called_once_with(runs=1)
+    assert "import tui.app: 12.5 ms" in capsys.readouterr().out
+    assert json.loads(output.read_text())["total_ms"] == 12.5
+
+
+def test_lazy_backend_is_built_on_first_use():
+    lazy = LazyBackend()
+    assert lazy._backend is None
+
+    with patch("tui.client.Backend") as mock_backend:
+        lazy.getShortUrl()
+        lazy.search("x")
+
+    mock_backend.assert_called_once_with()
+    mock_backend.return_value.getShortUrl.assert_called_once_with()
+
+
 @patch("tui.app.submenu")
 @patch("tui.app.client")
 @patch("builtins.input", side_effect=["Utente"])
@@ -46,6 +132,9 @@ def test_do_login_success(mock_input, mock_getpass, mock_client, mock_submenu):
     do_login()
 
     mock_client.login.assert_called_once()
+    mock_client.open_journal.assert_called_once_with("Utente")
+    mock_client.open_mirror.assert_called_once_with("Utente")
+    mock_client.start_prefetch.assert_called_once()
     mock_submenu.assert_called_once()
 
 
@@ -276,11 +365,20 @@ def test_do_register_password_mismatch(
     assert any("Passwords do not match" in msg for msg in printed_messages)
 
 
+@patch("builtins.input", return_value="")
+@patch("tui.app.editmenu")
+def test_edit_url_calls_editmenu(mock_editmenu, mock_input):
+    edit_url()
+
+    mock_editmenu.assert_called_once_with("")
+
+
+@patch("builtins.input", return_value=" abc ")
 @patch("tui.app.editmenu")
-def test_edit_url_calls_editmenu(mock_editmenu):
+def test_edit_url_passes_the_code(mock_editmenu, mock_input):
     edit_url()
 
-    mock_editmenu.assert_called_once()
+    mock_editmenu.assert_called_once_with("abc")
 
 
 @patch("builtins.print")
@@ -466,8 +564,9 @@ def test_delete_url_failure(
     mock_print.assert_any_call("Error:", "Some error")
 
 
+@patch("tui.app.same_method", return_value="short123")
 @patch("tui.app.Menu.Builder")
-def test_editmenu_runs_menu(mock_builder_class):
+def test_editmenu_runs_menu(mock_builder_class, mock_same):
 
     mock_builder_instance = MagicMock()
     mock_builder_class.return_value = mock_builder_instance
@@ -761,6 +860,63 @@ def test_build_main_menu(mock_description, mock_builder_class):
     menu_mock.run.assert_called_once()
 
 
+@patch("builtins.print")
+@patch("builtins.input", return_value="0")
+def test_exit_keeps_the_saved_session(mock_input, mock_print, tmp_path, monkeypatch):
+    from cryptography.fernet import Fernet
+
+    monkeypatch.setenv("SHORTCAT_SESSION_KEY", Fernet.generate_key().decode())
+    backend = Backend()
+    backend.session = MagicMock()
+    backend.open_session_store(tmp_path)
+    backend.sessions.save("Utente", [])
+
+    with patch("tui.app.client", backend):
+        build_main_menu()
+
+    backend.session.post.assert_not_called()
+    assert backend.sessions.path.exists()
+
+
+@patch("builtins.print")
+@patch("builtins.input", return_value="0")
+def test_exit_logs_out_without_a_saved_session(mock_input, mock_print):
+    backend = Backend()
+    backend.session = MagicMock()
+
+    with patch("tui.app.client", backend):
+        build_main_menu()
+
+    assert backend.session.post.call_args.args[0].endswith("/auth/logout/")
+
+
+@patch("tui.app.Menu.Builder")
+def test_submenu_offers_logout(mock_builder_class):
+    builder = mock_builder_class.return_value
+    builder.with_entry.return_value = builder
+
+    with patch("builtins.print"):
+        submenu()
+
+    entries = [c.args[0] for c in builder.with_entry.call_args_list]
+    logout_entry = next(e for e in entries if str(e.description) == "LOGOUT")
+    assert logout_entry.on_selected is logout and logout_entry.is_exit
+
+
+@patch("builtins.print")
+@patch("tui.app.client")
+def test_url_history_reports_refused_offline_changes(mock_client, mock_print):
+    mock_client.cache.has_data = True
+    mock_client.getShortUrl.return_value = (True, [])
+    mock_client.pop_rejected.return_value = ["create ~ab12: 400: bad"]
+
+    url_history()
+
+    mock_print.assert_any_call(
+        "Offline change refused by the server:", "create ~ab12: 400: bad"
+    )
+
+
 @patch("builtins.input")
 def test_convert_url_invalid_date_format(mock_input, capsys):
     mock_input.side_effect = ["http://google.com", "MyLabel", "non-è-una-data", "no"]
@@ -944,3 +1100,487 @@ def test_do_login_value_error(
     assert "Login successful" in captured.out
 
     mock_submenu.assert_called_once()
+
+
+@patch("tui.bulk.import_file")
+@patch("builtins.input", return_value="links.csv")
+def test_import_urls_prints_summary(mock_input, mock_import, capsys):
+    mock_import.return_value = MagicMock(
+        created=9, total=10, failed=1, elapsed=2.0, rate=5.0
+    )
+
+    import_urls()
+
+    mock_import.assert_called_once()
+    assert mock_import.call_args[0][1] == "links.csv"
+    assert "Imported 9/10 URLs (1 failed)" in capsys.readouterr().out
+
+
+@patch("tui.bulk.import_file", side_effect=FileNotFoundError("missing.csv"))
+@patch("builtins.input", return_value="missing.csv")
+def test_import_urls_file_error(mock_input, mock_import, capsys):
+    import_urls()
+
+    assert "Import Error: missing.csv" in capsys.readouterr().out
+
+
+@patch("tui.bulk.import_file")
+@patch("builtins.input", return_value="")
+def test_import_urls_cancelled(mock_input, mock_import, capsys):
+    import_urls()
+
+    mock_import.assert_not_called()
+    assert "Import cancelled." in capsys.readouterr().out
+
+
+def make_urls():
+    return {
+        1: ShortUrl(
+            code="a1",
+            label="promo-1",
+            target="http://a.it",
+            user="u",
+            expired_at="2000-01-01T00:00:00Z",
+        ),
+        2: ShortUrl(code="a2", label="promo-2", target="http://a.it", user="u"),
+        3: ShortUrl(
+            code="a3",
+            label="other",
+            target="http://a.it",
+            user="u",
+            expired_at="2999-01-01T00:00:00Z",
+        ),
+        4: ShortUrl(code="a4", label="promo-4", target="http://a.it", user="u"),
+    }
+
+
+def test_select_urls_ranges_and_numbers():
+    urls = make_urls()
+    selected = select_urls("2-4, 1,3", urls)
+    assert [s.code for s in selected] == ["a2", "a3", "a4", "a1"]
+
+
+def test_select_urls_reversed_range():
+    urls = make_urls()
+    assert [s.code for s in select_urls("3-2", urls)] == ["a2", "a3"]
+
+
+def test_select_urls_expired():
+    urls = make_urls()
+    assert [s.code for s in select_urls("all expired", urls)] == ["a1"]
+
+
+def test_select_urls_label_glob():
+    urls = make_urls()
+    assert [s.code for s in select_urls("label:promo-*", urls)] == ["a1", "a2", "a4"]
+
+
+@pytest.mark.parametrize(
+    "scelta, message",
+    [
+        ("abc", "Enter valid number."),
+        ("1-", "Enter valid number."),
+        ("1,,2", "Enter valid number."),
+        ("3-9", "Invalid number."),
+        ("label:", "Enter a label pattern."),
+    ],
+)
+def test_select_urls_invalid(scelta, message):
+    with pytest.raises(ValueError, match=message):
+        select_urls(scelta, make_urls())
+
+
+@patch("tui.bulk.delete_all")
+@patch("builtins.input", side_effect=["1-3", "y"])
+@patch("builtins.print")
+@patch("tui.app.show_urls_dict")
+@patch("tui.app.client")
+def test_delete_url_multiple(
+    mock_client, mock_show, mock_print, mock_input, mock_delete_all
+):
+    urls = list(make_urls().values())
+    mock_client.getShortUrl.return_value = (True, urls)
+    mock_delete_all.return_value = [
+        (urls[0], (True, "ok")),
+        (urls[1], (False, "404: not found")),
+        (urls[2], (True, "ok")),
+    ]
+
+    delete_url()
+
+    mock_client.getShortUrl.assert_called_once()
+    mock_client.deleteUrl.assert_not_called()
+    mock_delete_all.assert_called_once_with(mock_client, urls[:3])
+    mock_print.assert_any_call("Error deleting 'a2':", "404: not found")
+    mock_print.assert_called_with("Deleted 2/3 URLs.")
+
+
+@patch("builtins.input", side_effect=["label:nothing*"])
+@patch("builtins.print")
+@patch("tui.app.show_urls_dict")
+@patch("tui.app.client")
+def test_delete_url_empty_selection(mock_client, mock_show, mock_print, mock_input):
+    mock_client.getShortUrl.return_value = (True, list(make_urls().values()))
+
+    delete_url()
+
+    mock_print.assert_called_with("No URLs match the selection.")
+
+
+def test_show_urls_dict_datetime_expiry(capsys):
+    s = ShortUrl(
+        code="a1",
+        label="L",
+        target="http://a.it",
+        user="u",
+        expired_at=datetime(2030, 1, 2, 3, 4),
+    )
+
+    show_urls_dict({1: s})
+
+    assert "02/01/2030 03:04" in capsys.readouterr().out
+
+
+def test_show_urls_dict_streams_iterables(capsys):
+    def stream():
+        yield ShortUrl(code="a1", label="L1", target="http://a.it", user="u")
+        print("-- page 2 --")
+        yield ShortUrl(code="a2", label="L2", target="http://b.it", user="u")
+
+    shown = show_urls_dict(stream())
+
+    out = capsys.readouterr().out
+    assert out.index("a1") < out.index("-- page 2 --") < out.index("a2")
+    assert [s.code for s in shown.values()] == ["a1", "a2"]
+    assert list(shown) == [1, 2]
+
+
+def test_show_urls_dict_and_select_on_table(capsys):
+    table = ShortUrlTable.from_api_batch(
+        [
+            {"code": "a1", "target": "http://a.it", "label": "L1", "expired_at": "2000-01-01T00:00:00Z"},
+            {"code": "a2", "target": "http://b.it", "label": "L2", "private": True},
+        ]
+    )
+
+    shown = show_urls_dict(table)
+
+    out = capsys.readouterr().out
+    assert "01/01/2000 00:00" in out and "a2" in out
+    assert [s.code for s in select_urls("expired", shown)] == ["a1"]
+    assert [s.code for s in select_urls("label:L2", shown)] == ["a2"]
+
+
+def test_show_urls_dict_empty_iterable(capsys):
+    assert show_urls_dict(iter([])) == {}
+    assert "No URLs found." in capsys.readouterr().out
+
+
+@patch("tui.app.browse")
+@patch("tui.app.client")
+def test_url_history_streams_when_cache_is_empty(mock_client, mock_browse):
+    mock_client.cache.has_data = False
+
+    url_history()
+
+    mock_client.getShortUrl.assert_not_called()
+    mock_browse.assert_called_once_with(mock_client.iter_short_urls.return_value)
+
+
+@patch("tui.app.browse", side_effect=Exception("timeout"))
+@patch("builtins.print")
+@patch("tui.app.client")
+def test_url_history_stream_error(mock_client, mock_print, mock_show):
+    mock_client.cache.has_data = False
+
+    url_history()
+
+    assert mock_print.call_args[0][0] == "Error fetching URLs:"
+
+
+@patch("tui.app.Menu.Builder")
+@patch("tui.app.same_method", return_value=None)
+def test_editmenu_without_selection(mock_same, mock_builder_class):
+    editmenu()
+
+    mock_builder_class.assert_not_called()
+
+
+def make_edit():
+    s = ShortUrl(code="a1", label="L", target="http://a.it", user="u")
+    return Backend().edit_session(s)
+
+
+@patch("tui.app.client")
+@patch("builtins.input", side_effect=["http://new.it", "New label", "yes"])
+def test_modify_functions_stage_on_edit_session(mock_input, mock_client):
+    edit = make_edit()
+
+    modify_target(edit)
+    modify_label(edit)
+    modify_visibility(edit)
+
+    assert edit.changes == {
+        "target": "http://new.it",
+        "label": "New label",
+        "private": True,
+    }
+    mock_client.edit_target.assert_not_called()
+    mock_client.edit_label.assert_not_called()
+    mock_client.edit_visibility.assert_not_called()
+    mock_client.getShortUrl.assert_not_called()
+
+
+@patch("tui.app.client")
+@patch("builtins.input", return_value="2099-01-01 10:00")
+def test_modify_expire_stages_on_edit_session(mock_input, mock_client):
+    edit = make_edit()
+
+    modify_expire(edit)
+
+    assert edit.changes == {"expired_at": datetime(2099, 1, 1, 10, 0)}
+    mock_client.edit_expire.assert_not_called()
+
+
+def test_save_edit_commits_once(capsys):
+    edit = MagicMock(has_changes=True)
+    edit.commit.return_value = (True, "URL updated successfully")
+
+    save_edit(edit)
+
+    edit.commit.assert_called_once()
+    assert "URL updated!" in capsys.readouterr().out
+
+
+def test_save_edit_failure(capsys):
+    edit = MagicMock(has_changes=True)
+    edit.commit.return_value = (False, "400: bad")
+
+    save_edit(edit)
+
+    assert "Error: 400: bad" in capsys.readouterr().out
+
+
+def test_save_edit_without_changes(capsys):
+    edit = MagicMock(has_changes=False)
+
+    save_edit(edit)
+
+    edit.commit.assert_not_called()
+    assert "No changes to save." in capsys.readouterr().out
+
+
+def test_discard_edit(capsys):
+    edit = MagicMock(has_changes=True)
+
+    discard_edit(edit)
+
+    edit.discard.assert_called_once()
+    assert "Changes discarded." in capsys.readouterr().out
+
+
+def many_urls(count):
+    return [
+        ShortUrl(code=f"c{n}", label=f"L{n}", target="http://a.it", user=None)
+        for n in range(1, count + 1)
+    ]
+
+
+@patch("tui.app.default_page_size", return_value=5)
+@patch("builtins.input", side_effect=["n", "g 9", "g 3", "12"])
+@patch("tui.app.client")
+def test_same_method_pages_large_lists(mock_client, mock_input, mock_size, capsys):
+    mock_client.getShortUrl.return_value = (True, many_urls(12))
+
+    item = same_method()
+
+    out = capsys.readouterr().out
+    assert item.code == "c12"
+    assert "Page 1/" in out and "Page 2/" in out and "Page 3/3" in out
+    assert "Page out of range." in out
+
+
+@patch("tui.app.default_page_size", return_value=5)
+@patch("tui.bulk.delete_all")
+@patch("builtins.input", side_effect=["8-12", "y"])
+@patch("tui.app.client")
+def test_delete_url_selects_across_pages(mock_client, mock_input, mock_delete_all, mock_size, capsys):
+    urls = many_urls(12)
+    mock_client.getShortUrl.return_value = (True, urls)
+    mock_delete_all.return_value = [(s, (True, "ok")) for s in urls[7:]]
+
+    delete_url()
+
+    mock_delete_all.assert_called_once_with(mock_client, urls[7:])
+    assert "Deleted 5/5 URLs." in capsys.readouterr().out
+
+
+@patch("builtins.input", side_effect=["n", ""])
+def test_browse_pulls_rows_lazily(mock_input, capsys):
+    pulled = []
+
+    def stream():
+        for s in many_urls(100):
+            pulled.append(s)
+            yield s
+
+    with patch("tui.app.default_page_size", return_value=10):
+        browse(stream())
+
+    assert len(pulled) == 20
+    assert "Page 2/?" in capsys.readouterr().out
+
+
+def test_browse_single_page_and_empty(capsys):
+    browse(iter([]))
+    assert "No URLs found." in capsys.readouterr().out
+
+    browse(many_urls(2))
+    out = capsys.readouterr().out
+    assert "c2" in out and "Page" not in out
+
+
+@patch("builtins.input", side_effect=["/L2"])
+@patch("tui.app.client")
+def test_same_method_search_single_match(mock_client, mock_input, capsys):
+    urls = many_urls(3)
+    mock_client.getShortUrl.return_value = (True, urls)
+    mock_client.search.return_value = (True, [urls[1]])
+
+    assert same_method() is urls[1]
+    mock_client.search.assert_called_once_with("L2")
+
+
+@patch("builtins.input", side_effect=["/L", "2"])
+@patch("tui.app.client")
+def test_same_method_search_picks_among_matches(mock_client, mock_input, capsys):
+    urls = many_urls(3)
+    mock_client.getShortUrl.return_value = (True, urls)
+    mock_client.search.return_value = (True, urls[1:])
+
+    assert same_method() is urls[2]
+
+
+@patch("builtins.input", side_effect=["/zzz"])
+@patch("tui.app.client")
+def test_same_method_search_without_matches(mock_client, mock_input, capsys):
+    mock_client.getShortUrl.return_value = (True, many_urls(3))
+    mock_client.search.return_value = (True, [])
+
+    assert same_method() is None
+    assert "No URLs match the search." in capsys.readouterr().out
+
+
+@patch("tui.bulk.delete_all")
+@patch("builtins.input", side_effect=["/L", "y"])
+@patch("tui.app.client")
+def test_delete_url_by_search(mock_client, mock_input, mock_delete_all, capsys):
+    urls = many_urls(3)
+    mock_client.getShortUrl.return_value = (True, urls)
+    mock_client.search.return_value = (True, urls[:2])
+    mock_delete_all.return_value = [(s, (True, "ok")) for s in urls[:2]]
+
+    delete_url()
+
+    mock_delete_all.assert_called_once_with(mock_client, urls[:2])
+
+
+@patch("builtins.input", side_effect=["summer"])
+@patch("tui.app.client")
+def test_search_urls_shows_matches(mock_client, mock_input, capsys):
+    mock_client.search.return_value = (True, many_urls(2))
+
+    search_urls()
+
+    out = capsys.readouterr().out
+    assert "c1" in out and "c2" in out
+    mock_client.search.assert_called_once_with("summer")
+
+
+@patch("builtins.input", side_effect=[""])
+@patch("tui.app.client")
+def test_search_urls_cancelled(mock_client, mock_input, capsys):
+    search_urls()
+
+    assert "Search cancelled." in capsys.readouterr().out
+    mock_client.search.assert_not_called()
+
+
+@patch("builtins.input", side_effect=["x"])
+@patch("tui.app.client")
+def test_search_urls_error(mock_client, mock_input, capsys):
+    mock_client.search.return_value = (False, "boom")
+
+    search_urls()
+
+    assert "Error fetching URLs: boom" in capsys.readouterr().out
+
+
+@patch("tui.app.client")
+def test_same_method_with_code_skips_the_list(mock_client):
+    item = many_urls(1)[0]
+    mock_client.get_short.return_value = (True, item)
+
+    assert same_method("c1") is item
+    mock_client.get_short.assert_called_once_with("c1")
+    mock_client.getShortUrl.assert_not_called()
+
+
+@patch("tui.app.client")
+def test_same_method_with_unknown_code(mock_client, capsys):
+    mock_client.get_short.return_value = (False, "404: Not found")
+
+    assert same_method("nope") is None
+    assert "Error fetching URL: 404: Not found" in capsys.readouterr().out
+
+
+@patch("builtins.input", side_effect=["c1", "y"])
+@patch("tui.app.client")
+def test_remove_url_by_code(mock_client, mock_input, capsys):
+    item = many_urls(1)[0]
+    mock_client.get_short.return_value = (True, item)
+    mock_client.deleteUrl.return_value = (True, "URL deleted successfully.")
+
+    remove_url()
+
+    mock_client.getShortUrl.assert_not_called()
+    mock_client.deleteUrl.assert_called_once_with(item)
+    assert "URL deleted successfully." in capsys.readouterr().out
+
+
+@patch("builtins.input", side_effect=["nope"])
+@patch("tui.app.client")
+def test_remove_url_unknown_code(mock_client, mock_input, capsys):
+    mock_client.get_short.return_value = (False, "404: Not found")
+
+    remove_url()
+
+    mock_client.deleteUrl.assert_not_called()
+    assert "Error fetching URL: 404: Not found" in capsys.readouterr().out
+
+
+@patch("tui.app.delete_url")
+@patch("builtins.input", return_value="")
+def test_remove_url_falls_back_to_the_list(mock_input, mock_delete):
+    remove_url()
+
+    mock_delete.assert_called_once_with("")
+
+
+def test_menus_are_built_as_trusted_and_run_checked():
+    from tui.checks import validating
+    from tui.menu import Entry, Menu
+
+    seen = []
+    real_create = Entry.create
+
+    def create(*args, **kwargs):
+        seen.append(validating())
+        return real_create(*args, **kwargs)
+
+    with patch("tui.app.Entry.create", side_effect=create), patch.object(
+        Menu, "run", lambda self: seen.append(validating())
+    ):
+        build_main_menu()
+
+    assert seen == [False, False, False, True]
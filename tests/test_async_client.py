@@ -0,0 +1,149 @@
+import asyncio
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from tui.async_client import AsyncBackend
+from tui.domain import ShortUrl, short
+
+
+@pytest.fixture
+def backend():
+    b = Mock()
+    b.session = Mock()
+    return b
+
+
+def test_concurrency_must_be_positive(backend):
+    with pytest.raises(ValueError):
+        AsyncBackend(backend, concurrency=0)
+
+
+def test_session_is_shared_with_sync_backend(backend):
+    client = AsyncBackend(backend)
+    assert client.session is backend.session
+    client.close()
+
+
+def test_create_url_delegates_to_backend(backend):
+    backend.createUrl.return_value = (True, "http://localhost:8000/zzz")
+    s = short(target="http://a.it", label="lab")
+
+    async def run():
+        async with AsyncBackend(backend) as client:
+            return await client.createUrl(s)
+
+    assert asyncio.run(run()) == (True, "http://localhost:8000/zzz")
+    backend.createUrl.assert_called_once_with(s)
+
+
+def test_edit_label_keeps_argument_order(backend):
+    backend.edit_label.return_value = (True, "Label changed successfully")
+    s = ShortUrl(code="abc123", label="x", target="http://a.it", user="u")
+
+    async def run():
+        async with AsyncBackend(backend) as client:
+            return await client.edit_label("NEW", s)
+
+    assert asyncio.run(run()) == (True, "Label changed successfully")
+    backend.edit_label.assert_called_once_with("NEW", s)
+
+
+def test_get_short_url_forwards_refresh(backend):
+    backend.getShortUrl.return_value = (True, [])
+
+    async def run():
+        async with AsyncBackend(backend) as client:
+            await client.getShortUrl()
+            return await client.getShortUrl(refresh=True)
+
+    assert asyncio.run(run()) == (True, [])
+    assert [c.args for c in backend.getShortUrl.call_args_list] == [(False,), (True,)]
+
+
+def test_lookup_and_edit_wrappers_delegate(backend):
+    s = ShortUrl(code="abc123", label="x", target="http://a.it", user="u")
+    backend.get_short.return_value = (True, s)
+    backend.edit_fields.return_value = (True, "URL updated successfully")
+    backend.search.return_value = (True, [s])
+
+    async def run():
+        async with AsyncBackend(backend) as client:
+            return (
+                await client.get_short("abc123"),
+                await client.edit_fields(s, {"label": "NEW"}),
+                await client.search("x", 5),
+            )
+
+    assert asyncio.run(run()) == (
+        (True, s),
+        (True, "URL updated successfully"),
+        (True, [s]),
+    )
+    backend.edit_fields.assert_called_once_with(s, {"label": "NEW"})
+    backend.search.assert_called_once_with("x", 5)
+
+
+def test_iter_short_urls_streams_the_sync_generator(backend):
+    closed = []
+
+    def links(page_size, prefetch):
+        try:
+            for i in range(250):
+                yield ShortUrl(code=f"c{i}", label="x", target="http://a.it", user="u")
+        finally:
+            closed.append(True)
+
+    backend.iter_short_urls.side_effect = links
+
+    async def run():
+        async with AsyncBackend(backend) as client:
+            return [s.code async for s in client.iter_short_urls(50)]
+
+    codes = asyncio.run(run())
+
+    assert codes == [f"c{i}" for i in range(250)]
+    assert closed == [True]
+
+
+def test_map_preserves_input_order(backend):
+    backend.deleteUrl.side_effect = lambda s: (True, s.code)
+    urls = [
+        ShortUrl(code=f"c{i}", label="x", target="http://a.it", user="u")
+        for i in range(25)
+    ]
+
+    async def run():
+        async with AsyncBackend(backend, concurrency=4) as client:
+            return await client.map(client.deleteUrl, urls)
+
+    results = asyncio.run(run())
+    assert results == [(True, f"c{i}") for i in range(25)]
+
+
+def test_imap_bounds_concurrency(backend):
+    lock = threading.Lock()
+    running = 0
+    peak = 0
+
+    def slow_delete(s):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return True, s
+
+    backend.deleteUrl.side_effect = slow_delete
+
+    async def run():
+        async with AsyncBackend(backend, concurrency=3) as client:
+            return [pair async for pair in client.imap(client.deleteUrl, range(20))]
+
+    pairs = asyncio.run(run())
+    assert sorted(item for item, _ in pairs) == list(range(20))
+    assert peak <= 3
@@ -0,0 +1,169 @@
+import json
+
+import pytest
+
+from benchmarks import (
+    bench_client,
+    bench_decode,
+    bench_import,
+    bench_memory,
+    bench_validation,
+)
+from benchmarks.server import PASSWORD, USERNAME, StandInServer
+from tui.client import Backend
+from tui.domain import Password, ShortUrl, Username, short
+from tui.transport import TransportConfig
+
+
+@pytest.fixture
+def server():
+    with StandInServer() as s:
+        s.store.seed(25)
+        yield s
+
+
+@pytest.fixture
+def backend(server):
+    b = Backend(config=TransportConfig(base_url=server.base_url))
+    assert b.login(Username(USERNAME), Password(PASSWORD))
+    return b
+
+
+def test_stand_in_rejects_bad_credentials(server):
+    b = Backend(config=TransportConfig(base_url=server.base_url))
+    assert b.login(Username(USERNAME), Password("WrongPass1!")) is False
+
+
+def test_stand_in_requires_session(server):
+    b = Backend(config=TransportConfig(base_url=server.base_url))
+    ok, msg = b.getShortUrl()
+    assert ok is False
+    assert "403" in msg
+
+
+def test_backend_round_trip(backend, server):
+    ok, urls = backend.getShortUrl()
+    assert ok is True
+    assert len(urls) == 25
+
+    ok, link = backend.createUrl(short("https://example.com/x", "x"))
+    assert ok is True
+    code = link.rsplit("/", 1)[1]
+    assert code in server.store.links
+
+    s = backend.cache.get()[-1]
+    assert backend.edit_fields(s, {"label": "renamed", "private": True})[0]
+    assert server.store.links[code]["label"] == "renamed"
+
+    assert backend.deleteUrl(s)[0]
+    assert code not in server.store.links
+
+
+def test_list_revalidates_with_etag(backend):
+    backend.getShortUrl()
+    backend.getShortUrl(refresh=True)
+
+    assert backend.session.metrics.get("getShortUrl")["statuses"] == {"200": 1}
+    assert backend.session.metrics.get("sync")["statuses"] == {"304": 1}
+
+
+def test_delta_sync_fetches_only_changes(backend, server):
+    backend.getShortUrl()
+    first, second = list(server.store.links)[:2]
+    server.store.update(first, {"label": "changed"})
+    server.store.delete(second)
+
+    ok, urls = backend.sync()
+
+    assert ok is True
+    assert len(urls) == 24
+    assert {s.code: s.label for s in urls}[first] == "changed"
+    assert backend.session.metrics.get("sync")["bytes_in"] < 1000
+
+
+def test_paginated_iteration(backend):
+    codes = [s.code for s in backend.iter_short_urls(page_size=10)]
+    assert len(codes) == 25
+    assert len(set(codes)) == 25
+    assert backend.session.metrics.get("iter_short_urls")["count"] == 3
+
+
+def test_bench_client_writes_report(tmp_path, capsys):
+    output = tmp_path / "bench.json"
+
+    assert (
+        bench_client.main(
+            [
+                "--links",
+                "20",
+                "--ops",
+                "4",
+                "--list-repeat",
+                "2",
+                "--output",
+                str(output),
+            ]
+        )
+        == 0
+    )
+
+    report = json.loads(output.read_text())
+    results = report["runs"][0]["results"]
+    assert report["runs"][0]["links"] == 20
+    assert set(results) >= {"login", "list", "create", "edit", "delete"}
+    assert all(r["failures"] == 0 for r in results.values())
+    assert results["create"]["count"] == 4
+    assert "create_concurrent" in capsys.readouterr().out
+
+
+def test_bench_decode_reports_every_decoder(tmp_path, capsys):
+    output = tmp_path / "decode.json"
+
+    assert (
+        bench_decode.main(["--rows", "50", "--repeat", "1", "--output", str(output)])
+        == 0
+    )
+
+    report = json.loads(output.read_text())
+    assert set(report["results"]) == set(bench_decode.DECODERS)
+    assert "from_api_batch" in capsys.readouterr().out
+
+
+def test_decoders_agree_on_parsed_rows():
+    items = bench_decode.make_rows(10)
+    assert bench_decode.per_row_parsed(items) == ShortUrl.from_api_batch(items)
+
+
+def test_bench_memory_reports_table_savings(tmp_path):
+    output = tmp_path / "memory.json"
+
+    assert bench_memory.main(["--rows", "2000", "--output", str(output)]) == 0
+
+    results = json.loads(output.read_text())["results"]
+    assert results["ShortUrlTable"]["bytes"] < results["list[ShortUrl]"]["bytes"]
+
+
+def test_bench_validation_reports_every_tier(tmp_path, capsys):
+    output = tmp_path / "validation.json"
+
+    assert (
+        bench_validation.main(
+            ["--count", "20", "--repeat", "1", "--output", str(output)]
+        )
+        == 0
+    )
+
+    results = json.loads(output.read_text())["results"]
+    assert set(results) == set(bench_validation.TIERS)
+    assert set(results["trusted"]) == set(bench_validation.OBJECTS)
+    assert "Entry.create" in capsys.readouterr().out
+
+
+def test_bench_import_measures_validation(tmp_path, capsys):
+    output = tmp_path / "import.json"
+
+    assert bench_import.main(["--rows", "50", "--output", str(output)]) == 0
+
+    results = json.loads(output.read_text())["results"]
+    assert set(results) == {"urlparse_each", "validate_urls", "read_rows"}
+    assert "read_rows" in capsys.readouterr().out
@@ -0,0 +1,169 @@
+import json
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from tui.domain import ShortUrl
+from tui.bulk import (
+    delete_all,
+    import_file,
+    parse_expiry,
+    parse_private,
+    parse_row,
+    read_rows,
+)
+
+
+@pytest.fixture
+def backend():
+    b = MagicMock()
+    b.createUrl.side_effect = lambda s: (True, f"http://localhost:8000/{s.label}")
+    return b
+
+
+def future(fmt="%Y-%m-%d %H:%M"):
+    return (datetime.now() + timedelta(days=30)).strftime(fmt)
+
+
+def test_parse_expiry_formats():
+    assert parse_expiry(None) is None
+    assert parse_expiry("  ") is None
+    assert parse_expiry("2030-01-01 12:00") == datetime(2030, 1, 1, 12, 0)
+    assert parse_expiry("2030-01-01T12:00:00Z") == datetime(2030, 1, 1, 12, 0)
+
+
+def test_parse_expiry_invalid():
+    with pytest.raises(ValueError, match="Invalid date format"):
+        parse_expiry("tomorrow")
+
+
+def test_parse_private():
+    assert parse_private(True) is True
+    assert parse_private("Yes") is True
+    assert parse_private("no") is False
+    assert parse_private(None) is False
+
+
+def test_parse_row_builds_short():
+    s = parse_row(
+        {"target": "https://a.it", "label": "A", "expired_at": "", "private": "1"}
+    )
+    assert s.target == "https://a.it"
+    assert s.label == "A"
+    assert s.expired_at is None
+    assert s.private is True
+
+
+def test_parse_row_rejects_bad_url():
+    with pytest.raises(ValueError):
+        parse_row({"target": "ftp://a.it", "label": "A"})
+
+
+def test_read_rows_csv(tmp_path):
+    path = tmp_path / "links.csv"
+    path.write_text(
+        "target,label,expired_at,private\n"
+        f"https://a.it,A,{future()},yes\n"
+        "not-a-url,B,,no\n"
+    )
+
+    rows = list(read_rows(path))
+
+    assert [r.line for r in rows] == [2, 3]
+    assert rows[0].url.private is True
+    assert rows[0].error is None
+    assert rows[1].url is None
+    assert "http" in rows[1].error
+
+
+def test_read_rows_jsonl_reports_bad_lines(tmp_path):
+    path = tmp_path / "links.jsonl"
+    path.write_text(
+        json.dumps({"target": "https://a.it", "label": "A", "private": True})
+        + "\n\n{broken\n[1]\n"
+    )
+
+    rows = list(read_rows(path))
+
+    assert rows[0].url.label == "A"
+    assert rows[1].line == 3
+    assert "Invalid JSON" in rows[1].error
+    assert "expected an object" in rows[2].error
+
+
+def test_read_rows_across_batches(tmp_path):
+    path = tmp_path / "links.jsonl"
+    lines = [{"target": f"https://a.it/{n}", "label": f"L{n}"} for n in range(5)]
+    lines[2] = {"target": "https://a.it/2", "label": ""}
+    lines[3] = {"target": "", "label": ""}
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n[1]\n")
+
+    rows = list(read_rows(path, batch_size=2))
+
+    assert [r.line for r in rows] == [1, 2, 3, 4, 5, 6]
+    assert [r.url.target for r in rows if r.url] == [
+        "https://a.it/0",
+        "https://a.it/1",
+        "https://a.it/4",
+    ]
+    assert rows[2].error == "Label cannot be empty"
+    assert rows[3].error == "URL cannot be empty"
+    assert "expected an object" in rows[5].error
+
+
+def test_parse_expiry_unpadded_dates():
+    assert parse_expiry("2030-1-2 3:04") == datetime(2030, 1, 2, 3, 4)
+
+
+def test_read_rows_unsupported_format(tmp_path):
+    path = tmp_path / "links.txt"
+    path.write_text("https://a.it")
+
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        list(read_rows(path))
+
+
+def test_import_file_reports_every_row(tmp_path, backend):
+    path = tmp_path / "links.jsonl"
+    lines = [
+        json.dumps({"target": "https://a.it", "label": f"L{i}"}) for i in range(30)
+    ]
+    lines.append(json.dumps({"target": "", "label": "bad"}))
+    path.write_text("\n".join(lines))
+    reported = []
+
+    result = import_file(backend, path, workers=4, report=lambda *r: reported.append(r))
+
+    assert result.total == 31
+    assert result.created == 30
+    assert result.failed == 1
+    assert result.rate > 0
+    assert backend.createUrl.call_count == 30
+    assert sorted(row.line for row, _, _ in reported) == list(range(1, 32))
+
+
+def test_import_file_counts_backend_failures(tmp_path, backend, capsys):
+    path = tmp_path / "links.csv"
+    path.write_text("target,label\nhttps://a.it,A\n")
+    backend.createUrl.side_effect = None
+    backend.createUrl.return_value = (False, "400: bad request")
+
+    result = import_file(backend, path)
+
+    assert result.failed == 1
+    assert "Row 2: ERROR 400: bad request" in capsys.readouterr().out
+
+
+def test_delete_all_keeps_selection_order(backend):
+    backend.deleteUrl.side_effect = lambda s: (s.code != "c3", s.code)
+    urls = [
+        ShortUrl(code=f"c{i}", label="x", target="http://a.it", user="u")
+        for i in range(6)
+    ]
+
+    results = delete_all(backend, urls, workers=2)
+
+    assert [item for item, _ in results] == urls
+    assert results[3][1] == (False, "c3")
+    backend.mirror_batch.return_value.__exit__.assert_called_once()
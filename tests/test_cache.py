@@ -0,0 +1,185 @@
+from tui.cache import RecentLinks, ShortUrlCache
+from tui.domain import ShortUrl
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make(code, label="x"):
+    return ShortUrl(code=code, label=label, target="http://a.it", user="u")
+
+
+def test_empty_cache_returns_none():
+    cache = ShortUrlCache()
+    assert cache.get() is None
+    assert cache.peek() is None
+
+
+def test_get_respects_ttl():
+    clock = FakeClock()
+    cache = ShortUrlCache(ttl=10, clock=clock)
+    cache.put([make("a"), make("b")])
+
+    clock.now = 9
+    assert [s.code for s in cache.get()] == ["a", "b"]
+
+    clock.now = 10
+    assert cache.get() is None
+    assert [s.code for s in cache.peek()] == ["a", "b"]
+
+
+def test_touch_renews_entries():
+    clock = FakeClock()
+    cache = ShortUrlCache(ttl=10, clock=clock)
+    cache.put([make("a")])
+
+    clock.now = 15
+    cache.touch()
+    assert cache.get() is not None
+
+
+def test_stale_put_is_only_peekable():
+    cache = ShortUrlCache(ttl=10, clock=FakeClock())
+    cache.put([make("a")], fresh=False)
+    assert cache.get() is None
+    assert [s.code for s in cache.peek()] == ["a"]
+
+
+def test_has_data_covers_stale_entries():
+    cache = ShortUrlCache(ttl=10, clock=FakeClock())
+    assert cache.has_data is False
+    cache.put([make("a")], fresh=False)
+    assert cache.has_data is True
+    cache.invalidate()
+    assert cache.has_data is False
+
+
+def test_zero_ttl_never_fresh():
+    cache = ShortUrlCache(ttl=0)
+    cache.put([make("a")])
+    assert cache.get() is None
+
+
+def test_update_patches_in_place_keeping_order():
+    cache = ShortUrlCache()
+    cache.put([make("a"), make("b"), make("c")])
+
+    updated = cache.update("b", label="new")
+
+    assert updated.label == "new"
+    assert [s.code for s in cache.get()] == ["a", "b", "c"]
+    assert cache.get()[1].label == "new"
+
+
+def test_update_unknown_code_is_noop():
+    cache = ShortUrlCache()
+    assert cache.update("zz", label="new") is None
+    cache.put([make("a")])
+    assert cache.update("zz", label="new") is None
+
+
+def test_add_and_remove():
+    cache = ShortUrlCache()
+    cache.add(make("a"))
+    assert cache.peek() is None
+
+    cache.put([make("a")])
+    cache.add(make("b"))
+    cache.remove("a")
+    cache.remove("missing")
+    assert [s.code for s in cache.get()] == ["b"]
+
+
+def test_invalidate():
+    cache = ShortUrlCache()
+    cache.put([make("a")])
+    cache.invalidate()
+    assert cache.get() is None
+
+
+def test_merge_applies_changes_and_refreshes():
+    clock = FakeClock()
+    cache = ShortUrlCache(ttl=10, clock=clock)
+    cache.merge([make("a")])
+    assert cache.peek() is None
+
+    cache.put([make("a"), make("b")], fresh=False)
+    cache.merge([make("c"), make("a", label="y")], ["b"])
+
+    assert [(s.code, s.label) for s in cache.get()] == [("a", "y"), ("c", "x")]
+
+
+def test_listeners_see_every_change():
+    events = []
+    cache = ShortUrlCache()
+    cache.subscribe(
+        lambda up, removed, reset: events.append(([s.code for s in up], removed, reset))
+    )
+
+    cache.add(make("x"))
+    cache.put([make("a"), make("b")])
+    cache.add(make("c"))
+    cache.update("a", label="y")
+    cache.remove("b")
+    cache.remove("zz")
+    cache.merge([make("d")], ["c", "zz"])
+    cache.invalidate()
+
+    assert events == [
+        (["a", "b"], [], True),
+        (["c"], [], False),
+        (["a"], [], False),
+        ([], ["b"], False),
+        (["d"], ["c"], False),
+        ([], [], True),
+    ]
+
+
+def test_lookup_only_serves_fresh_entries():
+    clock = FakeClock()
+    cache = ShortUrlCache(ttl=10, clock=clock)
+    assert cache.lookup("a") is None
+
+    cache.put([make("a")])
+    assert cache.lookup("a").code == "a"
+    assert cache.lookup("b") is None
+
+    clock.now = 10
+    assert cache.lookup("a") is None
+
+
+def test_recent_links_evict_least_recently_used():
+    recent = RecentLinks(maxsize=2)
+    recent.put(make("a"))
+    recent.put(make("b"))
+    recent.get("a")
+    recent.put(make("c"))
+
+    assert recent.get("b") is None
+    assert recent.get("a").code == "a"
+    assert recent.get("c").code == "c"
+
+
+def test_recent_links_expire_and_update():
+    clock = FakeClock()
+    recent = RecentLinks(ttl=10, clock=clock)
+    recent.put(make("a"))
+
+    assert recent.update("a", label="y").label == "y"
+    assert recent.update("zz", label="y") is None
+    assert recent.get("a").label == "y"
+
+    clock.now = 10
+    assert recent.get("a") is None
+    assert len(recent) == 0
+
+    recent.put(make("b"))
+    recent.discard("b")
+    recent.put(make("c"))
+    recent.clear()
+    assert recent.get("b") is None and recent.get("c") is None
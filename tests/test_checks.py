@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+
+import pytest
+from typeguard import TypeCheckError
+from valid8 import ValidationError
+
+from tui.checks import (
+    BOUNDARY,
+    OFF,
+    POLICY_ENV,
+    STRICT,
+    get_policy,
+    policy_from_env,
+    set_policy,
+    trusted,
+    typechecked,
+    validating,
+    validation_policy,
+)
+from tui.domain import Email, Username
+from tui.menu import Key
+
+
+@typechecked
+@dataclass(frozen=True, order=True)
+class Point:
+    x: int
+
+    def shifted(self, dx: int) -> "Point":
+        return Point(self.x + dx)
+
+    @staticmethod
+    def origin(name: str) -> str:
+        return name
+
+
+@typechecked
+def double(value: int) -> int:
+    return value * 2
+
+
+def test_annotated_methods_are_checked():
+    assert Point(1).shifted(2) == Point(3)
+    with pytest.raises(TypeCheckError):
+        Point(1).shifted("2")
+    with pytest.raises(TypeCheckError):
+        Point.origin(3)
+
+
+def test_generated_methods_are_kept():
+    assert Point(1) < Point(2)
+    assert hash(Point(1)) == hash(Point(1))
+    assert repr(Point(1)) == "Point(x=1)"
+    with pytest.raises(Exception):
+        Point(1).x = 2
+
+
+def test_functions_are_checked():
+    assert double(2) == 4
+    with pytest.raises(TypeCheckError):
+        double("2")
+
+
+def test_policy_from_env():
+    assert policy_from_env({}) == BOUNDARY
+    assert policy_from_env({POLICY_ENV: " Strict "}) == STRICT
+    assert policy_from_env({POLICY_ENV: "off"}) == OFF
+    assert policy_from_env({POLICY_ENV: "bogus"}) == BOUNDARY
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        set_policy("lenient")
+
+
+def test_boundary_checks_user_input_and_trusts_the_program():
+    with validation_policy(BOUNDARY):
+        with pytest.raises(ValidationError):
+            Username("not valid!")
+        with trusted():
+            assert Username("not valid!").value == "not valid!"
+            assert Key("!!").value == "!!"
+            with pytest.raises(TypeError):
+                Point(1).shifted("2")
+        assert validating()
+        with pytest.raises(ValidationError):
+            Key("!!")
+
+
+def test_strict_ignores_trusted_blocks():
+    with validation_policy(STRICT):
+        with trusted():
+            assert validating()
+            with pytest.raises(ValidationError):
+                Username("not valid!")
+            with pytest.raises(TypeCheckError):
+                double("2")
+
+
+def test_off_skips_every_check_until_restored():
+    with validation_policy(OFF):
+        assert get_policy() == OFF
+        assert not validating()
+        assert Email("nope").value == "nope"
+        assert double("2") == "22"
+    assert get_policy() == BOUNDARY
+    with pytest.raises(TypeCheckError):
+        double("2")
@@ -1,10 +1,13 @@
 # tests/test_client.py
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 from datetime import datetime
+import threading
 
 import pytest
+import requests
 
 from tui.client import Backend, BASE_URL
+from tui.mirror import Mirror
 from tui.domain import Username, Password, Email, ShortUrl, short
 
 
@@ -364,6 +367,10 @@ def test_get_short_url_success_with_patched_shorturl(backend, monkeypatch):
             for k, v in kwargs.items():
                 setattr(self, k, v)
 
+        @classmethod
+        def from_api_batch(cls, items):
+            return [cls(**item) for item in items]
+
     monkeypatch.setattr(client_mod, "ShortUrl", DummyShortUrl)
 
     backend.session.cookies.get.return_value = "csrf123"
@@ -511,4 +518,988 @@ def test_get_short_url_exception_branch(backend):
     ok, msg = backend.getShortUrl()
 
     assert ok is False
-    assert msg == "timeout"
\ No newline at end of file
+    assert msg == "timeout"
+
+def prime_cache(backend):
+    backend.session.cookies.get.return_value = "csrf123"
+    backend.session.get.return_value.ok = True
+    backend.session.get.return_value.json.return_value = [
+        {"code": "c1", "target": "http://a.it", "label": "A", "private": False, "expired_at": None},
+        {"code": "c2", "target": "http://b.it", "label": "B", "private": True, "expired_at": None},
+    ]
+    backend.getShortUrl()
+    backend.session.get.reset_mock()
+
+
+def test_get_short_url_served_from_cache(backend):
+    prime_cache(backend)
+
+    ok, urls = backend.getShortUrl()
+
+    assert ok is True
+    assert [u.code for u in urls] == ["c1", "c2"]
+    backend.session.get.assert_not_called()
+
+
+def test_get_short_url_refresh_bypasses_cache(backend):
+    prime_cache(backend)
+
+    backend.getShortUrl(refresh=True)
+
+    backend.session.get.assert_called_once()
+
+
+def test_get_short_url_refetches_when_stale(backend):
+    backend.cache.ttl = 0
+    prime_cache(backend)
+
+    backend.getShortUrl()
+
+    backend.session.get.assert_called_once()
+
+
+def test_edits_patch_cached_entries(backend):
+    prime_cache(backend)
+    backend.session.patch.return_value.ok = True
+    s = backend.cache.get()[0]
+    dt = datetime(2030, 1, 1, 12, 0, 0)
+
+    backend.edit_target(s, "http://new.it")
+    backend.edit_label("NEW", s)
+    backend.edit_visibility(s, True)
+    backend.edit_expire(s, dt)
+
+    ok, urls = backend.getShortUrl()
+    assert urls[0].target == "http://new.it"
+    assert urls[0].label == "NEW"
+    assert urls[0].private is True
+    assert urls[0].expired_at == dt
+    backend.session.get.assert_not_called()
+
+
+def test_failed_edit_leaves_cache_untouched(backend):
+    prime_cache(backend)
+    backend.session.patch.return_value.ok = False
+    s = backend.cache.get()[0]
+
+    backend.edit_target(s, "http://new.it")
+
+    assert backend.cache.get()[0].target == "http://a.it"
+
+
+def test_create_and_delete_patch_cache(backend):
+    prime_cache(backend)
+    backend.session.post.return_value.ok = True
+    backend.session.post.return_value.json.return_value = {"code": "c3"}
+    backend.session.delete.return_value.ok = True
+
+    backend.createUrl(short(target="http://c.it", label="C"))
+    backend.deleteUrl(backend.cache.get()[0])
+
+    ok, urls = backend.getShortUrl()
+    assert [u.code for u in urls] == ["c2", "c3"]
+    assert urls[1].target == "http://c.it"
+    backend.session.get.assert_not_called()
+
+
+def test_login_and_logout_invalidate_cache(backend):
+    prime_cache(backend)
+    backend.session.post.return_value.ok = True
+
+    backend.login(Username("Persona"), Password("Persona88!"))
+    assert backend.cache.peek() is None
+
+    prime_cache(backend)
+    backend.logout()
+    assert backend.cache.peek() is None
+
+
+def test_get_short_url_remembers_validators(backend):
+    backend.session.get.return_value.headers = {
+        "ETag": '"v1"',
+        "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
+    prime_cache(backend)
+    backend.cache.ttl = 0
+
+    backend.getShortUrl()
+
+    backend.session.get.assert_called_once_with(
+        f"{BASE_URL}/shorts/",
+        headers={
+            "X-CSRFToken": "csrf123",
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        },
+    )
+
+
+def test_conditional_refresh_does_not_copy_the_cached_list(backend):
+    backend.session.get.return_value.headers = {"ETag": '"v1"'}
+    prime_cache(backend)
+    backend.cache.ttl = 0
+
+    with patch.object(backend.cache, "peek", wraps=backend.cache.peek) as peek:
+        ok, _ = backend.getShortUrl()
+
+    assert ok is True
+    peek.assert_not_called()
+
+
+def test_get_short_url_not_modified_reuses_list(backend):
+    backend.session.get.return_value.headers = {"ETag": '"v1"'}
+    prime_cache(backend)
+    cached = backend.cache.peek()
+    backend.cache.ttl = 0
+    resp = backend.session.get.return_value
+    resp.status_code = 304
+    resp.json.reset_mock()
+
+    ok, urls = backend.getShortUrl()
+
+    assert ok is True
+    assert urls == cached
+    resp.json.assert_not_called()
+
+
+def test_get_short_url_without_cache_is_unconditional(backend):
+    backend.session.get.return_value.headers = {"ETag": '"v1"'}
+    prime_cache(backend)
+    backend.cache.invalidate()
+
+    backend.getShortUrl()
+
+    backend.session.get.assert_called_once_with(
+        f"{BASE_URL}/shorts/", headers={"X-CSRFToken": "csrf123"}
+    )
+
+
+def test_get_short_url_drops_validators_when_missing(backend):
+    backend.session.get.return_value.headers = {"ETag": '"v1"'}
+    prime_cache(backend)
+    backend.session.get.return_value.headers = {}
+
+    backend.getShortUrl(refresh=True)
+
+    assert backend.validators == {}
+
+
+def test_login_clears_validators(backend):
+    backend.validators["x"] = {"etag": '"v1"'}
+    backend.session.post.return_value.ok = True
+
+    backend.login(Username("Persona"), Password("Persona88!"))
+
+    assert backend.validators == {}
+
+
+def page_response(data):
+    resp = Mock()
+    resp.json.return_value = data
+    return resp
+
+
+def test_iter_short_urls_follows_pages(backend):
+    backend.session.cookies.get.return_value = "csrf123"
+    backend.session.get.side_effect = [
+        page_response(
+            {
+                "results": [{"code": "c1", "target": "http://a.it"}],
+                "next": f"{BASE_URL}/shorts/?page=2&page_size=1",
+            }
+        ),
+        page_response(
+            {"results": [{"code": "c2", "target": "http://b.it"}], "next": None}
+        ),
+    ]
+
+    urls = list(backend.iter_short_urls(page_size=1))
+
+    assert [u.code for u in urls] == ["c1", "c2"]
+    assert backend.session.get.call_args_list[0].kwargs["params"] == {
+        "page": 1,
+        "page_size": 1,
+    }
+    assert backend.session.get.call_args_list[1].args == (
+        f"{BASE_URL}/shorts/?page=2&page_size=1",
+    )
+    assert [u.code for u in backend.cache.get()] == ["c1", "c2"]
+
+
+def test_iter_short_urls_without_prefetch(backend):
+    backend.session.get.side_effect = [
+        page_response({"results": [{"code": "c1", "target": "http://a.it"}], "next": "n"}),
+        page_response({"results": [{"code": "c2", "target": "http://b.it"}]}),
+    ]
+
+    urls = list(backend.iter_short_urls(prefetch=False))
+
+    assert [u.code for u in urls] == ["c1", "c2"]
+
+
+def test_iter_short_urls_unpaginated_server(backend):
+    backend.session.get.return_value = page_response(
+        [{"code": "c1", "target": "http://a.it"}, {"code": "c2", "target": "http://b.it"}]
+    )
+
+    assert [u.code for u in backend.iter_short_urls()] == ["c1", "c2"]
+    backend.session.get.assert_called_once()
+
+
+def test_iter_short_urls_raises_on_http_error(backend):
+    backend.session.get.return_value.raise_for_status.side_effect = Exception("403")
+
+    with pytest.raises(Exception, match="403"):
+        list(backend.iter_short_urls())
+    assert backend.cache.peek() is None
+
+
+def test_iter_short_urls_partial_read_does_not_fill_cache(backend):
+    backend.session.get.return_value = page_response(
+        [{"code": "c1", "target": "http://a.it"}, {"code": "c2", "target": "http://b.it"}]
+    )
+
+    urls = backend.iter_short_urls()
+    next(urls)
+    urls.close()
+
+    assert backend.cache.peek() is None
+
+
+def test_edit_session_sends_single_patch(backend):
+    prime_cache(backend)
+    backend.session.patch.return_value.ok = True
+    s = backend.cache.get()[0]
+    dt = datetime(2030, 1, 1, 12, 0, 0)
+
+    edit = backend.edit_session(s)
+    edit.set_target("http://new.it")
+    edit.set_label("NEW")
+    edit.set_visibility(True)
+    edit.set_expire(dt)
+    ok, msg = edit.commit()
+
+    assert ok is True
+    assert msg == "URL updated successfully"
+    assert edit.has_changes is False
+    backend.session.patch.assert_called_once_with(
+        f"{BASE_URL}/shorts/c1/",
+        json={
+            "target": "http://new.it",
+            "label": "NEW",
+            "private": True,
+            "expired_at": dt.isoformat(),
+        },
+        headers={"X-CSRFToken": "csrf123"},
+    )
+    cached = backend.cache.get()[0]
+    assert (cached.target, cached.label, cached.private, cached.expired_at) == (
+        "http://new.it",
+        "NEW",
+        True,
+        dt,
+    )
+
+
+def test_edit_session_keeps_changes_on_failure(backend):
+    backend.session.patch.return_value.ok = False
+    backend.session.patch.return_value.status_code = 400
+    backend.session.patch.return_value.text = "bad"
+    s = ShortUrl(code="abc123", label="x", target="http://a.it", user="u")
+
+    edit = backend.edit_session(s)
+    edit.set_label("NEW")
+    ok, msg = edit.commit()
+
+    assert ok is False
+    assert msg == "400: bad"
+    assert edit.changes == {"label": "NEW"}
+
+
+def test_edit_session_commit_without_changes(backend):
+    s = ShortUrl(code="abc123", label="x", target="http://a.it", user="u")
+    edit = backend.edit_session(s)
+
+    assert edit.commit() == (True, "Nothing to update")
+    backend.session.patch.assert_not_called()
+
+
+def test_edit_session_discard(backend):
+    s = ShortUrl(code="abc123", label="x", target="http://a.it", user="u")
+    edit = backend.edit_session(s)
+    edit.set_label("NEW")
+    edit.discard()
+
+    assert edit.has_changes is False
+
+
+def test_edit_fields_exception(backend):
+    backend.session.patch.side_effect = Exception("timeout")
+    s = ShortUrl(code="abc123", label="x", target="http://a.it", user="u")
+
+    ok, msg = backend.edit_fields(s, {"label": "NEW"})
+
+    assert ok is False
+    assert "timeout" in msg
+
+
+def test_open_mirror_serves_stale_rows_while_refreshing(backend, tmp_path):
+    path = tmp_path / "m.db"
+    Mirror(path, "alice", backend.base_url).replace(
+        [ShortUrl(code="old", label="O", target="http://o.it", user=None)]
+    )
+    backend.refresh_in_background = Mock()
+
+    backend.open_mirror("alice", path)
+    backend._refresh = Mock()
+    backend._refresh.done.return_value = False
+    ok, urls = backend.getShortUrl()
+
+    assert ok is True
+    assert [s.code for s in urls] == ["old"]
+    backend.refresh_in_background.assert_called_once()
+    backend.session.get.assert_not_called()
+
+
+def test_refresh_writes_through_to_mirror(backend, tmp_path):
+    backend.refresh_in_background = Mock()
+    backend.open_mirror("alice", tmp_path / "m.db")
+    prime_cache(backend)
+    backend.session.patch.return_value.ok = True
+    backend.edit_visibility(backend.cache.peek()[0], True)
+    backend.session.delete.return_value.ok = True
+    backend.deleteUrl(backend.cache.peek()[1])
+
+    urls = backend.mirror.load()
+
+    assert [(s.code, s.private) for s in urls] == [("c1", True)]
+
+
+def test_mirror_batch_writes_bulk_deletes_together(backend, tmp_path):
+    backend.refresh_in_background = Mock()
+    backend.open_mirror("alice", tmp_path / "m.db")
+    prime_cache(backend)
+    backend.session.delete.return_value.ok = True
+
+    with patch.object(backend.mirror, "_write", wraps=backend.mirror._write) as write:
+        with backend.mirror_batch():
+            for url in backend.cache.peek():
+                backend.deleteUrl(url)
+
+    write.assert_called_once_with([], ["c1", "c2"])
+    assert backend.mirror.load() == []
+
+
+def test_mirror_batch_survives_a_logout(backend, tmp_path):
+    backend.refresh_in_background = Mock()
+    backend.open_mirror("alice", tmp_path / "m.db")
+    prime_cache(backend)
+
+    with backend.mirror_batch():
+        backend.close_mirror()
+
+    assert backend.mirror is None
+
+
+def test_offline_falls_back_to_mirror(backend, tmp_path):
+    import requests
+    path = tmp_path / "m.db"
+    Mirror(path, "alice", backend.base_url).replace(
+        [ShortUrl(code="c1", label="A", target="http://a.it", user=None)]
+    )
+    backend.refresh_in_background = Mock()
+    backend.open_mirror("alice", path)
+    backend.cache.invalidate()
+    backend.session.get.side_effect = requests.ConnectionError("down")
+
+    ok, urls = backend.getShortUrl()
+
+    assert ok is True
+    assert [s.code for s in urls] == ["c1"]
+
+
+def test_offline_without_mirror_reports_error(backend):
+    backend.session.get.side_effect = requests.ConnectionError("down")
+
+    ok, msg = backend.getShortUrl()
+
+    assert ok is False
+    assert "down" in msg
+
+
+def test_login_closes_mirror(backend, tmp_path):
+    backend.refresh_in_background = Mock()
+    backend.open_mirror("alice", tmp_path / "m.db")
+    backend.session.post.return_value.ok = True
+
+    backend.login(Username("Persona"), Password("Persona88!"))
+
+    assert backend.mirror is None
+
+
+def test_background_refresh_reconciles_mirror(backend, tmp_path):
+    backend.session.get.return_value.ok = True
+    backend.session.get.return_value.status_code = 200
+    backend.session.get.return_value.json.return_value = [
+        {"code": "new", "target": "http://n.it", "label": "N"}
+    ]
+
+    backend.open_mirror("alice", tmp_path / "m.db")
+    backend._refresh.result(timeout=5)
+
+    assert [s.code for s in backend.mirror.load()] == ["new"]
+    assert backend.cache.get() is not None
+
+
+def sync_response(items, status_code=200):
+    resp = Mock()
+    resp.ok = status_code < 400
+    resp.status_code = status_code
+    resp.headers = {}
+    resp.json.return_value = items
+    return resp
+
+
+def prime_synced(backend):
+    backend.session.cookies.get.return_value = "csrf123"
+    backend.session.get.return_value = sync_response(
+        [
+            {"code": "c1", "target": "http://a.it", "updated_at": "2030-01-01T10:00:00Z"},
+            {"code": "c2", "target": "http://b.it", "updated_at": "2030-01-01T11:00:00Z"},
+        ]
+    )
+    backend.getShortUrl()
+    backend.session.get.reset_mock()
+
+
+def test_full_fetch_sets_high_water_mark(backend):
+    prime_synced(backend)
+    assert backend.sync_mark == "2030-01-01T11:00:00Z"
+
+
+def test_sync_merges_delta_and_tombstones(backend):
+    prime_synced(backend)
+    backend.session.get.return_value = sync_response(
+        [
+            {"code": "c1", "target": "http://new.it", "updated_at": "2030-01-02T00:00:00Z"},
+            {"code": "c3", "target": "http://c.it", "updated_at": "2030-01-02T01:00:00Z"},
+            {"code": "c2", "deleted": True, "updated_at": "2030-01-02T02:00:00Z"},
+        ]
+    )
+
+    ok, urls = backend.sync()
+
+    assert ok is True
+    assert [(s.code, s.target) for s in urls] == [
+        ("c1", "http://new.it"),
+        ("c3", "http://c.it"),
+    ]
+    assert backend.session.get.call_args.kwargs["params"] == {
+        "updated_since": "2030-01-01T11:00:00Z"
+    }
+    assert backend.sync_mark == "2030-01-02T02:00:00Z"
+
+
+def test_sync_falls_back_to_full_diff_when_server_ignores_filter(backend):
+    prime_synced(backend)
+    backend.session.get.return_value = sync_response(
+        [{"code": "c1", "target": "http://a.it", "updated_at": "2030-01-01T10:00:00Z"}]
+    )
+
+    ok, urls = backend.sync()
+
+    assert ok is True
+    assert [s.code for s in urls] == ["c1"]
+    assert backend.sync_mark == "2030-01-01T10:00:00Z"
+
+
+def test_sync_not_modified_keeps_collection(backend):
+    prime_synced(backend)
+    backend.session.get.return_value = sync_response([], status_code=304)
+
+    ok, urls = backend.sync()
+
+    assert ok is True
+    assert [s.code for s in urls] == ["c1", "c2"]
+
+
+def test_stale_cache_refresh_uses_sync(backend):
+    prime_synced(backend)
+    backend.cache.ttl = 0
+    backend.session.get.return_value = sync_response([])
+
+    ok, urls = backend.getShortUrl()
+
+    assert ok is True
+    assert len(urls) == 2
+    assert "updated_since" in backend.session.get.call_args.kwargs["params"]
+
+
+def test_sync_without_mark_does_full_fetch(backend):
+    prime_cache(backend)
+    backend.session.get.return_value.status_code = 200
+
+    ok, urls = backend.sync()
+
+    assert ok is True
+    assert "params" not in backend.session.get.call_args.kwargs
+
+
+def test_sync_writes_delta_to_mirror(backend, tmp_path):
+    backend.refresh_in_background = Mock()
+    backend.open_mirror("alice", tmp_path / "m.db")
+    prime_synced(backend)
+    backend.session.get.return_value = sync_response(
+        [{"code": "c1", "deleted": True, "updated_at": "2030-01-02T00:00:00Z"}]
+    )
+
+    backend.sync()
+
+    assert [s.code for s in backend.mirror.load()] == ["c2"]
+    assert backend.mirror.get_mark() == "2030-01-02T00:00:00Z"
+
+
+def test_local_edit_bumps_updated_at(backend):
+    prime_cache(backend)
+    backend.session.patch.return_value.ok = True
+    before = backend.cache.peek()[0]
+
+    backend.edit_label("NEW", before)
+
+    after = backend.cache.peek()[0]
+    assert before.updated_at is None
+    assert isinstance(after.updated_at, datetime)
+
+
+def test_search_uses_the_cached_collection(backend):
+    prime_cache(backend)
+
+    ok, results = backend.search("b")
+
+    assert ok is True
+    assert [s.code for s in results] == ["c2"]
+    backend.session.get.assert_not_called()
+
+
+def test_search_fetches_when_nothing_is_cached(backend):
+    backend.session.get.return_value.ok = False
+    backend.session.get.return_value.status_code = 500
+    backend.session.get.return_value.text = "boom"
+
+    ok, msg = backend.search("x")
+
+    assert ok is False
+    assert "500" in msg
+
+
+def single_row(backend, code="c9", label="Nine"):
+    backend.session.cookies.get.return_value = "csrf123"
+    backend.session.get.return_value.ok = True
+    backend.session.get.return_value.json.return_value = {
+        "code": code,
+        "target": "http://nine.it",
+        "label": label,
+        "private": False,
+        "expired_at": None,
+        "updated_at": "2025-01-01T10:00:00Z",
+    }
+
+
+def test_get_short_fetches_one_link_and_remembers_it(backend):
+    single_row(backend)
+
+    ok, s = backend.get_short("c9")
+
+    assert ok is True
+    assert s.code == "c9" and s.label == "Nine"
+    backend.session.get.assert_called_once_with(
+        f"{backend.base_url}/shorts/c9/", headers={"X-CSRFToken": "csrf123"}
+    )
+
+    assert backend.get_short("c9") == (True, s)
+    assert backend.session.get.call_count == 1
+
+
+def test_get_short_uses_the_fresh_collection(backend):
+    prime_cache(backend)
+
+    ok, s = backend.get_short("c2")
+
+    assert ok is True and s.label == "B"
+    backend.session.get.assert_not_called()
+
+
+def test_get_short_not_found(backend):
+    backend.session.get.return_value.ok = False
+    backend.session.get.return_value.status_code = 404
+    backend.session.get.return_value.text = "Not found"
+
+    assert backend.get_short("zz") == (False, "404: Not found")
+    assert len(backend.recent) == 0
+
+
+def test_get_short_offline_uses_the_mirror(backend, tmp_path):
+    backend.open_mirror("alice", tmp_path / "m.sqlite3")
+    backend.mirror.replace(
+        [ShortUrl(code="c9", target="http://nine.it", label="N", user=None)]
+    )
+    backend.session.get.side_effect = requests.ConnectionError("down")
+
+    ok, s = backend.get_short("c9")
+
+    assert ok is True and s.label == "N"
+    assert backend.get_short("zz") == (False, "down")
+
+
+def test_edits_and_deletes_keep_recent_links_current(backend):
+    single_row(backend)
+    ok, s = backend.get_short("c9")
+    backend.session.patch.return_value.ok = True
+    backend.session.delete.return_value.ok = True
+
+    backend.edit_fields(s, {"label": "Renamed"})
+    assert backend.get_short("c9")[1].label == "Renamed"
+    backend.session.get.assert_called_once()
+
+    backend.deleteUrl(s)
+    backend.get_short("c9")
+    assert backend.session.get.call_count == 2
+
+
+def test_login_forgets_recent_links(backend):
+    single_row(backend)
+    backend.get_short("c9")
+    backend.session.post.return_value.ok = True
+
+    backend.login(Username("user1"), Password("Password123!"))
+
+    assert len(backend.recent) == 0
+
+
+def offline_backend(backend, tmp_path):
+    backend.open_journal("alice", tmp_path / "j.jsonl")
+    prime_cache(backend)
+    down = requests.ConnectionError("down")
+    backend.session.post.side_effect = down
+    backend.session.patch.side_effect = down
+    backend.session.delete.side_effect = down
+    return backend
+
+
+def test_writes_are_journaled_while_offline(backend, tmp_path):
+    offline_backend(backend, tmp_path)
+    c1, c2 = backend.cache.peek()
+
+    ok, msg = backend.createUrl(short("http://n.it", "New"))
+    assert ok is True and "offline" in msg
+    assert backend.edit_target(c1, "http://t.it") is True
+    assert backend.edit_label("L", c1)[0] is True
+    assert backend.deleteUrl(c2)[0] is True
+
+    urls = {s.code: s for s in backend.cache.peek()}
+    local = msg.split()[0]
+    assert set(urls) == {"c1", local}
+    assert (urls["c1"].target, urls["c1"].label) == ("http://t.it", "L")
+    assert [e["op"] for e in backend.journal.entries()] == [
+        "create",
+        "edit",
+        "edit",
+        "delete",
+    ]
+
+
+def test_offline_writes_fail_without_a_journal(backend):
+    prime_cache(backend)
+    backend.session.delete.side_effect = requests.ConnectionError("down")
+
+    ok, msg = backend.deleteUrl(backend.cache.peek()[0])
+
+    assert (ok, msg) == (False, "down")
+    assert len(backend.cache.peek()) == 2
+
+
+def test_links_created_offline_are_edited_locally(backend, tmp_path):
+    offline_backend(backend, tmp_path)
+    backend.session.patch.side_effect = None
+    _, msg = backend.createUrl(short("http://n.it", "New"))
+    local = msg.split()[0]
+    created = next(s for s in backend.cache.peek() if s.code == local)
+
+    ok, _ = backend.edit_fields(created, {"label": "Renamed"})
+
+    assert ok is True
+    backend.session.patch.assert_not_called()
+    assert len(backend.journal) == 2
+
+
+def test_replay_sends_one_request_per_link(backend, tmp_path):
+    offline_backend(backend, tmp_path)
+    c1, c2 = backend.cache.peek()
+    _, msg = backend.createUrl(short("http://n.it", "New"))
+    local = msg.split()[0]
+    created = next(s for s in backend.cache.peek() if s.code == local)
+    backend.edit_label("Renamed", created)
+    backend.edit_label("X", c1)
+    backend.edit_visibility(c1, True)
+    backend.edit_label("Y", c2)
+    backend.deleteUrl(c2)
+    create_id = backend.journal.entries()[0]["id"]
+
+    for method in (backend.session.post, backend.session.patch):
+        method.reset_mock()
+        method.side_effect = None
+        method.return_value.ok = True
+    backend.session.delete.reset_mock()
+    backend.session.delete.side_effect = None
+    backend.session.delete.return_value.status_code = 404
+    backend.session.post.return_value.json.return_value = {"code": "srv1"}
+
+    assert backend.replay_journal() == (True, [])
+
+    post = backend.session.post.call_args
+    assert post.kwargs["data"]["label"] == "Renamed"
+    assert post.kwargs["headers"]["Idempotency-Key"] == create_id
+    backend.session.patch.assert_called_once_with(
+        f"{BASE_URL}/shorts/c1/",
+        headers={"X-CSRFToken": "csrf123"},
+        json={"label": "X", "private": True},
+    )
+    backend.session.delete.assert_called_once()
+    assert len(backend.journal) == 0
+    assert {s.code for s in backend.cache.peek()} == {"c1", "srv1"}
+
+
+def test_timed_out_create_is_replayed_under_its_original_key(backend, tmp_path):
+    offline_backend(backend, tmp_path)
+    backend.session.post.side_effect = requests.ReadTimeout("slow")
+    backend.createUrl(short("http://n.it", "New"))
+    sent = backend.session.post.call_args.kwargs["headers"]["Idempotency-Key"]
+
+    backend.session.post.reset_mock()
+    backend.session.post.side_effect = None
+    backend.session.post.return_value.ok = True
+    backend.session.post.return_value.json.return_value = {"code": "srv1"}
+    backend.replay_journal()
+
+    replayed = backend.session.post.call_args.kwargs["headers"]["Idempotency-Key"]
+    assert replayed == sent
+
+
+def test_replay_keeps_writes_while_unreachable(backend, tmp_path):
+    offline_backend(backend, tmp_path)
+    backend.edit_label("X", backend.cache.peek()[0])
+    backend.session.get.side_effect = requests.ConnectionError("down")
+
+    assert backend.replay_journal() == (False, [])
+    ok, urls = backend.getShortUrl(refresh=True)
+
+    assert ok is True and urls[0].label == "X"
+    assert len(backend.journal) == 1
+    backend.session.get.assert_not_called()
+
+
+def test_replay_drops_writes_the_server_refuses(backend, tmp_path):
+    offline_backend(backend, tmp_path)
+    backend.edit_label("X", backend.cache.peek()[0])
+    backend.session.patch.side_effect = None
+    backend.session.patch.return_value.ok = False
+    backend.session.patch.return_value.status_code = 400
+    backend.session.patch.return_value.text = "bad"
+
+    reachable, rejected = backend.replay_journal()
+
+    assert reachable is True
+    assert rejected == ["edit c1: 400: bad"]
+    assert len(backend.journal) == 0
+
+
+def test_replay_settles_the_journal_it_started_with(backend, tmp_path):
+    offline_backend(backend, tmp_path)
+    backend.edit_label("X", backend.cache.peek()[0])
+    journal = backend.journal
+    refused = Mock(ok=False, status_code=400, text="bad")
+
+    def logout_meanwhile(*args, **kwargs):
+        backend.close_journal()
+        return refused
+
+    backend.session.patch.side_effect = logout_meanwhile
+
+    assert backend.replay_journal() == (True, ["edit c1: 400: bad"])
+    assert len(journal) == 0
+    assert backend.pop_rejected() == []
+
+
+def test_refresh_replays_the_journal_first(backend, tmp_path):
+    offline_backend(backend, tmp_path)
+    backend.edit_label("X", backend.cache.peek()[0])
+    calls = []
+    backend.session.patch.side_effect = lambda *a, **k: calls.append("patch") or (
+        backend.session.patch.return_value
+    )
+    backend.session.get.side_effect = lambda *a, **k: calls.append("get") or (
+        backend.session.get.return_value
+    )
+
+    backend.getShortUrl(refresh=True)
+
+    assert calls == ["patch", "get"]
+    assert len(backend.journal) == 0
+
+
+def session_backend(backend, tmp_path):
+    from cryptography.fernet import Fernet
+
+    with pytest.MonkeyPatch.context() as env:
+        env.setenv("SHORTCAT_SESSION_KEY", Fernet.generate_key().decode())
+        backend.open_session_store(tmp_path)
+    backend.session.cookies = requests.cookies.RequestsCookieJar()
+    backend.session.cookies.set("sessionid", "s1")
+    backend.session.cookies.set("csrftoken", "t1")
+    backend.session.post.return_value.ok = True
+    backend.login(Username("alice"), Password("Password123!"))
+    backend.session.cookies = requests.cookies.RequestsCookieJar()
+    return backend
+
+
+def test_resume_session_reuses_saved_cookies(backend, tmp_path):
+    session_backend(backend, tmp_path)
+    backend.session.get.return_value.ok = True
+
+    assert backend.resume_session() == "alice"
+
+    backend.session.get.assert_called_once_with(f"{BASE_URL}/auth/user/")
+    assert backend.session.cookies.get("sessionid") == "s1"
+
+
+def test_resume_session_drops_a_rejected_session(backend, tmp_path):
+    session_backend(backend, tmp_path)
+    backend.session.get.return_value.ok = False
+    backend.session.get.return_value.status_code = 403
+
+    assert backend.resume_session() is None
+    assert backend.session.cookies.get("sessionid") is None
+    assert backend.sessions.load() is None
+
+
+def test_resume_session_keeps_it_while_the_backend_fails(backend, tmp_path):
+    session_backend(backend, tmp_path)
+    backend.session.get.return_value.ok = False
+    backend.session.get.return_value.status_code = 503
+
+    assert backend.resume_session() is None
+    assert backend.session.cookies.get("sessionid") is None
+    assert backend.sessions.load()["account"] == "alice"
+
+
+def test_resume_session_keeps_it_while_unreachable(backend, tmp_path):
+    session_backend(backend, tmp_path)
+    backend.session.get.side_effect = requests.ConnectionError("down")
+
+    assert backend.resume_session() is None
+    assert backend.sessions.load()["account"] == "alice"
+
+
+def test_logout_forgets_the_saved_session(backend, tmp_path):
+    session_backend(backend, tmp_path)
+
+    backend.logout()
+
+    assert backend.sessions.load() is None
+
+
+def slow_listing(backend):
+    release = threading.Event()
+
+    def get(*args, **kwargs):
+        release.wait(5)
+        response = Mock(ok=True, status_code=200, headers={})
+        response.json.return_value = [
+            {"code": "c1", "target": "http://a.it", "label": "A", "private": False}
+        ]
+        return response
+
+    backend.session.get.side_effect = get
+    return release
+
+
+def test_prefetch_is_joined_instead_of_repeated(backend):
+    release = slow_listing(backend)
+
+    first = backend.start_prefetch()
+    assert backend.start_prefetch() is first
+    threading.Timer(0.05, release.set).start()
+    ok, urls = backend.getShortUrl()
+
+    assert ok is True and [s.code for s in urls] == ["c1"]
+    backend.session.get.assert_called_once()
+
+
+def test_streaming_waits_for_the_prefetch(backend):
+    release = slow_listing(backend)
+    backend.start_prefetch()
+    threading.Timer(0.05, release.set).start()
+
+    assert [s.code for s in backend.iter_short_urls()] == ["c1"]
+    backend.session.get.assert_called_once()
+
+
+def test_refresh_of_a_previous_account_is_dropped(backend, tmp_path):
+    path = tmp_path / "m.db"
+    release = threading.Event()
+    alice_row = {"code": "a1", "target": "http://a.it", "label": "A"}
+    bob_row = {"code": "b1", "target": "http://b.it", "label": "B"}
+
+    def get(*args, **kwargs):
+        # the first listing (alice's) is slow, later ones answer for bob
+        slow = not release.is_set() and backend.session.get.call_count == 1
+        if slow:
+            release.wait(5)
+        row = alice_row if slow else bob_row
+        response = Mock(ok=True, status_code=200, headers={})
+        response.json.return_value = [dict(row, updated_at="2025-01-01T00:00:00")]
+        return response
+
+    backend.session.get.side_effect = get
+    backend.session.post.return_value.ok = True
+    backend.open_mirror("alice", path)
+    alice_refresh = backend._refresh
+
+    backend.login(Username("bobby"), Password("Password123!"))
+    backend.open_mirror("bobby", path)
+    backend._refresh.result(timeout=5)
+    release.set()
+    assert alice_refresh.result(timeout=5) == (False, "refresh superseded by a new session")
+
+    ok, urls = backend.getShortUrl()
+    assert [s.code for s in urls] == ["b1"]
+    assert [s.code for s in Mirror(path, "bobby", backend.base_url).load()] == ["b1"]
+    assert Mirror(path, "alice", backend.base_url).load() == []
+
+
+def test_rejected_offline_create_leaves_the_local_view(backend, tmp_path):
+    offline_backend(backend, tmp_path)
+    _, msg = backend.createUrl(short("http://n.it", "New"))
+    local = msg.split()[0]
+    created = next(s for s in backend.cache.peek() if s.code == local)
+    backend.session.post.side_effect = None
+    backend.session.post.return_value.ok = False
+    backend.session.post.return_value.status_code = 400
+    backend.session.post.return_value.text = "bad"
+
+    assert backend.replay_journal() == (True, [f"create {local}: 400: bad"])
+    assert local not in {s.code for s in backend.cache.peek()}
+
+    # an edit made through a stale reference is refused, not kept forever
+    backend.edit_label("Late", created)
+    assert backend.replay_journal()[0] is True
+    assert len(backend.journal) == 0
+    assert backend.pop_rejected() == [
+        f"create {local}: 400: bad",
+        f"edit {local}: the link was never created on the server",
+    ]
+    assert backend.pop_rejected() == []
+
+    backend.session.get.reset_mock()
+    backend.getShortUrl(refresh=True)
+    backend.session.get.assert_called_once()
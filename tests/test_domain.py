@@ -151,3 +151,47 @@ def test_short_str():
     )
     assert str(s) == "http://a.it"
 
+
+
+def test_from_api_batch_converts_timestamps():
+    urls = ShortUrl.from_api_batch(
+        [
+            {
+                "code": "c1",
+                "target": "http://a.it",
+                "label": None,
+                "private": True,
+                "expired_at": "2030-01-01T10:00:00Z",
+                "updated_at": "2030-01-01T10:00:00Z",
+            },
+            {"code": "c2", "target": "http://b.it"},
+        ]
+    )
+
+    assert [s.code for s in urls] == ["c1", "c2"]
+    assert urls[0].label == ""
+    assert urls[0].private is True
+    assert urls[0].expired_at == datetime(2030, 1, 1, 10, 0)
+    assert urls[0].updated_at == urls[0].expired_at
+    assert urls[1].expired_at is None
+    assert urls[1] == ShortUrl(code="c2", label="", target="http://b.it", user=None)
+
+
+def test_from_api_batch_is_frozen():
+    s = ShortUrl.from_api_batch([{"code": "c1", "target": "http://a.it"}])[0]
+    with pytest.raises(Exception):
+        s.code = "x"
+
+
+@pytest.mark.parametrize(
+    "row",
+    [
+        "c1",
+        {"target": "http://a.it"},
+        {"code": 1, "target": "http://a.it"},
+        {"code": "c1", "target": "http://a.it", "private": "yes"},
+    ],
+)
+def test_from_api_batch_rejects_malformed_rows(row):
+    with pytest.raises(ValueError):
+        ShortUrl.from_api_batch([row])
@@ -0,0 +1,114 @@
+import json
+import stat
+
+from tui.journal import Journal, coalesce, default_path, is_local, local_code
+
+
+def entry(op, code, n, **fields):
+    return {"id": str(n), "op": op, "code": code, "fields": fields}
+
+
+def test_default_path_honours_env(tmp_path):
+    assert default_path({}).name == "journal.jsonl"
+    target = tmp_path / "j.jsonl"
+    assert default_path({"SHORTCAT_JOURNAL": str(target)}) == target
+    assert default_path({"SHORTCAT_JOURNAL": "off"}) is None
+
+
+def test_local_codes_are_recognisable():
+    code = local_code()
+
+    assert is_local(code)
+    assert not is_local("abc123")
+    assert code != local_code()
+
+
+def test_create_and_edits_collapse_into_one_create():
+    ops = coalesce(
+        [
+            entry("create", "~a", 1, target="http://a.it", label="A"),
+            entry("edit", "~a", 2, label="B"),
+            entry("edit", "~a", 3, private=True),
+        ]
+    )
+
+    assert ops == [
+        {
+            "op": "create",
+            "code": "~a",
+            "fields": {"target": "http://a.it", "label": "B", "private": True},
+            "ids": ["1", "2", "3"],
+            "id": "1",
+        }
+    ]
+
+
+def test_edits_merge_and_a_delete_wins():
+    ops = coalesce(
+        [
+            entry("edit", "a", 1, label="X"),
+            entry("edit", "b", 2, label="Y"),
+            entry("edit", "a", 3, private=True),
+            entry("delete", "b", 4),
+        ]
+    )
+
+    assert [(op["op"], op["code"], op["fields"]) for op in ops] == [
+        ("edit", "a", {"label": "X", "private": True}),
+        ("delete", "b", {}),
+    ]
+    assert ops[1]["ids"] == ["2", "4"]
+
+
+def test_create_then_delete_sends_nothing():
+    ops = coalesce([entry("create", "~a", 1, label="A"), entry("delete", "~a", 2)])
+
+    assert [(op["op"], op["ids"]) for op in ops] == [(None, ["1", "2"])]
+
+
+def test_append_survives_reopening_and_skips_torn_lines(tmp_path):
+    path = tmp_path / "j.jsonl"
+    Journal(path, "alice", "http://x/api").append("edit", "a", {"label": "A"})
+    with path.open("a") as f:
+        f.write('{"id": "torn", "op": "ed')
+
+    journal = Journal(path, "alice", "http://x/api")
+
+    assert len(journal) == 1
+    assert journal.entries()[0]["fields"] == {"label": "A"}
+
+
+def test_entries_are_scoped_by_account_and_backend(tmp_path):
+    path = tmp_path / "j.jsonl"
+    Journal(path, "alice", "http://x/api").append("delete", "a")
+    Journal(path, "bob", "http://x/api").append("delete", "b")
+    Journal(path, "alice", "http://y/api").append("delete", "c")
+
+    assert [e["code"] for e in Journal(path, "alice", "http://x/api").entries()] == [
+        "a"
+    ]
+
+
+def test_settle_drops_ids_renames_codes_and_keeps_other_accounts(tmp_path):
+    path = tmp_path / "j.jsonl"
+    other = Journal(path, "bob", "http://x/api")
+    other.append("edit", "~a", {"label": "B"})
+    journal = Journal(path, "alice", "http://x/api")
+    create = journal.append("create", "~a", {"target": "http://a.it"})
+    journal.append("edit", "~a", {"label": "later"})
+
+    journal.settle([create["id"]], {"~a": "srv1"})
+
+    assert [(e["op"], e["code"]) for e in journal.entries()] == [("edit", "srv1")]
+    assert [e["code"] for e in Journal(path, "bob", "http://x/api").entries()] == ["~a"]
+    assert all(json.loads(line) for line in path.read_text().splitlines())
+
+
+def test_journal_file_is_private(tmp_path):
+    path = tmp_path / "j.jsonl"
+    journal = Journal(path, "alice", "http://x/api")
+    entry = journal.append("delete", "a")
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    journal.settle([entry["id"]])
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
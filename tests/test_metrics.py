@@ -0,0 +1,88 @@
+import json
+import threading
+
+import tui.metrics as metrics_mod
+from tui.metrics import Metrics, current_operation, instrumented, operation, percentile
+
+
+def test_percentile():
+    samples = [float(n) for n in range(1, 101)]
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 95) == 95
+    assert percentile(samples, 99) == 99
+    assert percentile([], 50) == 0.0
+    assert percentile([3.0], 99) == 3.0
+
+
+def test_operation_context_nests():
+    assert current_operation() is None
+    with operation("outer"):
+        with operation("inner"):
+            assert current_operation() == "inner"
+        assert current_operation() == "outer"
+    assert current_operation() is None
+
+
+def test_operation_is_thread_local():
+    seen = []
+    with operation("main"):
+        t = threading.Thread(target=lambda: seen.append(current_operation()))
+        t.start()
+        t.join()
+    assert seen == [None]
+
+
+def test_instrumented_decorator():
+    @instrumented("login")
+    def login():
+        return current_operation()
+
+    assert login() == "login"
+    assert login.__name__ == "login"
+
+
+def test_record_and_snapshot():
+    metrics = Metrics()
+    metrics.record("getShortUrl", 0.010, status=200, bytes_in=100, bytes_out=5)
+    metrics.record("getShortUrl", 0.030, status=304, bytes_in=0, retries=2)
+    metrics.record("getShortUrl", 0.020, error=True)
+    metrics.record("createUrl", 0.5, status=400)
+
+    stats = metrics.get("getShortUrl")
+    assert stats["count"] == 3
+    assert stats["errors"] == 1
+    assert stats["retries"] == 2
+    assert stats["bytes_in"] == 100
+    assert stats["bytes_out"] == 5
+    assert stats["statuses"] == {"200": 1, "304": 1, "error": 1}
+    assert round(stats["latency_ms"]["p50"]) == 20
+    assert round(stats["latency_ms"]["max"]) == 30
+    assert round(stats["latency_ms"]["mean"]) == 20
+    assert metrics.get("createUrl")["errors"] == 1
+    assert metrics.get("missing") is None
+
+
+def test_samples_are_bounded(monkeypatch):
+    monkeypatch.setattr(metrics_mod, "MAX_SAMPLES", 10)
+    metrics = Metrics(rng=lambda: 0.0)
+    for n in range(100):
+        metrics.record("op", float(n), status=200)
+
+    stats = metrics._operations["op"]
+    assert len(stats.samples) == 10
+    assert stats.count == 100
+
+
+def test_reset_and_dump(tmp_path):
+    metrics = Metrics()
+    metrics.record("login", 0.1, status=200)
+    path = tmp_path / "metrics.json"
+
+    metrics.dump(str(path), connections={"connections_opened": 1})
+
+    data = json.loads(path.read_text())
+    assert data["operations"]["login"]["count"] == 1
+    assert data["connections"] == {"connections_opened": 1}
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
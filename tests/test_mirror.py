@@ -0,0 +1,103 @@
+import sqlite3
+import stat
+from datetime import datetime
+
+from tui.domain import ShortUrl
+from tui.mirror import Mirror, default_path
+
+
+def make(code, label="x", **kwargs):
+    return ShortUrl(code=code, label=label, target="http://a.it", user=None, **kwargs)
+
+
+def test_default_path_honours_env(tmp_path):
+    assert default_path({}).name == "mirror.sqlite3"
+    assert (
+        default_path({"SHORTCAT_MIRROR": str(tmp_path / "m.db")}) == tmp_path / "m.db"
+    )
+    assert default_path({"SHORTCAT_MIRROR": "off"}) is None
+
+
+def test_replace_and_load_keep_order(tmp_path):
+    mirror = Mirror(tmp_path / "m.db", "alice", "http://x/api")
+    expiry = datetime(2030, 1, 1, 12, 0)
+    mirror.replace([make("b", private=True, expired_at=expiry), make("a")])
+
+    urls = mirror.load()
+
+    assert [s.code for s in urls] == ["b", "a"]
+    assert urls[0].private is True
+    assert urls[0].expired_at == expiry
+
+
+def test_rows_are_scoped_by_account_and_backend(tmp_path):
+    path = tmp_path / "m.db"
+    Mirror(path, "alice", "http://x/api").replace([make("a")])
+    Mirror(path, "bob", "http://x/api").replace([make("b")])
+
+    assert [s.code for s in Mirror(path, "alice", "http://x/api").load()] == ["a"]
+    assert Mirror(path, "alice", "http://y/api").load() == []
+
+
+def test_upsert_delete_and_get(tmp_path):
+    mirror = Mirror(tmp_path / "sub" / "m.db", "alice", "http://x/api")
+    mirror.replace([make("a"), make("b")])
+
+    mirror.upsert(make("a", label="renamed"))
+    mirror.upsert(make("c"))
+    mirror.delete("b")
+
+    assert [(s.code, s.label) for s in mirror.load()] == [("a", "renamed"), ("c", "x")]
+    assert mirror.get("c").code == "c"
+    assert mirror.get("b") is None
+    mirror.close()
+
+
+def test_apply_and_mark(tmp_path):
+    mirror = Mirror(tmp_path / "m.db", "alice", "http://x/api")
+    mirror.replace([make("a"), make("b")])
+
+    mirror.apply([make("c"), make("a", label="new")], ["b"])
+    mirror.set_mark("2030-01-01T00:00:00Z")
+
+    assert [(s.code, s.label) for s in mirror.load()] == [("a", "new"), ("c", "x")]
+    assert mirror.get_mark() == "2030-01-01T00:00:00Z"
+    assert Mirror(tmp_path / "m.db", "bob", "http://x/api").get_mark() is None
+
+
+def rows_on_disk(path):
+    with sqlite3.connect(path) as db:
+        return [r[0] for r in db.execute("SELECT code FROM links ORDER BY position")]
+
+
+def test_batch_writes_once_and_keeps_positions(tmp_path):
+    path = tmp_path / "m.db"
+    mirror = Mirror(path, "alice", "http://x/api")
+    mirror.replace([make("a"), make("b")])
+
+    mirror.begin_batch()
+    mirror.upsert(make("c"))
+    mirror.upsert(make("a", label="renamed"))
+    mirror.delete("b")
+    assert rows_on_disk(path) == ["a", "b"]
+    mirror.end_batch()
+
+    assert rows_on_disk(path) == ["a", "c"]
+    assert mirror.get("a").label == "renamed"
+
+
+def test_reads_see_buffered_writes(tmp_path):
+    mirror = Mirror(tmp_path / "m.db", "alice", "http://x/api")
+    mirror.begin_batch()
+    mirror.upsert(make("a"))
+
+    assert [s.code for s in mirror.load()] == ["a"]
+    mirror.close()
+
+
+def test_mirror_file_is_private_and_uses_wal(tmp_path):
+    path = tmp_path / "m.db"
+    mirror = Mirror(path, "alice", "http://x/api")
+
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert mirror._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+import pytest
+
+from tui.domain import ShortUrl
+from tui.pager import Pager, default_page_size
+
+
+def urls(count):
+    return [
+        ShortUrl(code=f"c{n}", label="L", target="http://a.it", user=None)
+        for n in range(1, count + 1)
+    ]
+
+
+def test_default_page_size_follows_terminal():
+    with patch("tui.pager.shutil.get_terminal_size") as size:
+        size.return_value.lines = 40
+        assert default_page_size() == 32
+        size.return_value.lines = 3
+        assert default_page_size() == 5
+
+
+def test_window_and_navigation():
+    pager = Pager(urls(25), page_size=10)
+
+    assert [n for n, _ in pager.window()] == list(range(1, 11))
+    assert pager.prev() is False
+    assert pager.next() is True
+    assert pager.window()[0][0] == 11
+    pager.goto(3)
+    assert [n for n, _ in pager.window()] == list(range(21, 26))
+    assert pager.next() is False
+    assert pager.page_count == 3
+    with pytest.raises(ValueError):
+        pager.goto(4)
+
+
+def test_global_numbers_are_addressable():
+    pager = Pager(iter(urls(25)), page_size=10)
+
+    assert pager[17].code == "c17"
+    assert 26 not in pager
+    assert 0 not in pager
+    assert len(pager) == 25
+    assert [s.code for s in pager.values()][-1] == "c25"
+
+
+def test_iterators_are_pulled_one_page_at_a_time():
+    pulled = []
+
+    def stream():
+        for s in urls(1000):
+            pulled.append(s)
+            yield s
+
+    pager = Pager(stream(), page_size=10)
+    pager.window()
+    assert pager.page_count is None
+    assert pager.has_next
+    assert len(pulled) == 11
+
+
+def test_render_formats_only_the_visible_window():
+    pager = Pager(urls(10_000), page_size=20)
+
+    text = pager.render()
+
+    assert "c20 " in text and "c21 " not in text
+    assert pager.renderer.formatted == 20
+    assert "Page 1/500" in text
+
+
+def test_render_single_page_has_no_footer():
+    assert "Page" not in Pager(urls(3), page_size=10).render()
+
+
+def test_handle_commands():
+    pager = Pager(urls(30), page_size=10)
+
+    assert pager.handle("n") and pager.page == 1
+    assert pager.handle("P") and pager.page == 0
+    assert pager.handle("g 3") and pager.page == 2
+    assert pager.handle("g3") and pager.page == 2
+    assert pager.handle("3") is False
@@ -0,0 +1,68 @@
+from dataclasses import replace
+from datetime import datetime
+from unittest.mock import Mock
+
+from tui.domain import ShortUrl
+from tui.render import HEADER, TableRenderer, format_expiry, truncate
+
+
+def make(code, updated_at=datetime(2030, 1, 1), **kwargs):
+    return ShortUrl(
+        code=code,
+        label=kwargs.pop("label", "L"),
+        target=kwargs.pop("target", "http://a.it"),
+        user=None,
+        updated_at=updated_at,
+        **kwargs,
+    )
+
+
+def test_helpers():
+    assert truncate("x" * 60, 50) == "x" * 47 + "..."
+    assert truncate("short", 50) == "short"
+    assert format_expiry(None) == "N/A"
+    assert format_expiry(datetime(2030, 1, 2, 3, 4)) == "02/01/2030 03:04"
+    assert format_expiry("2030-01-02T03:04:00Z") == "02/01/2030 03:04"
+
+
+def test_write_is_a_single_buffered_write():
+    out = Mock()
+
+    TableRenderer().write([(1, make("a1")), (2, make("a2"))], out)
+
+    out.write.assert_called_once()
+    lines = out.write.call_args.args[0].splitlines()
+    assert lines[1] == HEADER
+    assert lines[3].startswith("1    | a1")
+    assert lines[4].startswith("2    | a2")
+
+
+def test_rows_are_reformatted_only_when_updated():
+    renderer = TableRenderer()
+    urls = [make(f"c{n}") for n in range(100)]
+    renderer.render(enumerate(urls, 1))
+    assert renderer.formatted == 100
+
+    urls[5] = replace(urls[5], label="edited", updated_at=datetime(2030, 1, 2))
+    text = renderer.render(enumerate(urls, 1))
+
+    assert renderer.formatted == 101
+    assert "edited" in text
+
+
+def test_rows_without_timestamp_are_cached_by_identity():
+    renderer = TableRenderer()
+    s = make("a1", updated_at=None)
+
+    renderer.format_row(s)
+    renderer.format_row(s)
+    renderer.format_row(replace(s, label="other"))
+
+    assert renderer.formatted == 2
+
+
+def test_cache_is_bounded():
+    renderer = TableRenderer(max_rows=2)
+    for n in range(5):
+        renderer.format_row(make(f"c{n}"))
+    assert len(renderer._rows) <= 2
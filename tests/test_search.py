@@ -0,0 +1,87 @@
+from dataclasses import replace
+
+from tui.cache import ShortUrlCache
+from tui.domain import ShortUrl
+from tui.search import SearchIndex, tokens
+
+
+def make(code, label, target):
+    return ShortUrl(code=code, label=label, target=target, user=None)
+
+
+def sample():
+    return [
+        make("abc", "Summer Sale", "https://shop.example.com/sale/summer?utm=x"),
+        make("def", "Blog post", "https://blog.example.org/posts/python-tips"),
+        make("ghi", "summer blog", "http://news.site.it/"),
+    ]
+
+
+def codes(results):
+    return [s.code for s in results]
+
+
+def test_tokens_cover_label_host_and_path_only():
+    assert tokens(sample()[0]) == {"summer", "sale", "shop", "example", "com"}
+
+
+def test_token_and_prefix_queries():
+    index = SearchIndex(sample())
+
+    assert codes(index.search("summer")) == ["abc", "ghi"]
+    assert codes(index.search("sum blo")) == ["ghi"]
+    assert codes(index.search("EXAMPLE")) == ["abc", "def"]
+    assert codes(index.search("pyth")) == ["def"]
+    assert codes(index.search("nothing")) == []
+    assert codes(index.search("utm")) == []
+    assert codes(index.search("   ")) == []
+
+
+def test_exact_code_comes_first():
+    index = SearchIndex(sample())
+    index.apply([make("blog", "other", "http://x.it/blog")], [])
+
+    assert codes(index.search("blog")) == ["blog", "def", "ghi"]
+    assert codes(index.search("blog", limit=2)) == ["blog", "def"]
+
+
+def test_incremental_updates_after_build():
+    index = SearchIndex(sample())
+    index.build()
+
+    index.apply([replace(sample()[1], label="Winter notes")], ["ghi"])
+    index.apply([make("jkl", "summer camp", "https://camp.it")], [])
+
+    assert codes(index.search("summer")) == ["abc", "jkl"]
+    assert codes(index.search("winter")) == ["def"]
+    assert codes(index.search("blog")) == ["def"]
+    assert len(index) == 3
+
+
+def test_broad_queries_with_limit_scan_in_order():
+    urls = [make(f"c{n}", f"link {n}", "https://example.com/x") for n in range(200)]
+    index = SearchIndex(urls)
+
+    assert codes(index.search("example", limit=3)) == ["c0", "c1", "c2"]
+    assert codes(index.search("link 1", limit=3)) == ["c1", "c10", "c11"]
+    assert len(index.search("link 1")) == 111
+
+
+def test_follows_the_cache():
+    cache = ShortUrlCache()
+    index = SearchIndex()
+    cache.subscribe(index.apply)
+
+    cache.put(sample())
+    assert codes(index.search("summer")) == ["abc", "ghi"]
+
+    cache.update("abc", label="Autumn", target="https://shop.it/autumn")
+    cache.remove("ghi")
+    cache.add(make("new", "summer again", "https://n.it"))
+    assert codes(index.search("summer")) == ["new"]
+
+    cache.merge([make("m", "summer merge", "https://m.it")], ["new"])
+    assert codes(index.search("summer")) == ["m"]
+
+    cache.invalidate()
+    assert len(index) == 0
@@ -0,0 +1,98 @@
+import stat
+from unittest.mock import patch
+
+import pytest
+import requests
+from cryptography.fernet import Fernet
+
+from tui.sessions import SessionStore, default_dir, has_saved_session
+
+
+@pytest.fixture(autouse=True)
+def session_key(monkeypatch):
+    monkeypatch.setenv("SHORTCAT_SESSION_KEY", Fernet.generate_key().decode())
+
+
+def jar(**cookies):
+    jar = requests.cookies.RequestsCookieJar()
+    for name, value in cookies.items():
+        jar.set(name, value, domain="localhost.local", path="/")
+    return jar
+
+
+def test_default_dir_honours_env(tmp_path):
+    assert default_dir({}).name == "sessions"
+    assert default_dir({"SHORTCAT_SESSIONS": str(tmp_path)}) == tmp_path
+    assert default_dir({"SHORTCAT_SESSIONS": "off"}) is None
+
+
+def test_has_saved_session(tmp_path):
+    env = {"SHORTCAT_SESSIONS": str(tmp_path)}
+    assert has_saved_session(env) is False
+
+    SessionStore(tmp_path, "http://x/api").save("alice", jar(sessionid="s"))
+
+    assert has_saved_session(env) is True
+    assert has_saved_session({"SHORTCAT_SESSIONS": "off"}) is False
+
+
+def test_round_trip_keeps_only_session_cookies(tmp_path):
+    store = SessionStore(tmp_path, "http://x/api")
+    store.save("alice", jar(sessionid="s", csrftoken="t", tracking="x"))
+
+    saved = SessionStore(tmp_path, "http://x/api").load()
+
+    assert saved["account"] == "alice"
+    assert {c["name"]: c["value"] for c in saved["cookies"]} == {
+        "sessionid": "s",
+        "csrftoken": "t",
+    }
+
+
+def test_files_are_encrypted_and_private(tmp_path):
+    store = SessionStore(tmp_path, "http://x/api")
+    store.save("alice", jar(sessionid="secret-session"))
+
+    assert b"secret-session" not in store.path.read_bytes()
+    assert stat.S_IMODE(store.path.stat().st_mode) == 0o600
+    assert [p.name for p in tmp_path.iterdir()] == [store.path.name]
+
+
+@patch("tui.sessions._keyring_key", return_value=b"from-keyring")
+def test_key_comes_from_the_keyring_without_env(mock_keyring, tmp_path, monkeypatch):
+    monkeypatch.delenv("SHORTCAT_SESSION_KEY")
+
+    assert SessionStore(tmp_path, "http://x/api")._key == b"from-keyring"
+
+
+@patch("tui.sessions._keyring_key", return_value=None)
+def test_nothing_is_saved_without_a_key(mock_keyring, tmp_path, monkeypatch):
+    monkeypatch.delenv("SHORTCAT_SESSION_KEY")
+
+    with pytest.raises(ValueError):
+        SessionStore(tmp_path / "sessions", "http://x/api")
+    assert not (tmp_path / "sessions").exists()
+
+
+def test_backends_do_not_share_sessions(tmp_path):
+    SessionStore(tmp_path, "http://x/api").save("alice", jar(sessionid="s"))
+
+    assert SessionStore(tmp_path, "http://y/api").load() is None
+
+
+def test_unreadable_session_is_dropped(tmp_path):
+    SessionStore(tmp_path, "http://x/api").save("alice", jar(sessionid="s"))
+    other = SessionStore(tmp_path, "http://x/api", key=Fernet.generate_key())
+
+    assert other.load() is None
+    assert not other.path.exists()
+
+
+def test_clear_is_idempotent(tmp_path):
+    store = SessionStore(tmp_path, "http://x/api")
+    store.save("alice", jar(sessionid="s"))
+
+    store.clear()
+    store.clear()
+
+    assert store.load() is None
@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+from tui.startup import format_report, parse_importtime, profile_imports, run_importtime
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       348 |        348 |   _io
+import time:      1200 |       5000 |     tui.menu
+import time:       900 |       9000 | tui.app
+not an import line
+"""
+
+
+def test_parse_importtime():
+    assert parse_importtime(SAMPLE) == {
+        "_io": (348, 348),
+        "tui.menu": (1200, 5000),
+        "tui.app": (900, 9000),
+    }
+
+
+def test_profile_keeps_the_fastest_run():
+    runs = [
+        {"tui.app": (900, 9000), "requests": (50, 400)},
+        {"tui.app": (800, 7000), "requests": (70, 600)},
+    ]
+    with patch("tui.startup.run_importtime", side_effect=runs):
+        profile = profile_imports(runs=2)
+
+    assert profile["total_ms"] == 7.0
+    assert profile["network"] == ["requests"]
+    assert profile["modules"]["requests"] == {"self_ms": 0.05, "cumulative_ms": 0.4}
+
+
+def test_format_report_lists_heaviest_modules():
+    with patch("tui.startup.run_importtime", return_value=parse_importtime(SAMPLE)):
+        report = format_report(profile_imports(runs=1), top=2)
+
+    assert "import tui.app: 9.0 ms (best of 1)" in report
+    assert "networking loaded at startup: no" in report
+    lines = report.splitlines()
+    assert lines[-2].startswith("tui.menu") and lines[-1].startswith("tui.app")
+
+
+def test_app_imports_without_networking():
+    modules = run_importtime("tui.app")
+
+    assert "tui.app" in modules and "tui.menu" in modules
+    assert not {"requests", "urllib3", "sqlite3", "tui.client"} & set(modules)
+    assert not {"tui.bulk", "tui.async_client"} & set(modules)
+    # typeguard pulls asyncio in through unittest.mock; nothing else may
+    assert "asyncio" not in set(modules) - set(run_importtime("typeguard"))
@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import pytest
+
+from tui.domain import ShortUrl
+from tui.table import NO_TIME, ShortUrlTable, from_epoch, to_epoch
+
+
+def rows():
+    return [
+        {
+            "code": "c1",
+            "target": "http://a.it",
+            "label": "promo",
+            "private": True,
+            "expired_at": "2000-01-01T00:00:00Z",
+            "updated_at": "2030-01-01T10:00:00.250000Z",
+        },
+        {"code": "c2", "target": "http://b.it/è", "label": "blog", "private": False},
+        {"code": "c3", "target": "http://c.it", "label": "promo-2", "private": False},
+    ]
+
+
+def test_epoch_round_trip():
+    dt = datetime(2030, 1, 1, 10, 0, 0, 250000)
+    assert from_epoch(to_epoch(dt)) == dt
+    assert to_epoch(None) == NO_TIME
+    assert from_epoch(NO_TIME) is None
+
+
+def test_reads_like_a_list_of_short_urls():
+    table = ShortUrlTable.from_api_batch(rows())
+
+    assert len(table) == 3
+    assert [s.code for s in table] == ["c1", "c2", "c3"]
+    assert table[-1].code == "c3"
+    assert table[1].target == "http://b.it/è"
+    assert table[0].private is True and table[1].private is False
+    assert table[0].expired_at == datetime(2000, 1, 1)
+    assert table[0].is_expired is True
+    assert table[1].expired_at is None and table[1].is_expired is False
+    assert table[0] == ShortUrl.from_api_batch(rows())[0]
+    assert table.to_short_urls() == ShortUrl.from_api_batch(rows())
+    assert str(table[0]) == "c1 -> http://a.it"
+    with pytest.raises(IndexError):
+        table[3]
+
+
+def test_build_from_short_urls_and_slice():
+    table = ShortUrlTable(ShortUrl.from_api_batch(rows()))
+
+    part = table[1:]
+
+    assert isinstance(part, ShortUrlTable)
+    assert [s.code for s in part] == ["c2", "c3"]
+
+
+def test_private_bitmap_spans_bytes():
+    items = [
+        {"code": f"c{n}", "target": "http://a.it", "private": n % 3 == 0}
+        for n in range(20)
+    ]
+    table = ShortUrlTable.from_api_batch(items)
+
+    assert [s.private for s in table] == [n % 3 == 0 for n in range(20)]
+    assert [s.private for s in table.take([3, 4, 9])] == [True, False, True]
+
+
+def test_filtering_and_sorting():
+    table = ShortUrlTable.from_api_batch(rows())
+
+    assert [s.code for s in table.expired(datetime(2020, 1, 1))] == ["c1"]
+    assert [s.code for s in table.with_label("promo*")] == ["c1", "c3"]
+    assert [s.code for s in table.filter(lambda s: not s.private)] == ["c2", "c3"]
+    assert [s.code for s in table.sorted_by("label")] == ["c2", "c1", "c3"]
+    assert [s.code for s in table.sorted_by("code", reverse=True)] == ["c3", "c2", "c1"]
+    with pytest.raises(ValueError):
+        table.sorted_by("user")
+
+
+def test_rejects_malformed_rows():
+    with pytest.raises(ValueError):
+        ShortUrlTable.from_api_batch([{"code": "c1"}])
+
+
+def test_is_smaller_than_the_objects():
+    items = [
+        {"code": f"c{n}", "target": f"http://example.com/{n}", "label": "x"}
+        for n in range(1000)
+    ]
+    table = ShortUrlTable.from_api_batch(items)
+    assert table.nbytes() < 100 * len(items)
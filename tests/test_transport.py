@@ -0,0 +1,412 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from tui.client import Backend
+from tui.domain import Password, ShortUrl, Username, short
+from tui.metrics import operation
+from tui.resilience import CircuitOpenError
+from tui.transport import (
+    BASE_URL,
+    DnsCache,
+    KeepAliveAdapter,
+    TransportConfig,
+    TransportSession,
+    install_dns_cache,
+    load_config,
+)
+
+
+def test_default_config():
+    config = load_config({})
+    assert config.base_url == BASE_URL
+    assert config.timeout == (3.05, 30.0)
+    assert config.site_url == "http://localhost:8000"
+
+
+def test_env_overrides_are_typed():
+    config = load_config(
+        {
+            "SHORTCAT_BASE_URL": "https://short.example/api/v1",
+            "SHORTCAT_POOL_MAXSIZE": "32",
+            "SHORTCAT_READ_TIMEOUT": "5.5",
+            "SHORTCAT_KEEP_ALIVE": "no",
+        }
+    )
+    assert config.base_url == "https://short.example/api/v1"
+    assert config.pool_maxsize == 32
+    assert config.read_timeout == 5.5
+    assert config.keep_alive is False
+    assert config.site_url == "https://short.example"
+
+
+def test_invalid_boolean_override():
+    with pytest.raises(ValueError, match="Invalid boolean"):
+        load_config({"SHORTCAT_POOL_BLOCK": "maybe"})
+
+
+def test_invalid_values_are_rejected():
+    with pytest.raises(ValueError):
+        TransportConfig(retries=0)
+    with pytest.raises(ValueError):
+        TransportConfig(breaker_threshold=0)
+    with pytest.raises(ValueError):
+        TransportConfig(pool_maxsize=0)
+    with pytest.raises(ValueError):
+        TransportConfig(read_timeout=0)
+    with pytest.raises(ValueError):
+        TransportConfig(dns_cache_ttl=-1)
+
+
+def test_profiles_from_config_file(tmp_path):
+    path = tmp_path / "profiles.json"
+    staging = {"base_url": "https://staging/api/v1", "pool_maxsize": 4}
+    path.write_text(json.dumps({"profiles": {"staging": staging}}))
+
+    config = load_config({"SHORTCAT_CONFIG": str(path), "SHORTCAT_PROFILE": "staging"})
+
+    assert config.base_url == "https://staging/api/v1"
+    assert config.pool_maxsize == 4
+
+
+def test_invalid_profile_in_file(tmp_path):
+    path = tmp_path / "profiles.json"
+    path.write_text(json.dumps({"profiles": {"bad": {"colour": "red"}}}))
+
+    with pytest.raises(ValueError, match="Invalid backend profile 'bad'"):
+        load_config({"SHORTCAT_CONFIG": str(path)})
+
+
+def test_unknown_profile():
+    with pytest.raises(ValueError, match="Unknown backend profile"):
+        load_config({"SHORTCAT_PROFILE": "nope"})
+
+
+def test_session_mounts_sized_adapter():
+    session = TransportSession(TransportConfig(pool_connections=2, pool_maxsize=20))
+    adapter = session.get_adapter("http://localhost:8000/")
+
+    assert isinstance(adapter, KeepAliveAdapter)
+    assert adapter._pool_maxsize == 20
+    assert adapter._pool_connections == 2
+    assert session.headers.get("Connection") != "close"
+
+
+def test_session_without_keep_alive():
+    session = TransportSession(TransportConfig(keep_alive=False))
+
+    assert not isinstance(session.get_adapter("https://x/"), KeepAliveAdapter)
+    assert session.headers["Connection"] == "close"
+
+
+def test_session_applies_default_timeout():
+    session = TransportSession(TransportConfig(connect_timeout=1, read_timeout=2))
+    with patch("requests.Session.request") as mock_request:
+        mock_request.return_value = response(200)
+        session.get("http://localhost:8000/")
+        session.get("http://localhost:8000/", timeout=9)
+
+    assert mock_request.call_args_list[0].kwargs["timeout"] == (1, 2)
+    assert mock_request.call_args_list[1].kwargs["timeout"] == 9
+
+
+def test_dns_cache_hits_until_ttl():
+    clock = Mock(return_value=0.0)
+    resolver = Mock(return_value=["addr"])
+    cache = DnsCache(10, resolver=resolver, clock=clock)
+
+    assert cache.getaddrinfo("host", 80) == ["addr"]
+    clock.return_value = 5.0
+    cache.getaddrinfo("host", 80)
+    assert resolver.call_count == 1
+
+    clock.return_value = 10.0
+    cache.getaddrinfo("host", 80)
+    assert resolver.call_count == 2
+
+    cache.clear()
+    cache.getaddrinfo("host", 80)
+    assert resolver.call_count == 3
+
+
+def test_install_dns_cache_patches_resolver(monkeypatch):
+    import tui.transport as transport
+
+    monkeypatch.setattr(transport, "_dns_cache", None)
+    monkeypatch.setattr(socket, "getaddrinfo", socket.getaddrinfo)
+
+    cache = install_dns_cache(30)
+    again = install_dns_cache(60)
+
+    assert cache is again
+    assert cache.ttl == 60
+    assert socket.getaddrinfo == cache.getaddrinfo
+
+
+def test_backend_uses_config():
+    config = TransportConfig(base_url="https://short.example/api/v1/")
+    b = Backend(config=config)
+
+    assert b.base_url == "https://short.example/api/v1"
+    assert isinstance(b.session, TransportSession)
+
+    b.session = Mock()
+    b.session.post.return_value.ok = True
+    b.session.post.return_value.json.return_value = {"code": "zzz"}
+    ok, out = b.createUrl(short(target="http://a.it", label="lab"))
+    assert out == "https://short.example/zzz"
+    assert b.session.post.call_args[0][0] == "https://short.example/api/v1/shorts/"
+
+
+def response(status, headers=None, content=b"", body=None):
+    resp = Mock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    resp.content = content
+    resp.request.body = body
+    return resp
+
+
+@pytest.fixture
+def session():
+    s = TransportSession(TransportConfig(retries=3, backoff=1, breaker_threshold=5))
+    s.sleep = Mock()
+    return s
+
+
+def test_get_is_retried_on_retryable_status(session):
+    with patch("requests.Session.request") as mock_request:
+        mock_request.side_effect = [response(503), response(503), response(200)]
+        result = session.get("http://localhost:8000/")
+
+    assert result.status_code == 200
+    assert mock_request.call_count == 3
+    assert session.sleep.call_count == 2
+
+
+def test_retry_gives_up_after_attempts(session):
+    with patch("requests.Session.request") as mock_request:
+        mock_request.return_value = response(502)
+        result = session.delete("http://localhost:8000/")
+
+    assert result.status_code == 502
+    assert mock_request.call_count == 3
+
+
+def test_retry_after_header_is_honored(session):
+    with patch("requests.Session.request") as mock_request:
+        mock_request.side_effect = [
+            response(429, {"Retry-After": "2"}),
+            response(200),
+        ]
+        session.patch("http://localhost:8000/")
+
+    session.sleep.assert_called_once_with(2.0)
+
+
+def test_retry_after_too_long_returns_response(session):
+    with patch("requests.Session.request") as mock_request:
+        mock_request.return_value = response(429, {"Retry-After": "3600"})
+        result = session.get("http://localhost:8000/")
+
+    assert result.status_code == 429
+    session.sleep.assert_not_called()
+
+
+def test_connection_errors_are_retried_then_raised(session):
+    with patch("requests.Session.request") as mock_request:
+        mock_request.side_effect = requests.ConnectionError("refused")
+        with pytest.raises(requests.ConnectionError):
+            session.get("http://localhost:8000/")
+
+    assert mock_request.call_count == 3
+
+
+def test_post_without_idempotency_key_is_not_retried(session):
+    with patch("requests.Session.request") as mock_request:
+        mock_request.return_value = response(503)
+        session.post("http://localhost:8000/", headers={"X-CSRFToken": "x"})
+
+    assert mock_request.call_count == 1
+
+
+def test_post_with_idempotency_key_is_retried(session):
+    with patch("requests.Session.request") as mock_request:
+        mock_request.side_effect = [response(503), response(201)]
+        result = session.post(
+            "http://localhost:8000/", headers={"Idempotency-Key": "k1"}
+        )
+
+    assert result.status_code == 201
+
+
+def test_open_circuit_fails_fast(session):
+    session.breaker.failure_threshold = 2
+    with patch("requests.Session.request") as mock_request:
+        mock_request.side_effect = requests.ConnectionError("refused")
+        with pytest.raises(requests.ConnectionError):
+            session.get("http://localhost:8000/")
+        calls = mock_request.call_count
+
+        with pytest.raises(CircuitOpenError):
+            session.get("http://localhost:8000/")
+
+    assert calls == 2
+    assert mock_request.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "error", [requests.exceptions.ChunkedEncodingError, requests.TooManyRedirects]
+)
+def test_protocol_error_during_probe_does_not_wedge_breaker(session, error):
+    session.breaker.failure_threshold = 1
+    session.breaker.reset_timeout = 0
+    session.breaker.record_failure()
+    with patch("requests.Session.request") as mock_request:
+        mock_request.side_effect = error("broken")
+        with pytest.raises(error):
+            session.get("http://localhost:8000/")
+
+        mock_request.side_effect = None
+        mock_request.return_value = response(200)
+        result = session.get("http://localhost:8000/")
+
+    assert result.status_code == 200
+    assert session.breaker.state == session.breaker.CLOSED
+
+
+def test_interrupted_probe_lets_the_next_call_probe(session):
+    session.breaker.failure_threshold = 1
+    session.breaker.reset_timeout = 0
+    session.breaker.record_failure()
+    with patch("requests.Session.request") as mock_request:
+        mock_request.side_effect = KeyboardInterrupt
+        with pytest.raises(KeyboardInterrupt):
+            session.get("http://localhost:8000/")
+
+        mock_request.side_effect = None
+        mock_request.return_value = response(200)
+        assert session.get("http://localhost:8000/").status_code == 200
+
+
+def test_client_errors_do_not_trip_breaker(session):
+    session.breaker.failure_threshold = 1
+    with patch("requests.Session.request") as mock_request:
+        mock_request.return_value = response(404)
+        session.get("http://localhost:8000/")
+        session.get("http://localhost:8000/")
+
+    assert mock_request.call_count == 2
+
+
+def test_backend_reports_open_circuit():
+    b = Backend(config=TransportConfig(breaker_threshold=1))
+    b.session.breaker.record_failure()
+
+    s = ShortUrl(code="c1", label="x", target="http://a.it", user="u")
+    ok, msg = b.deleteUrl(s)
+
+    assert ok is False
+    assert "Backend unavailable" in msg
+
+
+def test_create_url_sends_idempotency_key():
+    b = Backend(config=TransportConfig())
+    b.session = Mock()
+    b.session.post.return_value.json.return_value = {"code": "zzz"}
+
+    b.createUrl(short(target="http://a.it", label="lab"))
+    b.createUrl(short(target="http://a.it", label="lab"))
+
+    calls = b.session.post.call_args_list
+    keys = [c.kwargs["headers"]["Idempotency-Key"] for c in calls]
+    assert len(set(keys)) == 2
+
+
+def test_request_metrics_use_current_operation(session):
+    with patch("requests.Session.request") as mock_request:
+        mock_request.side_effect = [
+            response(503),
+            response(200, content=b"[1, 2]", body="a=1"),
+        ]
+        with operation("getShortUrl"):
+            session.get("http://localhost:8000/api/v1/shorts/")
+        mock_request.side_effect = None
+        mock_request.return_value = response(204)
+        session.delete("http://localhost:8000/api/v1/shorts/x/")
+
+    stats = session.metrics.snapshot()
+    assert stats["getShortUrl"]["retries"] == 1
+    assert stats["getShortUrl"]["bytes_in"] == 6
+    assert stats["getShortUrl"]["bytes_out"] == 3
+    assert stats["getShortUrl"]["statuses"] == {"200": 1}
+    assert stats["DELETE /api/v1/shorts/x/"]["count"] == 1
+
+
+def test_failed_requests_are_recorded(session):
+    with patch("requests.Session.request") as mock_request:
+        mock_request.side_effect = requests.ConnectionError("refused")
+        with pytest.raises(requests.ConnectionError):
+            session.get("http://localhost:8000/")
+
+    stats = session.metrics.get("GET /")
+    assert stats["errors"] == 1
+    assert stats["retries"] == 2
+
+
+def test_backend_names_operations():
+    b = Backend(config=TransportConfig())
+    with patch("requests.Session.request") as mock_request:
+        mock_request.return_value = response(200, content=b"[]")
+        mock_request.return_value.json.return_value = []
+        b.getShortUrl(refresh=True)
+        b.login(Username("Persona"), Password("Persona88!"))
+
+    assert set(b.session.metrics.snapshot()) == {"getShortUrl", "login"}
+
+
+def test_connection_stats_count_reuse(tmp_path):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        session = TransportSession(TransportConfig())
+        url = f"http://127.0.0.1:{server.server_port}/"
+        for _ in range(3):
+            session.get(url)
+        stats = session.connection_stats()
+        path = tmp_path / "metrics.json"
+        session.dump_metrics(str(path))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert stats == {"connections_opened": 1, "requests_sent": 3, "reused": 2}
+    report = json.loads(path.read_text())
+    assert report["operations"]["GET /"]["count"] == 3
+    assert report["connections"]["reused"] == 2
+    assert session.report()["connections"] == stats
+
+
+def test_metrics_file_is_dumped_at_exit():
+    with patch("tui.transport.atexit.register") as mock_register:
+        session = TransportSession(TransportConfig(metrics_file="/tmp/m.json"))
+
+    mock_register.assert_called_once_with(session.dump_metrics, "/tmp/m.json")
@@ -1,7 +1,13 @@
 import pytest
 from datetime import datetime, timedelta
 
+from urllib.parse import urlparse
+
 from tui.validators import (
+    compiled,
+    pattern,
+    validate_each,
+    validate_urls,
     is_valid_password,
     is_email,
     validate_url,
@@ -93,3 +99,65 @@ def test_validate_expired_at_past():
 def test_validate_expired_at_future_ok():
     future = datetime.now() + timedelta(days=1)
     assert validate_expired_at(future) == future
+
+
+def test_compiled_patterns_are_shared():
+    assert compiled(r"[a-z]+") is compiled(r"[a-z]+")
+    assert pattern(r"[a-z]+") is pattern(r"[a-z]+")
+    assert pattern(r"[a-z]+")("abc") is True
+    assert pattern(r"[a-z]+")("ab1") is False
+
+
+def urlparse_verdict(url):
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return False
+    return parsed.scheme in ("http", "https") and bool(parsed.netloc)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://example.com",
+        "http://example.com/a?b=c#d",
+        "https://user:pw@host:8080/x",
+        "https://example.com?x",
+        "http://#frag",
+        "http://?q",
+        "HTTP://EXAMPLE.COM",
+        "https:// /x",
+        "https://exa mple.com",
+        "http://\t/x",
+        "http://a.it\n",
+        "https://[::1]/x",
+        "https://[::1",
+        "https://ex\u00e4mple.com",
+        "https://a\uff03b",
+        "https:/example.com",
+        "mailto:a@b.it",
+        "//example.com",
+    ],
+)
+def test_validate_url_agrees_with_urlparse(url):
+    try:
+        accepted = validate_url(url) == url
+    except ValueError:
+        accepted = False
+    assert accepted is urlparse_verdict(url)
+
+
+def test_validate_urls_reports_each_item():
+    assert validate_urls(["https://a.it", "", "ftp://b.it", "http:///x"]) == [
+        (True, "https://a.it"),
+        (False, "URL cannot be empty"),
+        (False, "URL must start with http:// or https://"),
+        (False, "URL must have a valid domain"),
+    ]
+
+
+def test_validate_each_with_any_validator():
+    assert validate_each(validate_label, ["ok", ""]) == [
+        (True, "ok"),
+        (False, "Label cannot be empty"),
+    ]
@@ -1,3 +1,7 @@
+import sys
+from collections.abc import Sequence
+from fnmatch import fnmatch
+from itertools import chain
 from getpass import getpass
 
 from valid8 import ValidationError
@@ -8,13 +12,32 @@ from tui.validators import (
     validate_private,
     validate_url,
 )
-from .client import Backend
-from .domain import Username, Password, Email, ShortUrl, short
+from .checks import trusted
+from .domain import Username, Password, Email, ShortUrl, short, parse_datetime
 from .menu import Menu, Entry, Description, Key
+from .pager import Pager, default_page_size
+from .render import HEADER, RULE, TableRenderer
 from datetime import datetime
 
 
-client = Backend()
+class LazyBackend:
+    # requests and the connection pool are only set up by the first call
+    # that needs the backend, so the menu paints without them
+    def __init__(self):
+        self._backend = None
+
+    def __getattr__(self, name):
+        if self._backend is None:
+            from .client import Backend
+
+            self._backend = Backend()
+        return getattr(self._backend, name)
+
+
+client = LazyBackend()
+renderer = TableRenderer()
+
+SEARCH_PREFIX = "/"
 
 
 def do_login():
@@ -27,8 +50,12 @@ def do_login():
             raw_pass = getpass("Password: ").strip()
             pw = Password(raw_pass)
 
+            client.open_session_store()
             if client.login(user, pw):
                 print("\nLogin successful.")
+                client.open_journal(user.value)
+                client.open_mirror(user.value)
+                client.start_prefetch()
                 submenu()
                 break
             else:
@@ -60,8 +87,12 @@ def do_register():
 
             if client.register(user, pw1, pw2, email):
                 print("\nRegistration successful. You can now log in.")
+                client.open_session_store()
                 if client.login(user, pw1):
                     print("\nLogin successful.")
+                    client.open_journal(user.value)
+                    client.open_mirror(user.value)
+                    client.start_prefetch()
                     submenu()
                     break
             else:
@@ -71,11 +102,37 @@ def do_register():
             print(f"Error: {e}. Try Again.\n")
 
 
+def resume_session():
+    # a session saved by an earlier launch opens the user menu with no prompts
+    from .sessions import has_saved_session
+
+    if not has_saved_session():
+        return False
+    client.open_session_store()
+    account = client.resume_session()
+    if account is None:
+        return False
+    print(f"\nWelcome back, {account}.")
+    client.open_journal(account)
+    client.open_mirror(account)
+    client.start_prefetch()
+    submenu()
+    return True
+
+
 def logout():
     client.logout()
     print("Logged out.\n")
 
 
+def exit_tui():
+    # a saved session lets the next launch resume; without one the server
+    # session is closed as before
+    if not client.has_saved_session():
+        client.logout()
+    print("Goodbye.\n")
+
+
 def convert_url():
     print("\n--- URL CONVERSATION ---")
 
@@ -116,55 +173,205 @@ def convert_url():
         print(f"Conversion Error: {short_url_or_error}\n")
 
 
+def import_urls():
+    print("\n--- BULK IMPORT ---")
+    path = input("File (.csv or .jsonl): ").strip()
+    if not path:
+        print("Import cancelled.")
+        return
+
+    # asyncio and the concurrent pipeline load only when a bulk job runs
+    from .bulk import import_file
+
+    try:
+        result = import_file(client, path)
+    except (OSError, ValueError) as e:
+        print(f"Import Error: {e}\n")
+        return
+
+    print(
+        f"\nImported {result.created}/{result.total} URLs "
+        f"({result.failed} failed) in {result.elapsed:.2f}s "
+        f"- {result.rate:.1f} rows/s\n"
+    )
+
+
+def ask_code():
+    return input("Short code (Enter to choose from the list): ").strip()
+
+
+def fetch_url(code):
+    ok, item = client.get_short(code)
+    if not ok:
+        print("Error fetching URL:", item)
+        return None
+    return item
+
+
 def edit_url():
-    editmenu()
+    editmenu(ask_code())
+
+
+def remove_url():
+    delete_url(ask_code())
+
+
+def select_urls(scelta, urls_dict):
+    scelta = scelta.strip()
+    lowered = scelta.lower()
+
+    if lowered in ["expired", "all expired"]:
+        now = datetime.now()
+        return [
+            s
+            for s in urls_dict.values()
+            if s.expired_at and parse_datetime(s.expired_at) <= now
+        ]
+
+    if lowered.startswith("label:"):
+        glob = scelta[len("label:") :].strip()
+        if not glob:
+            raise ValueError("Enter a label pattern.")
+        return [s for s in urls_dict.values() if fnmatch(s.label, glob)]
+
+    keys = []
+    for part in scelta.split(","):
+        start, sep, end = part.strip().partition("-")
+        if not start.isdigit() or (sep and not end.isdigit()):
+            raise ValueError("Enter valid number.")
+        first, last = int(start), int(end) if sep else int(start)
+        if first > last:
+            first, last = last, first
+        for key in range(first, last + 1):
+            if key not in urls_dict:
+                raise ValueError("Invalid number.")
+            if key not in keys:
+                keys.append(key)
+
+    return [urls_dict[key] for key in keys]
 
 
-def delete_url():
+def fetch_urls():
     ok, lista = client.getShortUrl()
+    # offline changes the server refused when they were replayed
+    for message in client.pop_rejected():
+        print("Offline change refused by the server:", message)
+    return ok, lista
+
+
+def choose_urls():
+    ok, lista = fetch_urls()
     if not ok:
         print("Error fetching URLs:", lista)
-        return
+        return None
 
-    dict_urls = urls_to_dict(lista)
-    show_urls_dict(dict_urls)
+    question = (
+        "Which URL do you want to delete? (number, range like 3-40,52, "
+        "'expired', 'label:<pattern>' or /search) "
+    )
+    if len(lista) > default_page_size():
+        dict_urls = Pager(lista, default_page_size(), renderer)
+        scelta = page_and_ask(dict_urls, question)
+    else:
+        dict_urls = urls_to_dict(lista)
+        show_urls_dict(dict_urls)
+        scelta = input(question).strip()
+    if scelta.startswith(SEARCH_PREFIX):
+        ok, items = client.search(scelta[len(SEARCH_PREFIX) :])
+        if not ok:
+            print("Error fetching URLs:", items)
+            return None
+    else:
+        try:
+            items = select_urls(scelta, dict_urls)
+        except ValueError as e:
+            print(str(e))
+            return None
+    return items
 
-    scelta = input("Which URL do you want to delete? (number) ").strip()
-    if not scelta.isdigit():
-        print("Enter valid number.")
-        return
-    scelta = int(scelta)
 
-    if scelta not in dict_urls:
-        print("Invalid number.")
+def delete_url(code=None):
+    if code:
+        item = fetch_url(code)
+        items = [item] if item else None
+    else:
+        items = choose_urls()
+    if items is None:
         return
 
-    item = dict_urls[scelta]
+    if not items:
+        print("No URLs match the selection.")
+        return
 
-    conferma = (
-        input(f"Are you sure you want to delete the URL? '{item.label}'? (y/n): ")
-        .strip()
-        .lower()
-    )
+    if len(items) == 1:
+        domanda = f"Are you sure you want to delete the URL? '{items[0].label}'? (y/n): "
+    else:
+        domanda = f"Are you sure you want to delete {len(items)} URLs? (y/n): "
+    conferma = input(domanda).strip().lower()
     if conferma not in ["y", "yes"]:
         print("Deletion cancelled.")
         return
 
-    ok, text = client.deleteUrl(item)
-    if ok:
-        print(text)
-    else:
-        print("Error:", text)
+    if len(items) == 1:
+        ok, text = client.deleteUrl(items[0])
+        if ok:
+            print(text)
+        else:
+            print("Error:", text)
+        return
+
+    from .bulk import delete_all
+
+    deleted = 0
+    for item, (ok, text) in delete_all(client, items):
+        if ok:
+            deleted += 1
+        else:
+            print(f"Error deleting '{item.code}':", text)
+    print(f"Deleted {deleted}/{len(items)} URLs.")
 
 
 def url_history():
-    ok, lista = client.getShortUrl()
+    if not client.cache.has_data:
+        # nothing cached yet: pages are downloaded as they are browsed
+        try:
+            browse(client.iter_short_urls())
+        except Exception as e:
+            print("Error fetching URLs:", e)
+        return
+
+    ok, lista = fetch_urls()
+    if ok and len(lista) > default_page_size():
+        browse(lista)
+        return
     dict = urls_to_dict(lista)
     show_urls_dict(dict)
 
 
-def modify_expire():
-    short_url = same_method()
+def page_and_ask(pager, question):
+    while True:
+        sys.stdout.write(pager.render())
+        answer = input(question).strip()
+        try:
+            if not pager.handle(answer):
+                return answer
+        except ValueError as e:
+            print(str(e))
+
+
+def browse(rows):
+    pager = Pager(rows, default_page_size(), renderer)
+    if not pager.window():
+        print("No URLs found.\n")
+        return
+    if pager.single_page:
+        sys.stdout.write(pager.render())
+        return
+    page_and_ask(pager, "n: next, p: previous, g <page>, Enter to go back: ")
+
+
+def modify_expire(edit=None):
+    short_url = edit.short_url if edit else same_method()
     if not short_url:
         return
 
@@ -181,6 +388,11 @@ def modify_expire():
         print("Invalid date format. Use YYYY-MM-DD HH:MM")
         return
 
+    if edit:
+        edit.set_expire(expiry_datetime)
+        print("Expiration date staged.")
+        return
+
     ok, msg = client.edit_expire(short_url, expiry_datetime)
     if ok:
         print("Updated expiration date!")
@@ -188,8 +400,8 @@ def modify_expire():
         print(f"Error: {msg}")
 
 
-def modify_target():
-    short_url = same_method()
+def modify_target(edit=None):
+    short_url = edit.short_url if edit else same_method()
 
     if not short_url:
         return
@@ -200,6 +412,11 @@ def modify_target():
         print("Invalid target. Operation canceled.")
         return
 
+    if edit:
+        edit.set_target(nuovo_target)
+        print(f"Target staged: {nuovo_target}")
+        return
+
     ok = client.edit_target(short_url, nuovo_target)
     if ok:
         print(f"Target successfully updated to: {nuovo_target}")
@@ -207,19 +424,24 @@ def modify_target():
         print("Error updating target")
 
 
-def modify_label():
-    short_url = same_method()
+def modify_label(edit=None):
+    short_url = edit.short_url if edit else same_method()
     if not short_url:
         return None
 
     label = input("Enter the new label: ").strip()
     label = validate_label(label)
 
+    if edit:
+        edit.set_label(label)
+        print(f"Label staged: {label}")
+        return None
+
     client.edit_label(label, short_url)
 
 
-def modify_visibility():
-    short_url = same_method()
+def modify_visibility(edit=None):
+    short_url = edit.short_url if edit else same_method()
     scelta = input("Enter the new visibility: ").strip()
     if scelta in ["yes", "y", "true", "1"]:
         scelta = True
@@ -227,19 +449,33 @@ def modify_visibility():
         scelta = False
 
     scelta = validate_private(scelta)
+    if edit:
+        edit.set_visibility(scelta)
+        print(f"Visibility staged: {'private' if scelta else 'public'}")
+        return
+
     client.edit_visibility(short_url, scelta)
 
 
-def same_method():
-    ok, lista = client.getShortUrl()
+def same_method(code=None):
+    if code:
+        return fetch_url(code)
+
+    ok, lista = fetch_urls()
     if not ok:
         print("Error fetching URLs:", lista)
         return None
 
-    dict = urls_to_dict(lista)
-    show_urls_dict(dict)
+    if len(lista) > default_page_size():
+        dict = Pager(lista, default_page_size(), renderer)
+        scelta = page_and_ask(dict, "Enter the URL number to edit (or /search): ")
+    else:
+        dict = urls_to_dict(lista)
+        show_urls_dict(dict)
+        scelta = input("Enter the URL number to edit (or /search): ").strip()
 
-    scelta = input("Enter the URL number to edit: ").strip()
+    if scelta.startswith(SEARCH_PREFIX):
+        return find_url(scelta[len(SEARCH_PREFIX) :])
     if not scelta.isdigit():
         print("Invalid input. Please enter a number.")
         return None
@@ -254,6 +490,41 @@ def same_method():
     return item
 
 
+def find_url(query):
+    ok, results = client.search(query)
+    if not ok:
+        print("Error fetching URLs:", results)
+        return None
+    if not results:
+        print("No URLs match the search.")
+        return None
+    if len(results) == 1:
+        return results[0]
+
+    matches = urls_to_dict(results)
+    show_urls_dict(matches)
+    scelta = input("Enter the URL number to edit: ").strip()
+    if not scelta.isdigit() or int(scelta) not in matches:
+        print("Invalid choice. Number out of range.")
+        return None
+    return matches[int(scelta)]
+
+
+def search_urls():
+    query = input("Search (label, target or code): ").strip()
+    if not query:
+        print("Search cancelled.")
+        return
+    ok, results = client.search(query)
+    if not ok:
+        print("Error fetching URLs:", results)
+        return
+    if len(results) > default_page_size():
+        browse(results)
+    else:
+        show_urls_dict(urls_to_dict(results))
+
+
 def urls_to_dict(lista):
     urls_dict = {}
     i = 0
@@ -266,32 +537,33 @@ def urls_to_dict(lista):
 
 
 def show_urls_dict(urls_dict):
-    if not urls_dict:
-        print("No URLs found.\n")
-        return
-
-    header = f"{'N°':<4} | {'CODE':<10} | {'TARGET':<50} | {'LABEL':<20} | {'PRIVATE':<7} | {'EXPIRE':<20}"
-    print("*" * len(header))
-    print(header)
-    print("*" * len(header))
-
-    for key, s in urls_dict.items():
-        target = (
-            (s.target[:47] + "...") if len(s.target) > 50 else s.target
-        )  # tronca se troppo lungo
-        label = (s.label[:17] + "...") if len(s.label) > 20 else s.label
-
-        if s.expired_at:
-            dt = datetime.fromisoformat(s.expired_at.replace("Z", ""))
-            expire = dt.strftime("%d/%m/%Y %H:%M")
-        else:
-            expire = "N/A"
-        print(
-            f"{key:<4} | {s.code:<10} | {target:<50} | {label:<20} | {str(s.private):<7} | {expire:<20}"
-        )
+    if isinstance(urls_dict, dict):
+        rows = iter(urls_dict.items())
+    else:
+        rows = enumerate(urls_dict, start=1)
 
-    print("*" * len(header))
+    first = next(rows, None)
+    if first is None:
+        print("No URLs found.\n")
+        return {}
+
+    if isinstance(urls_dict, (dict, Sequence)):
+        shown = dict(chain([first], rows))
+        renderer.write(shown.items())
+        return shown
+
+    # streamed rows are printed as they arrive
+    print(RULE)
+    print(HEADER)
+    print(RULE)
+    shown = {}
+    for key, s in chain([first], rows):
+        shown[key] = s
+        print(renderer.line(key, s))
+
+    print(RULE)
     print()
+    return shown
 
 
 def edit_username():
@@ -322,48 +594,111 @@ def edit_password():
     input("")
 
 
-def editmenu():
+def save_edit(edit):
+    if not edit.has_changes:
+        print("No changes to save.")
+        return
+
+    ok, msg = edit.commit()
+    if ok:
+        print("URL updated!")
+    else:
+        print(f"Error: {msg}")
+
+
+def discard_edit(edit):
+    if edit.has_changes:
+        edit.discard()
+        print("Changes discarded.")
+
+
+def editmenu(code=None):
     print("\n============= EDIT MENU ==============")
-    menu = (
-        Menu.Builder(Description("EDIT URL"))
-        .with_entry(Entry.create("1", "TARGET", modify_target))
-        .with_entry(Entry.create("2", "LABEL", modify_label))
-        .with_entry(Entry.create("3", "PRIVATE", modify_visibility))
-        .with_entry(Entry.create("4", "EXPIRE AT", modify_expire))
-        .with_entry(Entry.create("0", "BACK", lambda: True, is_exit=True))
-        .build()
-    )
+    short_url = same_method(code)
+    if not short_url:
+        return
+
+    # changes are staged and sent as a single PATCH when saving
+    edit = client.edit_session(short_url)
+    with trusted():
+        menu = (
+            Menu.Builder(Description("EDIT URL"))
+            .with_entry(Entry.create("1", "TARGET", lambda: modify_target(edit)))
+            .with_entry(Entry.create("2", "LABEL", lambda: modify_label(edit)))
+            .with_entry(Entry.create("3", "PRIVATE", lambda: modify_visibility(edit)))
+            .with_entry(Entry.create("4", "EXPIRE AT", lambda: modify_expire(edit)))
+            .with_entry(
+                Entry.create("5", "SAVE", lambda: save_edit(edit), is_exit=True)
+            )
+            .with_entry(
+                Entry.create("0", "BACK", lambda: discard_edit(edit), is_exit=True)
+            )
+            .build()
+        )
     menu.run()
 
 
 def submenu():
     print("\n============= USER MENU  ==============")
-    menu = (
-        Menu.Builder(Description("USER OPTIONS"))
-        .with_entry(Entry.create("1", "CONVERT URL", convert_url))
-        .with_entry(Entry.create("2", "EDIT SHORT", edit_url))
-        .with_entry(Entry.create("3", "DELETE URL", delete_url))
-        .with_entry(Entry.create("4", "CHRONOLOGY URL", url_history))
-        .with_entry(Entry.create("6", "EDIT USERNAME", edit_username))
-        .with_entry(Entry.create("7", "EDIT PASSWORD", edit_password))
-        .with_entry(Entry.create("0", "BACK", lambda: True, is_exit=True))
-        .build()
-    )
+    with trusted():
+        menu = (
+            Menu.Builder(Description("USER OPTIONS"))
+            .with_entry(Entry.create("1", "CONVERT URL", convert_url))
+            .with_entry(Entry.create("2", "EDIT SHORT", edit_url))
+            .with_entry(Entry.create("3", "DELETE URL", remove_url))
+            .with_entry(Entry.create("4", "CHRONOLOGY URL", url_history))
+            .with_entry(Entry.create("5", "IMPORT URLS", import_urls))
+            .with_entry(Entry.create("6", "EDIT USERNAME", edit_username))
+            .with_entry(Entry.create("7", "EDIT PASSWORD", edit_password))
+            .with_entry(Entry.create("8", "SEARCH URLS", search_urls))
+            .with_entry(Entry.create("9", "LOGOUT", logout, is_exit=True))
+            .with_entry(Entry.create("0", "BACK", lambda: True, is_exit=True))
+            .build()
+        )
     menu.run()
 
 def build_main_menu():
-    menu = (
-        Menu.Builder(Description("MENU"))
-        .with_entry(Entry.create("1", "Login", do_login))
-        .with_entry(Entry.create("2", "Registration", do_register))
-        .with_entry(Entry.create("0", "Exit", logout, is_exit=True))
-        .build()
-    )
+    with trusted():
+        menu = (
+            Menu.Builder(Description("MENU"))
+            .with_entry(Entry.create("1", "Login", do_login))
+            .with_entry(Entry.create("2", "Registration", do_register))
+            .with_entry(Entry.create("0", "Exit", exit_tui, is_exit=True))
+            .build()
+        )
     menu.run()
 
-def main(name: str):
-    if name == "__main__":
-        build_main_menu()
+def import_profile(argv):
+    import argparse
+    import json
+
+    from .startup import DEFAULT_RUNS, DEFAULT_TOP, format_report, profile_imports
+
+    parser = argparse.ArgumentParser(
+        description="Report where the TUI spends its import time (-X importtime)"
+    )
+    parser.add_argument("--import-profile", action="store_true")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP)
+    parser.add_argument("--output", help="also write the profile as JSON")
+    args = parser.parse_args(argv)
+
+    profile = profile_imports(runs=args.runs)
+    print(format_report(profile, args.top))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+
+
+def main(name: str, argv=None):
+    if name != "__main__":
+        return
+    argv = argv or []
+    if "--import-profile" in argv:
+        import_profile(argv)
+        return
+    resume_session()
+    build_main_menu()
 
-main(__name__)
+main(__name__, sys.argv[1:])
 
@@ -0,0 +1,197 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Optional,
+    Tuple,
+)
+
+from tui.domain import Username, Password, Email, ShortUrl, short
+
+if TYPE_CHECKING:
+    from tui.client import Backend
+
+DEFAULT_CONCURRENCY = 10
+# links handed over per executor hop by iter_short_urls
+ITER_CHUNK = 100
+
+
+class AsyncBackend:
+    def __init__(
+        self,
+        backend: Optional["Backend"] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        # the wrapped Backend owns the session, so cookies and the CSRF token
+        # are shared with any synchronous caller using the same instance
+        if backend is None:
+            from tui.client import Backend
+
+            backend = Backend()
+        self.backend = backend
+        self.concurrency = concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="shortcat"
+        )
+
+    @property
+    def session(self):
+        return self.backend.session
+
+    async def __aenter__(self) -> "AsyncBackend":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, fn: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(fn, *args))
+
+    async def login(self, username: Username, password: Password):
+        return await self._run(self.backend.login, username, password)
+
+    async def logout(self):
+        return await self._run(self.backend.logout)
+
+    async def register(
+        self, username: Username, password1: Password, password2: Password, email: Email
+    ):
+        return await self._run(
+            self.backend.register, username, password1, password2, email
+        )
+
+    async def edit_password(self, old_pw, new_pw1, new_pw2):
+        return await self._run(self.backend.edit_password, old_pw, new_pw1, new_pw2)
+
+    async def edit_target(self, s: ShortUrl, new_target: str):
+        return await self._run(self.backend.edit_target, s, new_target)
+
+    async def edit_expire(self, s: ShortUrl, new_expire: datetime):
+        return await self._run(self.backend.edit_expire, s, new_expire)
+
+    async def edit_label(self, new_label: str, s: short):
+        return await self._run(self.backend.edit_label, new_label, s)
+
+    async def edit_visibility(self, s: ShortUrl, scelta: bool):
+        return await self._run(self.backend.edit_visibility, s, scelta)
+
+    async def edit_username(self, new_username: Username):
+        return await self._run(self.backend.edit_username, new_username)
+
+    async def createUrl(self, url: short):
+        return await self._run(self.backend.createUrl, url)
+
+    async def deleteUrl(self, url: ShortUrl):
+        return await self._run(self.backend.deleteUrl, url)
+
+    async def resume_session(self) -> Optional[str]:
+        return await self._run(self.backend.resume_session)
+
+    async def edit_fields(self, s: ShortUrl, changes: dict):
+        return await self._run(self.backend.edit_fields, s, changes)
+
+    async def get_short(self, code: str):
+        return await self._run(self.backend.get_short, code)
+
+    async def getShortUrl(self, refresh: bool = False):
+        return await self._run(self.backend.getShortUrl, refresh)
+
+    async def sync(self):
+        return await self._run(self.backend.sync)
+
+    async def search(self, query: str, limit: Optional[int] = None):
+        return await self._run(self.backend.search, query, limit)
+
+    async def replay_journal(self, workers: Optional[int] = None):
+        if workers is None:
+            return await self._run(self.backend.replay_journal)
+        return await self._run(self.backend.replay_journal, workers)
+
+    async def iter_short_urls(
+        self, page_size: Optional[int] = None, prefetch: bool = True
+    ) -> AsyncIterator[ShortUrl]:
+        # the blocking generator is advanced on the pool a chunk at a time,
+        # never from two threads at once
+        if page_size is None:
+            links = self.backend.iter_short_urls(prefetch=prefetch)
+        else:
+            links = self.backend.iter_short_urls(page_size, prefetch)
+        try:
+            while True:
+                chunk = await self._run(list, islice(links, ITER_CHUNK))
+                if not chunk:
+                    return
+                for s in chunk:
+                    yield s
+        finally:
+            links.close()
+
+    async def map(
+        self, fn: Callable[[Any], Awaitable[Any]], items: Iterable[Any]
+    ) -> list:
+        return [result async for _, result in self.imap(fn, items, ordered=True)]
+
+    async def imap(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        ordered: bool = False,
+    ) -> AsyncIterator[Tuple[Any, Any]]:
+        # keeps at most two batches of work in flight so arbitrarily long
+        # iterables are consumed lazily instead of being scheduled up front
+        window = self.concurrency * 2
+        pending = {}
+        finished = {}
+        next_index = 0
+
+        async def call(index, item):
+            return index, item, await fn(item)
+
+        def drain(done):
+            for task in done:
+                index, item, result = task.result()
+                finished[index] = (item, result)
+
+        def ready():
+            nonlocal next_index
+            if not ordered:
+                out = list(finished.values())
+                finished.clear()
+                return out
+            out = []
+            while next_index in finished:
+                out.append(finished.pop(next_index))
+                next_index += 1
+            return out
+
+        async def step():
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del pending[task]
+            drain(done)
+            return ready()
+
+        for index, item in enumerate(items):
+            task = asyncio.ensure_future(call(index, item))
+            pending[task] = index
+            while len(pending) + len(finished) >= window:
+                for pair in await step():
+                    yield pair
+
+        while pending:
+            for pair in await step():
+                yield pair
@@ -0,0 +1,182 @@
+import asyncio
+import csv
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from tui.async_client import AsyncBackend, DEFAULT_CONCURRENCY
+from tui.domain import ShortUrl, parse_datetime, short
+from tui.validators import (
+    validate_label,
+    validate_expired_at,
+    validate_private,
+    validate_url,
+    validate_urls,
+)
+
+TRUE_VALUES = ("yes", "y", "true", "1")
+BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class ImportRow:
+    line: int
+    url: Optional[short] = None
+    error: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ImportResult:
+    total: int
+    created: int
+    failed: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def parse_expiry(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    value = str(value).strip()
+    if not value:
+        return None
+    # fromisoformat reads "YYYY-MM-DD HH:MM" far faster than strptime, which
+    # is only needed for unpadded dates
+    try:
+        return parse_datetime(value)
+    except ValueError:
+        pass
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M")
+    except ValueError:
+        raise ValueError("Invalid date format. Use YYYY-MM-DD HH:MM")
+
+
+def parse_private(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None:
+        return False
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def _target(record) -> str:
+    return str(record.get("target") or "").strip()
+
+
+def parse_row(row: dict, target: Optional[str] = None) -> short:
+    # target may come already checked by validate_urls
+    if target is None:
+        target = validate_url(_target(row))
+    label = validate_label(str(row.get("label") or "").strip())
+    expired_at = validate_expired_at(parse_expiry(row.get("expired_at")))
+    private = validate_private(parse_private(row.get("private")))
+    return short(target, label, expired_at, private)
+
+
+def _records(path: Path) -> Iterator[tuple]:
+    suffix = path.suffix.lower()
+    with path.open(newline="", encoding="utf-8") as f:
+        if suffix in (".jsonl", ".ndjson"):
+            for line, text in enumerate(f, start=1):
+                if not text.strip():
+                    continue
+                try:
+                    record = json.loads(text)
+                except ValueError as e:
+                    yield line, f"Invalid JSON: {e}"
+                    continue
+                if not isinstance(record, dict):
+                    yield line, "Invalid JSON: expected an object"
+                    continue
+                yield line, record
+        elif suffix == ".csv":
+            reader = csv.DictReader(f)
+            for record in reader:
+                yield reader.line_num, record
+        else:
+            raise ValueError("Unsupported file format. Use .csv or .jsonl")
+
+
+def read_rows(path, batch_size: int = BATCH_SIZE) -> Iterator[ImportRow]:
+    records = _records(Path(path))
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        targets = validate_urls(
+            _target(record) if isinstance(record, dict) else "" for _, record in batch
+        )
+        for (line, record), (ok, target) in zip(batch, targets):
+            if isinstance(record, str):
+                yield ImportRow(line, error=record)
+            elif not ok:
+                yield ImportRow(line, error=target)
+            else:
+                try:
+                    yield ImportRow(line, url=parse_row(record, target))
+                except ValueError as e:
+                    yield ImportRow(line, error=str(e))
+
+
+def report_row(row: ImportRow, ok: bool, out: str) -> None:
+    if ok:
+        print(f"Row {row.line}: OK {out}")
+    else:
+        print(f"Row {row.line}: ERROR {out}")
+
+
+async def import_rows(
+    client: AsyncBackend,
+    rows,
+    report: Callable[[ImportRow, bool, str], None] = report_row,
+) -> ImportResult:
+    async def create(row: ImportRow):
+        if row.error is not None:
+            return False, row.error
+        return await client.createUrl(row.url)
+
+    total = created = 0
+    start = time.perf_counter()
+    async for row, (ok, out) in client.imap(create, rows):
+        total += 1
+        created += ok
+        report(row, ok, out)
+    elapsed = time.perf_counter() - start
+    return ImportResult(total, created, total - created, elapsed)
+
+
+async def delete_urls(client: AsyncBackend, urls) -> list:
+    return [pair async for pair in client.imap(client.deleteUrl, urls, ordered=True)]
+
+
+def delete_all(
+    backend, urls: Iterable[ShortUrl], workers: int = DEFAULT_CONCURRENCY
+) -> list:
+    async def run():
+        async with AsyncBackend(backend, concurrency=workers) as client:
+            return await delete_urls(client, urls)
+
+    with backend.mirror_batch():
+        return asyncio.run(run())
+
+
+def import_file(
+    backend,
+    path,
+    workers: int = DEFAULT_CONCURRENCY,
+    report: Callable[[ImportRow, bool, str], None] = report_row,
+) -> ImportResult:
+    async def run():
+        async with AsyncBackend(backend, concurrency=workers) as client:
+            return await import_rows(client, read_rows(path), report)
+
+    with backend.mirror_batch():
+        return asyncio.run(run())
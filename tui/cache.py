@@ -0,0 +1,166 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Callable, Iterable, Optional
+
+from tui.domain import ShortUrl
+
+DEFAULT_TTL = 30.0
+RECENT_SIZE = 64
+
+
+class ShortUrlCache:
+    def __init__(
+        self, ttl: float = DEFAULT_TTL, clock: Callable[[], float] = time.monotonic
+    ):
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._urls: Optional[dict] = None
+        self._stored_at = 0.0
+        self._listeners = []
+
+    def subscribe(self, listener: Callable[[list, list, bool], None]) -> None:
+        # listener(upserted, removed_codes, reset) runs under the cache lock
+        self._listeners.append(listener)
+
+    def _notify(self, upserted: list, removed: list, reset: bool = False) -> None:
+        for listener in self._listeners:
+            listener(upserted, removed, reset)
+
+    @property
+    def is_fresh(self) -> bool:
+        return self._urls is not None and self.clock() - self._stored_at < self.ttl
+
+    @property
+    def has_data(self) -> bool:
+        # fresh or stale, without copying the list as peek() does
+        return self._urls is not None
+
+    def get(self) -> Optional[list]:
+        with self._lock:
+            if not self.is_fresh:
+                return None
+            return list(self._urls.values())
+
+    def lookup(self, code: str) -> Optional[ShortUrl]:
+        with self._lock:
+            if not self.is_fresh:
+                return None
+            return self._urls.get(code)
+
+    def peek(self) -> Optional[list]:
+        with self._lock:
+            if self._urls is None:
+                return None
+            return list(self._urls.values())
+
+    def put(self, urls: Iterable[ShortUrl], fresh: bool = True) -> None:
+        with self._lock:
+            self._urls = {s.code: s for s in urls}
+            self._notify(list(self._urls.values()), [], reset=True)
+            # stale entries are served by peek() but never count as fresh
+            self._stored_at = self.clock() if fresh else float("-inf")
+
+    def merge(self, urls: Iterable[ShortUrl], removed: Iterable[str] = ()) -> None:
+        with self._lock:
+            if self._urls is None:
+                return
+            removed = [c for c in removed if self._urls.pop(c, None) is not None]
+            urls = list(urls)
+            for url in urls:
+                self._urls[url.code] = url
+            self._notify(urls, removed)
+            self._stored_at = self.clock()
+
+    def touch(self) -> None:
+        with self._lock:
+            self._stored_at = self.clock()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._urls = None
+            self._notify([], [], reset=True)
+
+    def add(self, url: ShortUrl) -> None:
+        with self._lock:
+            if self._urls is not None:
+                self._urls[url.code] = url
+                self._notify([url], [])
+
+    def remove(self, code: str) -> None:
+        with self._lock:
+            if self._urls is not None and self._urls.pop(code, None) is not None:
+                self._notify([], [code])
+
+    def update(self, code: str, **changes) -> Optional[ShortUrl]:
+        with self._lock:
+            if self._urls is None or code not in self._urls:
+                return None
+            url = replace(self._urls[code], **changes)
+            self._urls[code] = url
+            self._notify([url], [])
+            return url
+
+    def rename(self, code: str, new_code: str) -> Optional[ShortUrl]:
+        with self._lock:
+            if self._urls is None or code not in self._urls:
+                return None
+            url = replace(self._urls.pop(code), code=new_code)
+            self._urls[new_code] = url
+            self._notify([url], [code])
+            return url
+
+
+class RecentLinks:
+    # links fetched one by one, evicted least recently used first
+    def __init__(
+        self,
+        maxsize: int = RECENT_SIZE,
+        ttl: float = DEFAULT_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._links = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    def get(self, code: str) -> Optional[ShortUrl]:
+        with self._lock:
+            entry = self._links.get(code)
+            if entry is None:
+                return None
+            if self.clock() - entry[1] >= self.ttl:
+                del self._links[code]
+                return None
+            self._links.move_to_end(code)
+            return entry[0]
+
+    def put(self, url: ShortUrl) -> None:
+        with self._lock:
+            self._links[url.code] = (url, self.clock())
+            self._links.move_to_end(url.code)
+            while len(self._links) > self.maxsize:
+                self._links.popitem(last=False)
+
+    def update(self, code: str, **changes) -> Optional[ShortUrl]:
+        with self._lock:
+            entry = self._links.get(code)
+            if entry is None:
+                return None
+            url = replace(entry[0], **changes)
+            self._links[code] = (url, entry[1])
+            return url
+
+    def discard(self, code: str) -> None:
+        with self._lock:
+            self._links.pop(code, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._links.clear()
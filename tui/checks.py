@@ -0,0 +1,107 @@
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from inspect import isclass, isfunction
+
+from typeguard import suppress_type_checks
+from typeguard import typechecked as instrument
+
+STRICT = "strict"
+BOUNDARY = "boundary"
+OFF = "off"
+POLICIES = (STRICT, BOUNDARY, OFF)
+POLICY_ENV = "SHORTCAT_VALIDATION"
+
+
+def policy_from_env(env=os.environ) -> str:
+    policy = env.get(POLICY_ENV, "").strip().lower()
+    return policy if policy in POLICIES else BOUNDARY
+
+
+_policy = BOUNDARY
+_local = threading.local()
+# the suppress_type_checks() context held open while checks are off
+_suppressed = None
+
+
+def get_policy() -> str:
+    return _policy
+
+
+def set_policy(policy: str) -> str:
+    global _policy, _suppressed
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown validation policy: {policy}")
+    if policy == OFF and _suppressed is None:
+        _suppressed = suppress_type_checks()
+        _suppressed.__enter__()
+    elif policy != OFF and _suppressed is not None:
+        _suppressed.__exit__(None, None, None)
+        _suppressed = None
+    previous, _policy = _policy, policy
+    return previous
+
+
+@contextmanager
+def validation_policy(policy: str):
+    previous = set_policy(policy)
+    try:
+        yield
+    finally:
+        set_policy(previous)
+
+
+def validating() -> bool:
+    # value objects call this before their valid8 checks
+    if _policy == STRICT:
+        return True
+    if _policy == OFF:
+        return False
+    return not getattr(_local, "trusted", 0)
+
+
+@contextmanager
+def trusted():
+    # objects built inside come from the program or the server, not from the
+    # user: below the strict policy their checks are skipped. typeguard can
+    # only suppress its checks process-wide, so other threads skip them too
+    # for the duration of the block
+    if _policy == STRICT:
+        yield
+        return
+    _local.trusted = getattr(_local, "trusted", 0) + 1
+    try:
+        with suppress_type_checks():
+            yield
+    finally:
+        _local.trusted -= 1
+
+
+set_policy(policy_from_env())
+
+
+def typechecked(target):
+    # with checks off from the start nothing is instrumented at all
+    if _policy == OFF:
+        return target
+    # typeguard recompiles the whole module for every method it instruments;
+    # dataclass-generated methods have no source to recompile, so they are
+    # set aside instead of costing a module parse each
+    if not isclass(target):
+        return instrument(target)
+
+    source = sys.modules[target.__module__].__file__
+    generated = {
+        key: attr
+        for key, attr in vars(target).items()
+        if isfunction(attr) and attr.__code__.co_filename != source
+    }
+    for key in generated:
+        delattr(target, key)
+    try:
+        instrument(target)
+    finally:
+        for key, attr in generated.items():
+            setattr(target, key, attr)
+    return target
@@ -1,38 +1,359 @@
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
+from itertools import repeat
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import replace
+from typing import Optional
+
 import requests
 
-from tui.domain import Username, Password, Email, ShortUrl, short
-from datetime import datetime
+from tui.cache import RecentLinks, ShortUrlCache, DEFAULT_TTL
+from tui.journal import Journal, coalesce, is_local, local_code
+from tui.journal import default_path as journal_path
+from tui.mirror import Mirror, default_path
+from tui.search import SearchIndex
+from tui.sessions import SessionStore
+from tui.sessions import default_dir as sessions_dir
+from tui.resilience import IDEMPOTENCY_HEADER
+from tui.transport import BASE_URL, TransportConfig, TransportSession, load_config
+from tui.metrics import instrumented
+from tui.domain import Username, Password, Email, ShortUrl, short, parse_datetime
+from datetime import datetime, timezone
 
-BASE_URL = "http://localhost:8000/api/v1"
+PAGE_SIZE = 100
+SYNC_PARAM = "updated_since"
+REPLAY_WORKERS = 8
+QUEUED = "(saved offline, sent when the backend is reachable)"
+SUPERSEDED = "refresh superseded by a new session"
+# how a replayed journal operation ended
+DONE, REJECTED, UNREACHABLE = "done", "rejected", "unreachable"
 
 
 class Backend:
-    def __init__(self):
-        self.session = requests.Session()
+    def __init__(
+        self,
+        cache_ttl: float = DEFAULT_TTL,
+        config: Optional[TransportConfig] = None,
+    ):
+        self.config = config if config is not None else load_config()
+        self.base_url = self.config.base_url.rstrip("/")
+        self.session = TransportSession(self.config)
+        self.cache = ShortUrlCache(cache_ttl)
+        self.index = SearchIndex()
+        self.cache.subscribe(self.index.apply)
+        self.recent = RecentLinks(ttl=cache_ttl)
+        self.validators = {}
+        self.mirror: Optional[Mirror] = None
+        self._background: Optional[ThreadPoolExecutor] = None
+        self._refresh: Optional[Future] = None
+        # bumped by close_mirror: refreshes started before belong to the
+        # previous session and must not write into this one
+        self._generation = 0
+        self._state = threading.Lock()
+        self._local = threading.local()
+        self.sync_mark: Optional[str] = None
+        self.journal: Optional[Journal] = None
+        # local codes of offline creates already replayed -> server codes
+        self.renamed = {}
+        self._replaying = threading.Lock()
+        # queued writes the server refused, until the TUI reports them
+        self.rejected = []
+        self.sessions: Optional[SessionStore] = None
+
+    def open_session_store(self, directory=None) -> Optional[SessionStore]:
+        directory = directory if directory is not None else sessions_dir()
+        if directory is None:
+            return None
+        try:
+            self.sessions = SessionStore(directory, self.base_url)
+        except (ImportError, OSError, ValueError):
+            # persistence is optional: without it every launch logs in
+            self.sessions = None
+        return self.sessions
+
+    def _save_session(self, account: str) -> None:
+        if self.sessions is None:
+            return
+        try:
+            self.sessions.save(account, self.session.cookies)
+        except (OSError, ValueError):
+            pass
+
+    def has_saved_session(self) -> bool:
+        return self.sessions is not None and self.sessions.path.exists()
+
+    @instrumented("resume_session")
+    def resume_session(self) -> Optional[str]:
+        # a saved session is kept if one cheap authenticated request accepts it
+        if self.sessions is None:
+            return None
+        try:
+            saved = self.sessions.load()
+        except (OSError, ValueError):
+            return None
+        if saved is None:
+            return None
+        for cookie in saved["cookies"]:
+            self.session.cookies.set(**cookie)
+        try:
+            response = self.session.get(f"{self.base_url}/auth/user/")
+        except (requests.ConnectionError, requests.Timeout):
+            self.session.cookies.clear()
+            return None
+        if not response.ok:
+            self.session.cookies.clear()
+            # only a refusal ends the session; a failing backend keeps it
+            if response.status_code in (401, 403):
+                self.sessions.clear()
+            return None
+        return saved["account"]
+
+    def open_journal(self, account: str, path=None) -> Optional[Journal]:
+        self.close_journal()
+        path = path if path is not None else journal_path()
+        if path is None:
+            return None
+        try:
+            self.journal = Journal(path, account, self.base_url)
+        except OSError:
+            self.journal = None
+        return self.journal
+
+    def close_journal(self) -> None:
+        self.journal = None
+        self.renamed.clear()
+        self.rejected = []
+
+    def pop_rejected(self) -> list:
+        rejected, self.rejected = self.rejected, []
+        return rejected
+
+    def open_mirror(self, account: str, path=None) -> Optional[Mirror]:
+        self.close_mirror()
+        path = path if path is not None else default_path()
+        if path is None:
+            return None
+        try:
+            self.mirror = Mirror(path, account, self.base_url)
+            urls = self.mirror.load()
+        except (sqlite3.Error, OSError):
+            self.mirror = None
+            return None
+        if urls and not self.cache.has_data:
+            self.cache.put(urls, fresh=False)
+            self.sync_mark = self.mirror.get_mark()
+        self.refresh_in_background()
+        return self.mirror
+
+    def close_mirror(self) -> None:
+        with self._state:
+            self._generation += 1
+            if self._background is not None:
+                self._background.shutdown(wait=False, cancel_futures=True)
+                self._background = None
+            self._refresh = None
+            self.sync_mark = None
+            if self.mirror is not None:
+                try:
+                    self.mirror.close()
+                except sqlite3.Error:
+                    pass
+                self.mirror = None
+
+    def refresh_in_background(self) -> Future:
+        if self._background is None:
+            self._background = ThreadPoolExecutor(max_workers=1)
+        self._refresh = self._background.submit(
+            self._background_refresh, self._generation
+        )
+        self._background.submit(self.index.build)
+        return self._refresh
+
+    def _background_refresh(self, generation: int):
+        self._local.generation = generation
+        try:
+            return self.getShortUrl(True)
+        finally:
+            self._local.generation = None
+
+    @contextmanager
+    def _current(self):
+        # yields False when a login, logout or close_mirror happened since
+        # the running background refresh started; its results are dropped
+        with self._state:
+            started = getattr(self._local, "generation", None)
+            yield started is None or started == self._generation
+
+    def start_prefetch(self) -> Future:
+        # fetches and parses the collection while the user reads the menu;
+        # a refresh already in flight is reused
+        if self._refresh is not None and not self._refresh.done():
+            return self._refresh
+        return self.refresh_in_background()
+
+    def _join_prefetch(self) -> Optional[list]:
+        # menu actions wait for the running prefetch instead of repeating it
+        pending = self._refresh
+        if pending is None or pending.done():
+            return None
+        try:
+            ok, urls = pending.result()
+        except CancelledError:
+            return None
+        return urls if ok else None
+
+    def _write_mirror(self, action: str, *args) -> None:
+        if self.mirror is None:
+            return
+        try:
+            getattr(self.mirror, action)(*args)
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def mirror_batch(self):
+        # bulk imports and deletes write the mirror in a few transactions
+        # instead of one per link
+        mirror = self.mirror
+        if mirror is None:
+            yield
+            return
+        mirror.begin_batch()
+        try:
+            yield
+        finally:
+            try:
+                mirror.end_batch()
+            except sqlite3.Error:
+                pass
+
+    def _advance_mark(self, items: list, reset: bool = False) -> None:
+        mark = None if reset else self.sync_mark
+        best = parse_datetime(mark)
+        for item in items:
+            raw = item.get("updated_at")
+            if not raw:
+                continue
+            stamp = parse_datetime(raw)
+            if best is None or stamp > best:
+                best, mark = stamp, raw
+        self.sync_mark = mark
+        self._write_mirror("set_mark", mark)
+
+    def _patch_cached(self, code: str, **changes) -> None:
+        # a new updated_at lets views keyed on it notice the local edit
+        code = self.renamed.get(code, code)
+        stamp = datetime.now(timezone.utc).replace(tzinfo=None)
+        updated = self.cache.update(code, updated_at=stamp, **changes)
+        recent = self.recent.update(code, updated_at=stamp, **changes)
+        updated = updated or recent
+        if updated is not None:
+            self._write_mirror("upsert", updated)
+
+    def _short_request(self, method: str, code: str, **kwargs):
+        code = self.renamed.get(code, code)
+        if is_local(code):
+            # created offline: edits and deletes wait behind its create
+            raise requests.ConnectionError(f"{code} is not on the server yet")
+        csrf_token = self.session.cookies.get("csrftoken")
+        return getattr(self.session, method)(
+            f"{self.base_url}/shorts/{code}/",
+            headers={"X-CSRFToken": csrf_token},
+            **kwargs,
+        )
+
+    def _queue(
+        self,
+        op: str,
+        code: str,
+        fields: Optional[dict] = None,
+        entry_id: Optional[str] = None,
+    ) -> bool:
+        # writes that cannot reach the backend wait in the journal
+        if self.journal is None:
+            return False
+        try:
+            self.journal.append(op, self.renamed.get(code, code), fields, entry_id)
+        except OSError:
+            return False
+        return True
+
+    def _create_offline(self, url: short, key: str) -> Optional[ShortUrl]:
+        fields = {
+            "target": url.target,
+            "label": url.label,
+            "expired_at": url.expired_at,
+            "private": url.private,
+        }
+        code = local_code()
+        if not self._queue("create", code, fields, key):
+            return None
+        created = ShortUrl(code=code, user=None, **fields)
+        self.cache.add(created)
+        self.recent.put(created)
+        self._write_mirror("upsert", created)
+        return created
+
+    def _edit_offline(self, code: str, **changes) -> bool:
+        if not self._queue("edit", code, changes):
+            return False
+        self._patch_cached(code, **changes)
+        return True
+
+    def _delete_offline(self, code: str) -> bool:
+        if not self._queue("delete", code):
+            return False
+        self._forget(code)
+        return True
 
+    def _forget(self, code: str) -> None:
+        code = self.renamed.get(code, code)
+        self.cache.remove(code)
+        self.recent.discard(code)
+        self._write_mirror("delete", code)
+
+    @instrumented("login")
     def login(self, username: Username, password: Password):
         response = self.session.post(
-            f"{BASE_URL}/auth/login/",
+            f"{self.base_url}/auth/login/",
             data={"username": username.value, "password": password.value},
         )
+        self.close_mirror()
+        self.close_journal()
+        self.cache.invalidate()
+        self.validators.clear()
+        self.recent.clear()
+        if response.ok:
+            self._save_session(username.value)
         return response.ok
 
+    @instrumented("logout")
     def logout(self):
         csrf_token = self.session.cookies.get("csrftoken")
         response = self.session.post(
-            f"{BASE_URL}/auth/logout/", headers={"X-CSRFToken": csrf_token}
+            f"{self.base_url}/auth/logout/", headers={"X-CSRFToken": csrf_token}
         )
 
         if response.ok:
             self.session.cookies.clear()
+            if self.sessions is not None:
+                self.sessions.clear()
+            self.close_mirror()
+            self.close_journal()
+            self.cache.invalidate()
+            self.validators.clear()
+            self.recent.clear()
         else:
             print("Logout failed")
 
+    @instrumented("register")
     def register(
         self, username: Username, password1: Password, password2: Password, email: Email
     ):
         response = self.session.post(
-            f"{BASE_URL}/auth/registration/",
+            f"{self.base_url}/auth/registration/",
             data={
                 "username": username.value,
                 "password1": password1.value,
@@ -46,13 +367,14 @@ class Backend:
             print("Registration failed:", response.status_code, response.text)
             return False
 
+    @instrumented("edit_password")
     def edit_password(self, old_pw, new_pw1, new_pw2):
         if new_pw1 != new_pw2:
             return False, "New passwords do not match"
 
         csrf_token = self.session.cookies.get("csrftoken")
         response = self.session.post(
-            f"{BASE_URL}/auth/password/change/",
+            f"{self.base_url}/auth/password/change/",
             json={
                 "old_password": old_pw,
                 "new_password1": new_pw1,
@@ -69,69 +391,106 @@ class Backend:
             except:
                 return False, response.text
 
+    @instrumented("edit_target")
     def edit_target(self, s: ShortUrl, new_target: str):
-        csrf_token = self.session.cookies.get("csrftoken")
-        response = self.session.patch(
-            f"{BASE_URL}/shorts/{s.code}/",
-            json={"target": new_target},
-            headers={"X-CSRFToken": csrf_token},
-        )
+        try:
+            response = self._short_request("patch", s.code, json={"target": new_target})
+        except (requests.ConnectionError, requests.Timeout):
+            if self._edit_offline(s.code, target=new_target):
+                return True
+            raise
+        if response.ok:
+            self._patch_cached(s.code, target=new_target)
         return response.ok
 
+    @instrumented("edit_expire")
     def edit_expire(self, s: ShortUrl, new_expire: datetime):
 
         try:
-            csrf_token = self.session.cookies.get("csrftoken")
-            response = self.session.patch(
-                f"{BASE_URL}/shorts/{s.code}/",
-                json={"expired_at": new_expire.isoformat()},
-                headers={"X-CSRFToken": csrf_token},
+            response = self._short_request(
+                "patch", s.code, json={"expired_at": new_expire.isoformat()}
             )
 
             if response.ok:
+                self._patch_cached(s.code, expired_at=new_expire)
                 return True, "Expiry updated successfully"
             else:
                 return False, f"{response.status_code}: {response.text}"
 
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if self._edit_offline(s.code, expired_at=new_expire):
+                return True, f"Expiry updated {QUEUED}"
+            return False, str(e)
         except Exception as e:
             return False, str(e)
 
+    @instrumented("edit_label")
     def edit_label(self, new_label: str, s: short):
         try:
-            csrf_token = self.session.cookies.get("csrftoken")
-            response = self.session.patch(
-                f"{BASE_URL}/shorts/{s.code}/",
+            response = self._short_request(
+                "patch",
+                s.code,
                 json={
                     "label": new_label,
                 },
-                headers={"X-CSRFToken": csrf_token},
             )
             if response.ok:
+                self._patch_cached(s.code, label=new_label)
                 return True, "Label changed successfully"
             else:
                 return False, f"{response.status_code}: {response.text}"
 
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if self._edit_offline(s.code, label=new_label):
+                return True, f"Label changed {QUEUED}"
+            return False, str(e)
         except Exception as e:
             return False, str(e)
 
+    @instrumented("edit_visibility")
     def edit_visibility(self, s: ShortUrl, scelta: bool):
-        csrf_token = self.session.cookies.get("csrftoken")
-
-        response = self.session.patch(
-            f"{BASE_URL}/shorts/{s.code}/",
-            json={"private": scelta},
-            headers={"X-CSRFToken": csrf_token},
-        )
+        try:
+            response = self._short_request("patch", s.code, json={"private": scelta})
+        except (requests.ConnectionError, requests.Timeout):
+            if self._edit_offline(s.code, private=scelta):
+                return True, f"Visibility changed {QUEUED}"
+            raise
 
         if response.ok:
+            self._patch_cached(s.code, private=scelta)
             return True, "Visibility changed successfully"
         else:
             return False, response.text
 
+    @instrumented("edit_fields")
+    def edit_fields(self, s: ShortUrl, changes: dict):
+        payload = dict(changes)
+        if isinstance(payload.get("expired_at"), datetime):
+            payload["expired_at"] = payload["expired_at"].isoformat()
+
+        try:
+            response = self._short_request("patch", s.code, json=payload)
+            if response.ok:
+                self._patch_cached(s.code, **changes)
+                return True, "URL updated successfully"
+            else:
+                return False, f"{response.status_code}: {response.text}"
+
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if self._edit_offline(s.code, **changes):
+                return True, f"URL updated {QUEUED}"
+            return False, str(e)
+        except Exception as e:
+            return False, str(e)
+
+    def edit_session(self, s: ShortUrl) -> "EditSession":
+        return EditSession(self, s)
+
+    @instrumented("edit_username")
     def edit_username(self, new_username: Username):
         csrf_token = self.session.cookies.get("csrftoken")
         response = self.session.patch(
-            f"{BASE_URL}/auth/user/",
+            f"{self.base_url}/auth/user/",
             json={"username": new_username},
             headers={"X-CSRFToken": csrf_token},
         )
@@ -143,68 +502,474 @@ class Backend:
             except:
                 return False, response.text
 
+    @instrumented("createUrl")
     def createUrl(self, url: short):
+        # a timed out POST may still have been created: the replay reuses
+        # the same key so the server recognises it
+        key = str(uuid.uuid4())
         try:
             csrf_token = self.session.cookies.get("csrftoken")
             response = self.session.post(
-                f"{BASE_URL}/shorts/",
+                f"{self.base_url}/shorts/",
                 data={
                     "target": url.target,
                     "label": url.label,
                     "expired_at": url.expired_at,
                     "private": url.private,
                 },
-                headers={"X-CSRFToken": csrf_token},
+                headers={
+                    "X-CSRFToken": csrf_token,
+                    IDEMPOTENCY_HEADER: key,
+                },
             )
             if response.ok:
                 data = response.json()
                 short_code = data.get("code")
-                short_url = f"http://localhost:8000/{short_code}"
+                created = ShortUrl(
+                    code=short_code,
+                    target=url.target,
+                    label=url.label,
+                    private=url.private,
+                    expired_at=url.expired_at,
+                    user=None,
+                )
+                self.cache.add(created)
+                self.recent.put(created)
+                self._write_mirror("upsert", created)
+                short_url = f"{self.config.site_url}/{short_code}"
                 return True, short_url
             else:
                 return False, f"{response.status_code}: {response.text}"
 
+        except (requests.ConnectionError, requests.Timeout) as e:
+            created = self._create_offline(url, key)
+            if created is not None:
+                return True, f"{created.code} {QUEUED}"
+            return False, str(e)
         except Exception as e:
             return False, str(e)
 
+    @instrumented("deleteUrl")
     def deleteUrl(self, url: ShortUrl):
         try:
-            csrf_token = self.session.cookies.get("csrftoken")
-            response = self.session.delete(
-                f"{BASE_URL}/shorts/{url.code}/", headers={"X-CSRFToken": csrf_token}
-            )
+            response = self._short_request("delete", url.code)
             if response.ok:
+                self._forget(url.code)
                 return True, "URL deleted successfully."
             else:
                 return False, f"{response.status_code}: {response.text}"
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if self._delete_offline(url.code):
+                return True, f"URL deleted {QUEUED}"
+            return False, str(e)
         except Exception as e:
             return False, str(e)
 
-    def getShortUrl(self):
+    @instrumented("replay_journal")
+    def replay_journal(self, workers: int = REPLAY_WORKERS):
+        # one request per link after coalescing, sent in parallel; an
+        # operation stays queued while the backend is unreachable and leaves
+        # the journal once the server answered, even with a refusal
+        # bound once: a logout or login meanwhile swaps self.journal
+        journal = self.journal
+        if journal is None:
+            return True, []
+        with self._replaying:
+            ops = coalesce(journal.entries())
+            settled = [i for op in ops if op["op"] is None for i in op["ids"]]
+            pending = [op for op in ops if op["op"] is not None]
+            renamed, rejected, reachable = {}, [], True
+            # pool threads commit to the cache only for the session that
+            # started the replay, like a background refresh
+            generation = getattr(self._local, "generation", None)
+            if pending:
+                with ThreadPoolExecutor(min(workers, len(pending))) as pool:
+                    outcomes = list(
+                        pool.map(self._replay, pending, repeat(generation))
+                    )
+                for op, (status, detail) in zip(pending, outcomes):
+                    if status == UNREACHABLE:
+                        reachable = False
+                        continue
+                    settled.extend(op["ids"])
+                    if status == REJECTED:
+                        rejected.append(f"{op['op']} {op['code']}: {detail}")
+                    elif op["op"] == "create":
+                        renamed[op["code"]] = detail
+            try:
+                journal.settle(settled, renamed)
+            except OSError:
+                # replaying again is safe: creates carry their idempotency key
+                pass
+            if self.journal is journal:
+                self.rejected.extend(rejected)
+        return reachable, rejected
+
+    def _replay(self, op: dict, generation: Optional[int] = None):
+        self._local.generation = generation
+        try:
+            return self._send_queued(op)
+        finally:
+            self._local.generation = None
+
+    def _send_queued(self, op: dict):
+        code = self.renamed.get(op["code"], op["code"])
+        if op["op"] != "create" and is_local(code):
+            # its create was refused or never journaled: nothing to change
+            if op["op"] == "delete":
+                return DONE, None
+            return REJECTED, "the link was never created on the server"
+        try:
+            if op["op"] == "create":
+                csrf_token = self.session.cookies.get("csrftoken")
+                response = self.session.post(
+                    f"{self.base_url}/shorts/",
+                    data=op["fields"],
+                    headers={"X-CSRFToken": csrf_token, IDEMPOTENCY_HEADER: op["id"]},
+                )
+            elif op["op"] == "edit":
+                response = self._short_request("patch", op["code"], json=op["fields"])
+            else:
+                response = self._short_request("delete", op["code"])
+        except (requests.ConnectionError, requests.Timeout) as e:
+            return UNREACHABLE, str(e)
+        except Exception as e:
+            return REJECTED, str(e)
+
+        if op["op"] == "delete" and response.status_code == 404:
+            return DONE, None
+        if not response.ok:
+            if op["op"] == "create":
+                # the local link was never accepted: drop it from the view
+                with self._current() as live:
+                    if live:
+                        self._forget(op["code"])
+            return REJECTED, f"{response.status_code}: {response.text}"
+        if op["op"] == "create":
+            code = response.json().get("code")
+            self._settle_create(op["code"], code)
+            return DONE, code
+        return DONE, None
+
+    def _settle_create(self, local: str, code: str) -> None:
+        with self._current() as live:
+            if not live:
+                return
+            self.renamed[local] = code
+            created = self.cache.rename(local, code)
+            if created is None:
+                found = self._offline_url(local)
+                created = replace(found, code=code) if found is not None else None
+            self.recent.discard(local)
+            self._write_mirror("delete", local)
+            if created is not None:
+                self.recent.put(created)
+                self._write_mirror("upsert", created)
+
+    @instrumented("get_short")
+    def get_short(self, code: str):
+        found = self.cache.lookup(code) or self.recent.get(code)
+        if found is not None:
+            return True, found
+
         try:
             csrf_token = self.session.cookies.get("csrftoken")
             response = self.session.get(
-                f"{BASE_URL}/shorts/", headers={"X-CSRFToken": csrf_token}
+                f"{self.base_url}/shorts/{code}/", headers={"X-CSRFToken": csrf_token}
             )
-
             if response.ok:
+                found = ShortUrl.from_api_batch([response.json()])[0]
+                self.recent.put(found)
+                return True, found
+            else:
+                return False, f"{response.status_code}: {response.text}"
+
+        except (requests.ConnectionError, requests.Timeout) as e:
+            found = self._offline_url(code)
+            if found is not None:
+                return True, found
+            return False, str(e)
+        except Exception as e:
+            return False, str(e)
+
+    def _conditional_headers(self, url: str) -> dict:
+        validators = self.validators.get(url)
+        if not validators or not self.cache.has_data:
+            return {}
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def _remember_validators(self, url: str, response) -> None:
+        validators = {}
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if isinstance(etag, str):
+            validators["etag"] = etag
+        if isinstance(last_modified, str):
+            validators["last_modified"] = last_modified
+        if validators:
+            self.validators[url] = validators
+        else:
+            self.validators.pop(url, None)
+
+    @instrumented("iter_short_urls")
+    def _fetch_page(self, url: str, params: dict = None):
+        csrf_token = self.session.cookies.get("csrftoken")
+        response = self.session.get(
+            url, params=params, headers={"X-CSRFToken": csrf_token}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def _pages(self, data):
+        # servers without pagination answer with the bare list
+        if isinstance(data, list):
+            yield data
+            return
+        yield data.get("results", [])
+        while data.get("next"):
+            data = self._fetch_page(data["next"])
+            yield data.get("results", [])
+
+    def _drain(self, data) -> list:
+        return [item for page in self._pages(data) for item in page]
+
+    def iter_short_urls(self, page_size: int = PAGE_SIZE, prefetch: bool = True):
+        prefetched = self._join_prefetch()
+        if prefetched is not None:
+            yield from prefetched
+            return
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        collected = []
+        raw = []
+        try:
+            data = self._fetch_page(
+                f"{self.base_url}/shorts/", {"page": 1, "page_size": page_size}
+            )
+            while True:
+                # servers without pagination answer with the bare list
+                if isinstance(data, list):
+                    items, next_url = data, None
+                else:
+                    items, next_url = data.get("results", []), data.get("next")
+
+                future = None
+                if next_url and executor is not None:
+                    future = executor.submit(self._fetch_page, next_url)
+
+                raw.extend(items)
+                for s in ShortUrl.from_api_batch(items):
+                    collected.append(s)
+                    yield s
+
+                if not next_url:
+                    break
+                data = future.result() if future else self._fetch_page(next_url)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        self.cache.put(collected)
+        self._write_mirror("replace", collected)
+        self._advance_mark(raw, reset=True)
+
+    @instrumented("getShortUrl")
+    def getShortUrl(self, refresh: bool = False):
+        if not refresh:
+            cached = self.cache.get()
+            if cached is not None:
+                return True, cached
+            # stale-while-revalidate: the mirror copy is served while the
+            # background refresh reconciles it with the server
+            stale = self.cache.has_data
+            if stale and self._refresh and not self._refresh.done():
+                return True, self.cache.peek()
+            prefetched = None if stale else self._join_prefetch()
+            if prefetched is not None:
+                return True, prefetched
+
+        if self.journal is not None and len(self.journal):
+            # queued writes go first so the server list already has them;
+            # while some cannot be sent the local view is kept instead
+            reachable, _ = self.replay_journal()
+            if not reachable:
+                local = self.cache.peek()
+                local = local if local is not None else self._offline_urls()
+                if local is not None:
+                    return True, local
+
+        if self.sync_mark is not None and self.cache.has_data:
+            return self.sync()
+
+        try:
+            url = f"{self.base_url}/shorts/"
+            csrf_token = self.session.cookies.get("csrftoken")
+            headers = {"X-CSRFToken": csrf_token}
+            headers.update(self._conditional_headers(url))
+            response = self.session.get(url, headers=headers)
+
+            if response.status_code == 304:
+                with self._current() as live:
+                    cached = self.cache.peek()
+                    if not live:
+                        return False, SUPERSEDED
+                    if cached is not None:
+                        self.cache.touch()
+                        return True, cached
+
+            if response.ok and response.status_code != 304:
                 data = response.json()
 
-                short_urls = [
-                    ShortUrl(
-                        code=item["code"],
-                        target=item["target"],
-                        label=item.get("label", ""),
-                        private=item.get("private", False),
-                        expired_at=item.get("expired_at"),
-                        user=None,
-                    )
-                    for item in data
-                ]
+                short_urls = ShortUrl.from_api_batch(data)
 
+                with self._current() as live:
+                    if not live:
+                        return False, SUPERSEDED
+                    self.cache.put(short_urls)
+                    self._remember_validators(url, response)
+                    self._write_mirror("replace", short_urls)
+                    self._advance_mark(data, reset=True)
                 return True, short_urls
             else:
                 return False, f"{response.status_code}: {response.text}"
 
+        except (requests.ConnectionError, requests.Timeout) as e:
+            offline = self._offline_urls()
+            if offline is not None:
+                return True, offline
+            return False, str(e)
+        except Exception as e:
+            return False, str(e)
+
+    @staticmethod
+    def _is_delta(items: list, since: datetime) -> bool:
+        # a server that ignores the filter answers with the whole
+        # collection, recognisable by rows older than the mark
+        for item in items:
+            if item.get("deleted"):
+                continue
+            stamp = item.get("updated_at")
+            if not stamp or parse_datetime(stamp) < since:
+                return False
+        return True
+
+    @instrumented("sync")
+    def sync(self):
+        current = self.cache.peek()
+        if current is None or self.sync_mark is None:
+            self.sync_mark = None
+            return self.getShortUrl(refresh=True)
+
+        try:
+            url = f"{self.base_url}/shorts/"
+            csrf_token = self.session.cookies.get("csrftoken")
+            headers = {"X-CSRFToken": csrf_token}
+            headers.update(self._conditional_headers(url))
+            response = self.session.get(
+                url, params={SYNC_PARAM: self.sync_mark}, headers=headers
+            )
+            if response.status_code == 304:
+                with self._current() as live:
+                    if not live:
+                        return False, SUPERSEDED
+                    self.cache.touch()
+                return True, current
+            if not response.ok:
+                return False, f"{response.status_code}: {response.text}"
+
+            items = self._drain(response.json())
+            with self._current() as live:
+                if not live:
+                    return False, SUPERSEDED
+                delta = self._is_delta(items, parse_datetime(self.sync_mark))
+                if delta:
+                    upserts = ShortUrl.from_api_batch(
+                        item for item in items if not item.get("deleted")
+                    )
+                    deleted = [item["code"] for item in items if item.get("deleted")]
+                    self.cache.merge(upserts, deleted)
+                else:
+                    fresh = ShortUrl.from_api_batch(items)
+                    known = {s.code: s for s in current}
+                    codes = {s.code for s in fresh}
+                    upserts = [s for s in fresh if known.get(s.code) != s]
+                    deleted = [code for code in known if code not in codes]
+                    self.cache.put(fresh)
+                self._remember_validators(url, response)
+                if upserts or deleted:
+                    self._write_mirror("apply", upserts, deleted)
+                self._advance_mark(items, reset=not delta)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            offline = self._offline_urls()
+            if offline is not None:
+                return True, offline
+            return False, str(e)
         except Exception as e:
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
+
+        return True, self.cache.peek()
+
+    def _offline_urls(self) -> Optional[list]:
+        if self.mirror is None:
+            return None
+        cached = self.cache.peek()
+        if cached is not None:
+            return cached
+        try:
+            return self.mirror.load()
+        except sqlite3.Error:
+            return None
+
+    def _offline_url(self, code: str) -> Optional[ShortUrl]:
+        if self.mirror is None:
+            return None
+        try:
+            return self.mirror.get(code)
+        except sqlite3.Error:
+            return None
+
+    def search(self, query: str, limit: Optional[int] = None):
+        if not self.cache.has_data:
+            ok, urls = self.getShortUrl()
+            if not ok:
+                return False, urls
+        return True, self.index.search(query, limit)
+
+
+class EditSession:
+    def __init__(self, backend: Backend, short_url: ShortUrl):
+        self.backend = backend
+        self.short_url = short_url
+        self.changes = {}
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.changes)
+
+    def set_target(self, new_target: str) -> None:
+        self.changes["target"] = new_target
+
+    def set_label(self, new_label: str) -> None:
+        self.changes["label"] = new_label
+
+    def set_visibility(self, scelta: bool) -> None:
+        self.changes["private"] = scelta
+
+    def set_expire(self, new_expire: datetime) -> None:
+        self.changes["expired_at"] = new_expire
+
+    def discard(self) -> None:
+        self.changes.clear()
+
+    def commit(self):
+        if not self.changes:
+            return True, "Nothing to update"
+        ok, msg = self.backend.edit_fields(self.short_url, self.changes)
+        if ok:
+            self.changes = {}
+        return ok, msg
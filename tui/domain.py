@@ -1,17 +1,60 @@
-import re
-from typing import Optional
+from typing import Iterable, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
 from valid8 import validate
-from typeguard import typechecked
-
-from tui.validators import pattern, is_valid_password
+from typeguard import TypeCheckError, check_type
+
+from tui.checks import typechecked, validating
+from tui.validators import (
+    EMAIL,
+    LOWERCASE_EMAIL,
+    USERNAME,
+    compiled,
+    is_valid_password,
+    pattern,
+)
+
+
+def parse_datetime(value) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    if value.endswith("Z"):
+        value = value[:-1]
+    dt = datetime.fromisoformat(value)
+    return dt if dt.tzinfo is None else dt.replace(tzinfo=None)
+
+
+SHORT_URL_SCHEMA = {
+    "code": str,
+    "target": str,
+    "label": Optional[str],
+    "private": Optional[bool],
+    "expired_at": Optional[str],
+    "created_at": Optional[str],
+    "updated_at": Optional[str],
+}
+REQUIRED_FIELDS = ("code", "target")
+
+
+def check_short_url_row(item) -> None:
+    if not isinstance(item, dict):
+        raise ValueError("Malformed short URL row: expected an object")
+    missing = [name for name in REQUIRED_FIELDS if name not in item]
+    if missing:
+        raise ValueError(f"Malformed short URL row, missing: {', '.join(missing)}")
+    for name, expected in SHORT_URL_SCHEMA.items():
+        value = item.get(name)
+        if isinstance(value, datetime):
+            continue
+        try:
+            check_type(value, expected)
+        except TypeCheckError as e:
+            raise ValueError(f"Malformed short URL row, {name} {e}") from None
 
 
 def is_email(value: str) -> bool:
-    pattern = r"^[a-z0-9._-]+@[a-z0-9-]+(\.[a-z0-9-]+)+$"
-    return bool(re.fullmatch(pattern, value))
+    return compiled(LOWERCASE_EMAIL).fullmatch(value) is not None
 
 
 @typechecked
@@ -20,12 +63,14 @@ class Username:
     value: str
 
     def __post_init__(self):
+        if not validating():
+            return
         validate(
             "Username.value",
             self.value,
             min_len=1,
             max_len=150,
-            custom=pattern(r"^[\w.@+-]+$"),
+            custom=pattern(USERNAME),
             help_msg="Username must be 1-150 characters and contain only letters, numbers, and @./+_-",
         )
 
@@ -39,6 +84,8 @@ class Password:
     value: str
 
     def __post_init__(self):
+        if not validating():
+            return
         validate(
             "Password.value",
             self.value,
@@ -54,10 +101,12 @@ class Email:
     value: str
 
     def __post_init__(self):
+        if not validating():
+            return
         validate(
             "Email.value",
             self.value,
-            custom=pattern(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$"),
+            custom=pattern(EMAIL),
             help_msg="Invalid email format",
         )
     
@@ -84,6 +133,36 @@ class ShortUrl:
     def __str__(self):
         return f"{self.code} -> {self.target}"
 
+    @classmethod
+    def from_api_batch(cls, items: Iterable[dict]) -> list:
+        # rows of one response share their shape, so the schema is checked
+        # once per shape and the instances are filled in directly
+        urls = []
+        shape = None
+        new = object.__new__
+        parse = parse_datetime
+        for item in items:
+            keys = item.keys() if isinstance(item, dict) else None
+            if keys is None or keys != shape:
+                check_short_url_row(item)
+                shape = keys
+            expired_at = item.get("expired_at")
+            created_at = item.get("created_at")
+            updated_at = item.get("updated_at")
+            s = new(cls)
+            s.__dict__.update(
+                code=item["code"],
+                label=item.get("label") or "",
+                target=item["target"],
+                user=None,
+                private=bool(item.get("private")),
+                expired_at=parse(expired_at) if expired_at else None,
+                created_at=parse(created_at) if created_at else None,
+                updated_at=parse(updated_at) if updated_at else None,
+            )
+            urls.append(s)
+        return urls
+
 
 @typechecked
 @dataclass(frozen=True)
@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+from tui.mirror import DISABLED
+
+# links created offline get a local code until the backend assigns one
+LOCAL_PREFIX = "~"
+OPERATIONS = ("create", "edit", "delete")
+
+
+def default_path(env: Optional[Mapping[str, str]] = None) -> Optional[Path]:
+    env = os.environ if env is None else env
+    value = env.get("SHORTCAT_JOURNAL")
+    if value is None:
+        return Path.home() / ".cache" / "shortcat" / "journal.jsonl"
+    if value.strip().lower() in DISABLED:
+        return None
+    return Path(value).expanduser()
+
+
+def local_code() -> str:
+    return LOCAL_PREFIX + uuid.uuid4().hex[:8]
+
+
+def is_local(code: str) -> bool:
+    return code.startswith(LOCAL_PREFIX)
+
+
+def _to_json(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _open_private(path: Path, flags: int):
+    # queued links are the user's own, kept in plaintext: owner-only
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | flags, 0o600)
+    return os.fdopen(fd, "w", encoding="utf-8")
+
+
+def coalesce(entries: Iterable[dict]) -> list:
+    # one operation per code, in the order codes were first touched:
+    # create+edit -> create, edit+edit -> edit, edit+delete -> delete and
+    # create+delete -> op None, nothing to send
+    ops = {}
+    for entry in entries:
+        code, kind = entry["code"], entry["op"]
+        fields = entry.get("fields") or {}
+        op = ops.get(code)
+        if op is None:
+            op = ops[code] = {"op": kind, "code": code, "fields": {}, "ids": []}
+        elif kind == "delete":
+            op["op"] = None if op["op"] == "create" else "delete"
+            op["fields"] = {}
+        elif kind == "create" or op["op"] is None:
+            op["op"] = kind
+        op["ids"].append(entry["id"])
+        if op["op"] in ("create", "edit"):
+            op["fields"].update(fields)
+            # a create is replayed under the id of its first entry, which is
+            # also its idempotency key
+            op.setdefault("id", entry["id"])
+    return list(ops.values())
+
+
+class Journal:
+    def __init__(self, path, account: str, backend: str):
+        self.path = Path(path)
+        self.account = account
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if self.path.exists():
+            os.chmod(self.path, 0o600)
+        self._entries = [e for e in self._read() if self._owns(e)]
+
+    def _owns(self, entry: dict) -> bool:
+        return entry.get("account") == self.account and entry.get("backend") == (
+            self.backend
+        )
+
+    def _read(self) -> list:
+        if not self.path.exists():
+            return []
+        entries = []
+        with self.path.open(encoding="utf-8") as f:
+            for text in f:
+                try:
+                    entry = json.loads(text)
+                except ValueError:
+                    # a write torn by a crash is the last line at most
+                    continue
+                if isinstance(entry, dict) and entry.get("op") in OPERATIONS:
+                    entries.append(entry)
+        return entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def entries(self) -> list:
+        with self._lock:
+            return list(self._entries)
+
+    def append(
+        self,
+        op: str,
+        code: str,
+        fields: Optional[dict] = None,
+        entry_id: Optional[str] = None,
+    ) -> dict:
+        # a create passes the idempotency key its first attempt was sent
+        # with, so a request that reached the server is not created twice
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown journal operation: {op}")
+        entry = {
+            "id": entry_id or str(uuid.uuid4()),
+            "account": self.account,
+            "backend": self.backend,
+            "op": op,
+            "code": code,
+            "fields": {k: _to_json(v) for k, v in (fields or {}).items()},
+        }
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with _open_private(self.path, os.O_APPEND) as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._entries.append(entry)
+        return entry
+
+    def settle(
+        self, ids: Iterable[str], renamed: Optional[Mapping[str, str]] = None
+    ) -> None:
+        # drops the replayed entries; entries queued meanwhile for a link
+        # that has just been created follow it to its server code
+        ids, renamed = set(ids), renamed or {}
+        if not ids and not renamed:
+            return
+        with self._lock:
+            kept = []
+            # entries of other accounts stay in the file untouched
+            for entry in self._read():
+                if entry.get("id") in ids:
+                    continue
+                if self._owns(entry) and entry.get("code") in renamed:
+                    entry["code"] = renamed[entry["code"]]
+                kept.append(entry)
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with _open_private(tmp, os.O_TRUNC) as f:
+                f.writelines(json.dumps(e) + "\n" for e in kept)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            self._entries = [e for e in kept if self._owns(e)]
@@ -1,18 +1,17 @@
-import re
-
 from dataclasses import dataclass, InitVar, field
 from typing import Callable, Any, Dict, Iterable, Optional
 from valid8 import validate
 
-from typeguard import typechecked
+from tui.checks import typechecked, validating
+from tui.validators import ALPHANUMERIC, ALPHANUMERIC_SPACE, compiled
 
 
 def is_alphanumeric(value: str) -> bool:
-    return bool(re.fullmatch(r"[a-zA-Z0-9]*", value))
+    return compiled(ALPHANUMERIC).fullmatch(value) is not None
 
 
 def is_alphanumeric_space(value: str) -> bool:
-    return bool(re.fullmatch(r"[a-zA-Z0-9 ]*", value))
+    return compiled(ALPHANUMERIC_SPACE).fullmatch(value) is not None
 
 
 @typechecked
@@ -21,6 +20,8 @@ class Key:
     value: str
 
     def __post_init__(self):
+        if not validating():
+            return
         validate(
             "Key.value", self.value, min_length=1, max_length=10, custom=is_alphanumeric
         )
@@ -35,6 +36,8 @@ class Description:
     value: str
 
     def __post_init__(self):
+        if not validating():
+            return
         validate(
             "Description.value",
             self.value,
@@ -80,7 +83,8 @@ class Menu:
     create_key: InitVar[Any] = field(default=None)
 
     def __post_init__(self, create_key: Any):
-        validate("create_key", create_key, custom=Menu.Builder.is_valid_key)
+        if validating():
+            validate("create_key", create_key, custom=Menu.Builder.is_valid_key)
 
     def _add_entry(self, value: Entry, create_key: Any) -> None:
         validate("create_key", create_key, custom=Menu.Builder.is_valid_key)
@@ -0,0 +1,130 @@
+import json
+import random
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Optional
+
+MAX_SAMPLES = 10_000
+
+_current = threading.local()
+
+
+def current_operation() -> Optional[str]:
+    return getattr(_current, "name", None)
+
+
+@contextmanager
+def operation(name: str):
+    previous = current_operation()
+    _current.name = name
+    try:
+        yield
+    finally:
+        _current.name = previous
+
+
+def instrumented(name: str):
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with operation(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def percentile(samples: list, pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class OperationStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.statuses = {}
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.samples = []
+
+    def add(self, latency, status, bytes_in, bytes_out, retries, error, rng):
+        self.count += 1
+        self.errors += error or status is None or status >= 400
+        self.retries += retries
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+        key = str(status) if status is not None else "error"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        # reservoir sampling keeps the percentiles representative in long runs
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(latency)
+        else:
+            slot = int(rng() * self.count)
+            if slot < MAX_SAMPLES:
+                self.samples[slot] = latency
+
+    def summary(self) -> dict:
+        ms = 1000
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "statuses": dict(self.statuses),
+            "latency_ms": {
+                "mean": self.total_latency / self.count * ms if self.count else 0.0,
+                "p50": percentile(self.samples, 50) * ms,
+                "p95": percentile(self.samples, 95) * ms,
+                "p99": percentile(self.samples, 99) * ms,
+                "max": self.max_latency * ms,
+            },
+        }
+
+
+class Metrics:
+    def __init__(self, rng=random.random):
+        self.rng = rng
+        self._lock = threading.Lock()
+        self._operations = {}
+
+    def record(
+        self,
+        name: str,
+        latency: float,
+        status: Optional[int] = None,
+        bytes_in: int = 0,
+        bytes_out: int = 0,
+        retries: int = 0,
+        error: bool = False,
+    ) -> None:
+        with self._lock:
+            stats = self._operations.setdefault(name, OperationStats())
+            stats.add(latency, status, bytes_in, bytes_out, retries, error, self.rng)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: s.summary() for name, s in self._operations.items()}
+
+    def get(self, name: str) -> Optional[dict]:
+        return self.snapshot().get(name)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._operations.clear()
+
+    def dump(self, path: str, **extra) -> None:
+        report = {"operations": self.snapshot(), **extra}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
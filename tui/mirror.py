@@ -0,0 +1,227 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+from tui.domain import ShortUrl
+
+DISABLED = ("", "0", "off", "false", "no")
+# single-link writes buffered by a batch are flushed at least this often
+BATCH_ROWS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS links (
+    account TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    code TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    target TEXT NOT NULL,
+    private INTEGER NOT NULL,
+    expired_at TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    PRIMARY KEY (account, backend, code)
+);
+CREATE INDEX IF NOT EXISTS links_order ON links (account, backend, position);
+CREATE TABLE IF NOT EXISTS sync (
+    account TEXT NOT NULL,
+    backend TEXT NOT NULL,
+    mark TEXT,
+    PRIMARY KEY (account, backend)
+);
+"""
+
+FIELDS = (
+    "code",
+    "label",
+    "target",
+    "private",
+    "expired_at",
+    "created_at",
+    "updated_at",
+)
+COLUMNS = ", ".join(FIELDS)
+
+
+def default_path(env: Optional[Mapping[str, str]] = None) -> Optional[Path]:
+    env = os.environ if env is None else env
+    value = env.get("SHORTCAT_MIRROR")
+    if value is None:
+        return Path.home() / ".cache" / "shortcat" / "mirror.sqlite3"
+    if value.strip().lower() in DISABLED:
+        return None
+    return Path(value).expanduser()
+
+
+def _to_text(value) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+class Mirror:
+    def __init__(self, path, account: str, backend: str):
+        self.path = Path(path)
+        self.account = account
+        self.backend = backend
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            # the links are the user's own: SQLite gives its WAL and shm
+            # files the same owner-only mode
+            os.close(os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600))
+            os.chmod(self.path, 0o600)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._db:
+            self._db.executescript(SCHEMA)
+        # code -> link to upsert, or None to delete, while a batch is open
+        self._pending = {}
+        self._batches = 0
+
+    @property
+    def _key(self) -> tuple:
+        return self.account, self.backend
+
+    def _row(self, position: int, s: ShortUrl) -> tuple:
+        return (
+            *self._key,
+            s.code,
+            position,
+            s.label,
+            s.target,
+            int(bool(s.private)),
+            _to_text(s.expired_at),
+            _to_text(s.created_at),
+            _to_text(s.updated_at),
+        )
+
+    @staticmethod
+    def _to_short_urls(rows) -> list:
+        return ShortUrl.from_api_batch(
+            dict(zip(FIELDS, (*row[:3], bool(row[3]), *row[4:]))) for row in rows
+        )
+
+    def begin_batch(self) -> None:
+        # upserts and deletes are kept in memory and written together
+        with self._lock:
+            self._batches += 1
+
+    def end_batch(self) -> None:
+        with self._lock:
+            self._batches -= 1
+            if not self._batches:
+                self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        self._write(
+            [s for s in pending.values() if s is not None],
+            [code for code, s in pending.items() if s is None],
+        )
+
+    def load(self) -> list:
+        with self._lock:
+            self._flush()
+            rows = self._db.execute(
+                f"SELECT {COLUMNS} FROM links WHERE account = ? AND backend = ? "
+                "ORDER BY position",
+                self._key,
+            ).fetchall()
+        return self._to_short_urls(rows)
+
+    def get(self, code: str) -> Optional[ShortUrl]:
+        with self._lock:
+            self._flush()
+            row = self._db.execute(
+                f"SELECT {COLUMNS} FROM links "
+                "WHERE account = ? AND backend = ? AND code = ?",
+                (*self._key, code),
+            ).fetchone()
+        return self._to_short_urls([row])[0] if row else None
+
+    def replace(self, urls: Iterable[ShortUrl]) -> None:
+        rows = [self._row(position, s) for position, s in enumerate(urls)]
+        with self._lock:
+            self._pending.clear()
+            with self._db:
+                self._db.execute(
+                    "DELETE FROM links WHERE account = ? AND backend = ?", self._key
+                )
+                self._db.executemany(
+                    "INSERT INTO links VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+
+    def upsert(self, s: ShortUrl) -> None:
+        self._buffer(s.code, s)
+
+    def delete(self, code: str) -> None:
+        self._buffer(code, None)
+
+    def _buffer(self, code: str, s: Optional[ShortUrl]) -> None:
+        with self._lock:
+            if not self._batches:
+                if s is None:
+                    self._write([], [code])
+                else:
+                    self._write([s], [])
+                return
+            self._pending[code] = s
+            if len(self._pending) >= BATCH_ROWS:
+                self._flush()
+
+    def apply(self, upserts: Iterable[ShortUrl], deleted: Iterable[str]) -> None:
+        with self._lock:
+            self._flush()
+            self._write(list(upserts), list(deleted))
+
+    def _write(self, upserts: list, deleted: list) -> None:
+        # one transaction; new codes go after the last position and links
+        # already mirrored keep theirs
+        with self._db:
+            self._db.executemany(
+                "DELETE FROM links WHERE account = ? AND backend = ? AND code = ?",
+                [(*self._key, code) for code in deleted],
+            )
+            if not upserts:
+                return
+            (start,) = self._db.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM links "
+                "WHERE account = ? AND backend = ?",
+                self._key,
+            ).fetchone()
+            self._db.executemany(
+                "INSERT INTO links VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (account, backend, code) DO UPDATE SET "
+                "label = excluded.label, target = excluded.target, "
+                "private = excluded.private, expired_at = excluded.expired_at, "
+                "created_at = excluded.created_at, updated_at = excluded.updated_at",
+                [self._row(start + i, s) for i, s in enumerate(upserts)],
+            )
+
+    def get_mark(self) -> Optional[str]:
+        with self._lock:
+            self._flush()
+            row = self._db.execute(
+                "SELECT mark FROM sync WHERE account = ? AND backend = ?", self._key
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_mark(self, mark: Optional[str]) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sync VALUES (?, ?, ?)", (*self._key, mark)
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._flush()
+            finally:
+                self._db.close()
@@ -0,0 +1,128 @@
+import shutil
+from collections.abc import Mapping, Sequence
+from itertools import islice
+from math import ceil
+from typing import Optional
+
+from tui.render import TableRenderer
+
+CHROME_LINES = 8
+
+
+def default_page_size() -> int:
+    return max(5, shutil.get_terminal_size().lines - CHROME_LINES)
+
+
+class Pager(Mapping):
+    def __init__(self, rows, page_size: Optional[int] = None, renderer=None):
+        self.page_size = page_size or default_page_size()
+        self.renderer = renderer or TableRenderer()
+        self.page = 0
+        # sequences are indexed in place, iterators are pulled as pages are shown
+        if isinstance(rows, Sequence):
+            self._rows, self._source = rows, None
+        else:
+            self._rows, self._source = [], iter(rows)
+
+    @property
+    def exhausted(self) -> bool:
+        return self._source is None
+
+    def _load(self, count: int) -> None:
+        missing = count - len(self._rows)
+        if self._source is None or missing <= 0:
+            return
+        self._rows.extend(islice(self._source, missing))
+        if len(self._rows) < count:
+            self._source = None
+
+    def _load_all(self) -> None:
+        if self._source is not None:
+            self._rows.extend(self._source)
+            self._source = None
+
+    @property
+    def page_count(self) -> Optional[int]:
+        if not self.exhausted:
+            return None
+        return max(1, ceil(len(self._rows) / self.page_size))
+
+    @property
+    def has_next(self) -> bool:
+        end = (self.page + 1) * self.page_size
+        self._load(end + 1)
+        return len(self._rows) > end
+
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 0
+
+    @property
+    def single_page(self) -> bool:
+        return self.page == 0 and not self.has_next
+
+    def next(self) -> bool:
+        if not self.has_next:
+            return False
+        self.page += 1
+        return True
+
+    def prev(self) -> bool:
+        if not self.has_prev:
+            return False
+        self.page -= 1
+        return True
+
+    def goto(self, page: int) -> None:
+        start = (page - 1) * self.page_size
+        self._load(start + 1)
+        if page < 1 or start >= max(1, len(self._rows)):
+            raise ValueError("Page out of range.")
+        self.page = page - 1
+
+    def window(self) -> list:
+        start = self.page * self.page_size
+        end = start + self.page_size
+        self._load(end)
+        end = min(end, len(self._rows))
+        return [(n + 1, self._rows[n]) for n in range(start, end)]
+
+    def render(self) -> str:
+        text = self.renderer.render(self.window())
+        if self.single_page:
+            return text
+        total = self.page_count or "?"
+        return (
+            text + f"Page {self.page + 1}/{total} - "
+            "n: next, p: previous, g <page>: go to page\n"
+        )
+
+    def handle(self, command: str) -> bool:
+        command = command.strip().lower()
+        if command == "n":
+            self.next()
+        elif command == "p":
+            self.prev()
+        elif command.startswith("g") and command[1:].strip().isdigit():
+            self.goto(int(command[1:]))
+        else:
+            return False
+        return True
+
+    def __getitem__(self, number):
+        if not isinstance(number, int) or number < 1:
+            raise KeyError(number)
+        self._load(number)
+        if number > len(self._rows):
+            raise KeyError(number)
+        return self._rows[number - 1]
+
+    def __iter__(self):
+        number = 1
+        while number in self:
+            yield number
+            number += 1
+
+    def __len__(self) -> int:
+        self._load_all()
+        return len(self._rows)
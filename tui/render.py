@@ -0,0 +1,66 @@
+import sys
+from datetime import datetime
+from typing import Iterable, Optional, TextIO
+
+from tui.domain import parse_datetime
+
+MAX_CACHED_ROWS = 200_000
+HEADER = (
+    f"{'N°':<4} | {'CODE':<10} | {'TARGET':<50} | {'LABEL':<20} | "
+    f"{'PRIVATE':<7} | {'EXPIRE':<20}"
+)
+RULE = "*" * len(HEADER)
+
+
+def truncate(text: str, width: int) -> str:
+    return (text[: width - 3] + "...") if len(text) > width else text
+
+
+def format_expiry(value) -> str:
+    if not value:
+        return "N/A"
+    if not isinstance(value, datetime):
+        value = parse_datetime(value)
+    return value.strftime("%d/%m/%Y %H:%M")
+
+
+class TableRenderer:
+    def __init__(self, max_rows: int = MAX_CACHED_ROWS):
+        self.max_rows = max_rows
+        self.formatted = 0
+        self._rows = {}
+
+    def clear(self) -> None:
+        self._rows.clear()
+
+    def format_row(self, s) -> str:
+        # rows are keyed by code and updated_at; links without a timestamp
+        # are only reused while the very same object is shown again
+        stamp = s.updated_at
+        key = (s.code, stamp if stamp is not None else id(s))
+        entry = self._rows.get(key)
+        if entry is not None and (stamp is not None or entry[0] is s):
+            return entry[1]
+
+        line = (
+            f"{s.code:<10} | {truncate(s.target, 50):<50} | "
+            f"{truncate(s.label, 20):<20} | {str(s.private):<7} | "
+            f"{format_expiry(s.expired_at):<20}"
+        )
+        if len(self._rows) >= self.max_rows:
+            self._rows.clear()
+        self._rows[key] = (s, line)
+        self.formatted += 1
+        return line
+
+    def line(self, key, s) -> str:
+        return f"{key:<4} | {self.format_row(s)}"
+
+    def render(self, rows: Iterable[tuple]) -> str:
+        lines = [RULE, HEADER, RULE]
+        lines.extend(self.line(key, s) for key, s in rows)
+        lines.append(RULE)
+        return "\n".join(lines) + "\n\n"
+
+    def write(self, rows: Iterable[tuple], out: Optional[TextIO] = None) -> None:
+        (out or sys.stdout).write(self.render(rows))
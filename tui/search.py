@@ -0,0 +1,154 @@
+import re
+import threading
+from bisect import bisect_left, insort
+from typing import Iterable, Optional
+
+from tui.domain import ShortUrl
+
+WORD = re.compile(r"[^\W_]+")
+SCHEME = re.compile(r"^[a-z][a-z0-9+.-]*://")
+# above this share of the collection, scanning in order beats sorting
+SCAN_RATIO = 16
+# prefixes shared by more tokens than this are treated as matching everything
+MAX_PREFIX_TERMS = 1024
+
+
+def tokens(s: ShortUrl) -> set:
+    # words of the label and of the target host and path
+    target = s.target.lower().split("?", 1)[0].split("#", 1)[0]
+    target = SCHEME.sub("", target, count=1)
+    return set(WORD.findall(f"{s.label.lower()} {target}"))
+
+
+class SearchIndex:
+    def __init__(self, urls: Iterable[ShortUrl] = ()):
+        self._lock = threading.RLock()
+        self.reset(urls)
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+    def reset(self, urls: Iterable[ShortUrl] = ()) -> None:
+        with self._lock:
+            self._urls = {}
+            self._order = {}
+            self._next = 0
+            # token -> codes and the sorted token list for prefix lookups,
+            # built by the first search
+            self._postings: Optional[dict] = None
+            self._terms = []
+            for s in urls:
+                self._store(s)
+
+    def apply(self, upserted: list, removed: list, reset: bool = False) -> None:
+        with self._lock:
+            if reset:
+                self.reset(upserted)
+                return
+            for code in removed:
+                s = self._urls.pop(code, None)
+                self._order.pop(code, None)
+                if s is not None and self._postings is not None:
+                    self._unindex(s)
+            for s in upserted:
+                previous = self._urls.get(s.code)
+                if previous is not None and self._postings is not None:
+                    self._unindex(previous)
+                self._store(s)
+                if self._postings is not None:
+                    self._index(s)
+
+    def _store(self, s: ShortUrl) -> None:
+        if s.code not in self._order:
+            self._order[s.code] = self._next
+            self._next += 1
+        self._urls[s.code] = s
+
+    def _index(self, s: ShortUrl) -> None:
+        for token in tokens(s):
+            codes = self._postings.get(token)
+            if codes is None:
+                codes = self._postings[token] = set()
+                insort(self._terms, token)
+            codes.add(s.code)
+
+    def _unindex(self, s: ShortUrl) -> None:
+        # emptied tokens stay in the term list, their posting is just empty
+        for token in tokens(s):
+            codes = self._postings.get(token)
+            if codes:
+                codes.discard(s.code)
+
+    def build(self) -> None:
+        with self._lock:
+            if self._postings is not None:
+                return
+            postings = {}
+            for code, s in self._urls.items():
+                for token in tokens(s):
+                    postings.setdefault(token, set()).add(code)
+            self._postings = postings
+            self._terms = sorted(postings)
+
+    def _range(self, word: str) -> tuple:
+        return (
+            bisect_left(self._terms, word),
+            bisect_left(self._terms, word + "\U0010ffff"),
+        )
+
+    def _estimate(self, word: str) -> int:
+        lo, hi = self._range(word)
+        if hi - lo > MAX_PREFIX_TERMS:
+            return len(self._urls)
+        return sum(len(self._postings[t]) for t in self._terms[lo:hi])
+
+    def _codes_for(self, word: str) -> set:
+        # may return a posting itself, which must not be modified
+        lo, hi = self._range(word)
+        postings = [self._postings[t] for t in self._terms[lo:hi]]
+        return postings[0] if len(postings) == 1 else set().union(*postings)
+
+    def _match(self, words: list) -> set:
+        matches = None
+        for codes in sorted(map(self._codes_for, words), key=len):
+            matches = codes if matches is None else matches & codes
+            if not matches:
+                break
+        return matches
+
+    def _scan(self, words: list):
+        for s in self._urls.values():
+            found = tokens(s)
+            if all(any(t.startswith(word) for t in found) for word in words):
+                yield s
+
+    def search(self, query: str, limit: Optional[int] = None) -> list:
+        query = query.strip()
+        with self._lock:
+            exact = self._urls.get(query)
+            results = [exact] if exact is not None else []
+            words = WORD.findall(query.lower())
+            if not words:
+                return results
+
+            self.build()
+            estimates = {word: self._estimate(word) for word in set(words)}
+            broad = min(estimates.values()) * SCAN_RATIO > len(self._urls)
+            if limit and broad:
+                # few results are wanted out of many: walking the collection
+                # in order stops long before the postings could be merged
+                candidates = self._scan(words)
+            else:
+                matches = self._match(list(estimates))
+                if broad:
+                    candidates = (s for s in self._urls.values() if s.code in matches)
+                else:
+                    ordered = sorted(matches, key=self._order.__getitem__)
+                    candidates = (self._urls[code] for code in ordered)
+
+            for s in candidates:
+                if limit and len(results) >= limit:
+                    break
+                if s is not exact:
+                    results.append(s)
+        return results
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Mapping, Optional
+
+# stdlib only at import time: the main menu checks for a saved session
+# before requests or cryptography are loaded
+
+SESSIONS_ENV = "SHORTCAT_SESSIONS"
+KEY_ENV = "SHORTCAT_SESSION_KEY"
+COOKIES = ("sessionid", "csrftoken")
+# Django's default SESSION_COOKIE_AGE; older files are not even decrypted
+MAX_AGE = 14 * 24 * 3600
+SUFFIX = ".session"
+KEYRING_SERVICE = "shortcat"
+KEYRING_ENTRY = "session-key"
+
+
+def default_dir(env: Optional[Mapping[str, str]] = None) -> Optional[Path]:
+    env = os.environ if env is None else env
+    value = env.get(SESSIONS_ENV)
+    if value is None:
+        return Path.home() / ".cache" / "shortcat" / "sessions"
+    # same switch values as SHORTCAT_MIRROR
+    if value.strip().lower() in ("", "0", "off", "false", "no"):
+        return None
+    return Path(value).expanduser()
+
+
+def has_saved_session(env: Optional[Mapping[str, str]] = None) -> bool:
+    directory = default_dir(env)
+    return directory is not None and any(directory.glob(f"*{SUFFIX}"))
+
+
+def _keyring_key() -> Optional[bytes]:
+    # the OS keychain, when the optional keyring package is installed
+    try:
+        import keyring
+        from keyring.errors import KeyringError
+    except ImportError:
+        return None
+    from cryptography.fernet import Fernet
+
+    try:
+        key = keyring.get_password(KEYRING_SERVICE, KEYRING_ENTRY)
+        if not key:
+            key = Fernet.generate_key().decode()
+            keyring.set_password(KEYRING_SERVICE, KEYRING_ENTRY, key)
+    except KeyringError:
+        return None
+    return key.encode()
+
+
+def _write_private(path: Path, data: bytes) -> None:
+    # owner-only from the first byte, then swapped in whole
+    tmp = path.with_name(path.name + ".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class SessionStore:
+    # the session cookies of one backend, encrypted with Fernet; the key
+    # never sits next to the files, so without one nothing is saved
+    def __init__(self, directory, backend: str, key: Optional[bytes] = None):
+        self._key = key if key is not None else self._load_key()
+        self.directory = Path(directory)
+        self.backend = backend
+        self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        name = hashlib.sha256(backend.encode()).hexdigest()[:16]
+        self.path = self.directory / f"{name}{SUFFIX}"
+
+    def _load_key(self) -> bytes:
+        key = os.environ.get(KEY_ENV)
+        if key:
+            return key.encode()
+        key = _keyring_key()
+        if key is None:
+            raise ValueError(f"Set {KEY_ENV} or install keyring to remember sessions")
+        return key
+
+    def _fernet(self):
+        from cryptography.fernet import Fernet
+
+        return Fernet(self._key)
+
+    def save(self, account: str, cookies) -> None:
+        payload = {
+            "account": account,
+            "backend": self.backend,
+            "cookies": [
+                {
+                    "name": c.name,
+                    "value": c.value,
+                    "domain": c.domain,
+                    "path": c.path,
+                    "expires": c.expires,
+                    "secure": c.secure,
+                }
+                for c in cookies
+                if c.name in COOKIES
+            ],
+        }
+        token = self._fernet().encrypt(json.dumps(payload).encode())
+        _write_private(self.path, token)
+
+    def load(self) -> Optional[dict]:
+        from cryptography.fernet import InvalidToken
+
+        if not self.path.exists():
+            return None
+        try:
+            data = self._fernet().decrypt(self.path.read_bytes(), ttl=MAX_AGE)
+            payload = json.loads(data)
+        except (InvalidToken, ValueError):
+            # expired, tampered with or written under another key
+            self.clear()
+            return None
+        if payload.get("backend") != self.backend or not payload.get("cookies"):
+            return None
+        return payload
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import tui
+
+DEFAULT_MODULE = "tui.app"
+DEFAULT_RUNS = 5
+DEFAULT_TOP = 15
+# none of these should be needed before the main menu is shown
+NETWORK_MODULES = ("requests", "urllib3", "sqlite3", "tui.client")
+
+
+def parse_importtime(text: str) -> dict:
+    # "import time: self [us] | cumulative | imported package" lines
+    modules = {}
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        modules[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return modules
+
+
+def run_importtime(module: str = DEFAULT_MODULE) -> dict:
+    env = dict(os.environ)
+    root = str(Path(tui.__file__).resolve().parent.parent)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def profile_imports(module: str = DEFAULT_MODULE, runs: int = DEFAULT_RUNS) -> dict:
+    # the fastest of several cold interpreters, module by module, so one slow
+    # run does not hide or invent a regression
+    best = {}
+    for _ in range(runs):
+        for name, (own, cumulative) in run_importtime(module).items():
+            if name not in best or cumulative < best[name][1]:
+                best[name] = (own, cumulative)
+    return {
+        "module": module,
+        "runs": runs,
+        "total_ms": best.get(module, (0, 0))[1] / 1000,
+        "network": [name for name in NETWORK_MODULES if name in best],
+        "modules": {
+            name: {"self_ms": own / 1000, "cumulative_ms": cumulative / 1000}
+            for name, (own, cumulative) in best.items()
+        },
+    }
+
+
+def format_report(profile: dict, top: int = DEFAULT_TOP) -> str:
+    heaviest = sorted(
+        profile["modules"].items(), key=lambda item: item[1]["self_ms"], reverse=True
+    )[:top]
+    lines = [
+        f"import {profile['module']}: {profile['total_ms']:.1f} ms "
+        f"(best of {profile['runs']})",
+        f"networking loaded at startup: {', '.join(profile['network']) or 'no'}",
+        "",
+        f"{'MODULE':<40} | {'SELF MS':>8} | {'CUMUL MS':>8}",
+        "-" * 62,
+    ]
+    for name, times in heaviest:
+        lines.append(
+            f"{name:<40} | {times['self_ms']:>8.1f} | {times['cumulative_ms']:>8.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,274 @@
+import sys
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from fnmatch import fnmatch
+from typing import Callable, Iterable, Optional
+
+from tui.domain import ShortUrl, check_short_url_row, parse_datetime
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+NO_TIME = -(2**63)
+
+
+def to_epoch(value) -> int:
+    value = parse_datetime(value)
+    if value is None:
+        return NO_TIME
+    return (value - EPOCH) // MICROSECOND
+
+
+def from_epoch(value: int) -> Optional[datetime]:
+    if value == NO_TIME:
+        return None
+    return EPOCH + timedelta(microseconds=value)
+
+
+class StringColumn:
+    __slots__ = ("data", "offsets")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        return self.raw(index).decode()
+
+    def raw(self, index: int) -> bytes:
+        return bytes(self.data[self.offsets[index] : self.offsets[index + 1]])
+
+    def append(self, value: str) -> None:
+        self.append_raw(value.encode())
+
+    def append_raw(self, value: bytes) -> None:
+        self.data += value
+        self.offsets.append(len(self.data))
+
+    def nbytes(self) -> int:
+        return sys.getsizeof(self.data) + sys.getsizeof(self.offsets)
+
+
+class ShortUrlRow:
+    __slots__ = ("table", "index")
+
+    user = None
+
+    def __init__(self, table: "ShortUrlTable", index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def code(self) -> str:
+        return self.table.codes[self.index]
+
+    @property
+    def label(self) -> str:
+        return self.table.labels[self.index]
+
+    @property
+    def target(self) -> str:
+        return self.table.targets[self.index]
+
+    @property
+    def private(self) -> bool:
+        return self.table.is_private(self.index)
+
+    @property
+    def expired_at(self) -> Optional[datetime]:
+        return from_epoch(self.table.expired_at[self.index])
+
+    @property
+    def created_at(self) -> Optional[datetime]:
+        return from_epoch(self.table.created_at[self.index])
+
+    @property
+    def updated_at(self) -> Optional[datetime]:
+        return from_epoch(self.table.updated_at[self.index])
+
+    @property
+    def is_expired(self) -> bool:
+        expiry = self.table.expired_at[self.index]
+        return expiry != NO_TIME and expiry <= to_epoch(datetime.now())
+
+    def to_short_url(self) -> ShortUrl:
+        return ShortUrl(
+            code=self.code,
+            label=self.label,
+            target=self.target,
+            user=None,
+            private=self.private,
+            expired_at=self.expired_at,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ShortUrlRow):
+            other = other.to_short_url()
+        if isinstance(other, ShortUrl):
+            return self.to_short_url() == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.to_short_url())
+
+    def __repr__(self) -> str:
+        return f"ShortUrlRow({self.code!r}, {self.target!r})"
+
+    def __str__(self) -> str:
+        return f"{self.code} -> {self.target}"
+
+
+class ShortUrlTable(Sequence):
+    def __init__(self, urls: Iterable = ()):
+        self.codes = StringColumn()
+        self.targets = StringColumn()
+        self.labels = StringColumn()
+        self.private = bytearray()
+        self.expired_at = array("q")
+        self.created_at = array("q")
+        self.updated_at = array("q")
+        self.extend(urls)
+
+    @classmethod
+    def from_api_batch(cls, items: Iterable[dict]) -> "ShortUrlTable":
+        table = cls()
+        table.extend_api_rows(items)
+        return table
+
+    def _append(
+        self, code, label, target, private, expired_at, created_at, updated_at
+    ) -> None:
+        index = len(self.labels)
+        self.codes.append(code)
+        self.targets.append(target)
+        self.labels.append(label or "")
+        if index % 8 == 0:
+            self.private.append(0)
+        if private:
+            self.private[index >> 3] |= 1 << (index & 7)
+        self.expired_at.append(to_epoch(expired_at))
+        self.created_at.append(to_epoch(created_at))
+        self.updated_at.append(to_epoch(updated_at))
+
+    def append(self, s) -> None:
+        self._append(
+            s.code,
+            s.label,
+            s.target,
+            s.private,
+            s.expired_at,
+            s.created_at,
+            s.updated_at,
+        )
+
+    def extend(self, urls: Iterable) -> None:
+        for s in urls:
+            self.append(s)
+
+    def extend_api_rows(self, items: Iterable[dict]) -> None:
+        shape = None
+        for item in items:
+            keys = item.keys() if isinstance(item, dict) else None
+            if keys is None or keys != shape:
+                check_short_url_row(item)
+                shape = keys
+            self._append(
+                item["code"],
+                item.get("label"),
+                item["target"],
+                item.get("private"),
+                item.get("expired_at"),
+                item.get("created_at"),
+                item.get("updated_at"),
+            )
+
+    def is_private(self, index: int) -> bool:
+        return bool(self.private[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.take(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ShortUrlTable index out of range")
+        return ShortUrlRow(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ShortUrlRow(self, index)
+
+    def take(self, indices: Iterable[int]) -> "ShortUrlTable":
+        table = type(self)()
+        for index in indices:
+            position = len(table)
+            table.codes.append_raw(self.codes.raw(index))
+            table.targets.append_raw(self.targets.raw(index))
+            table.labels.append_raw(self.labels.raw(index))
+            if position % 8 == 0:
+                table.private.append(0)
+            if self.is_private(index):
+                table.private[position >> 3] |= 1 << (position & 7)
+            table.expired_at.append(self.expired_at[index])
+            table.created_at.append(self.created_at[index])
+            table.updated_at.append(self.updated_at[index])
+        return table
+
+    def filter(self, predicate: Callable[[ShortUrlRow], bool]) -> "ShortUrlTable":
+        return self.take(row.index for row in self if predicate(row))
+
+    def expired(self, now: Optional[datetime] = None) -> "ShortUrlTable":
+        limit = to_epoch(now or datetime.now())
+        return self.take(
+            index
+            for index, expiry in enumerate(self.expired_at)
+            if expiry != NO_TIME and expiry <= limit
+        )
+
+    def with_label(self, pattern: str) -> "ShortUrlTable":
+        # links share labels, so each distinct label is matched only once
+        matches = {}
+        selected = []
+        for index in range(len(self)):
+            raw = self.labels.raw(index)
+            if raw not in matches:
+                matches[raw] = fnmatch(raw.decode(), pattern)
+            if matches[raw]:
+                selected.append(index)
+        return self.take(selected)
+
+    def sorted_by(self, field: str, reverse: bool = False) -> "ShortUrlTable":
+        keys = {
+            "code": self.codes.raw,
+            "label": self.labels.raw,
+            "target": self.targets.raw,
+            "private": self.is_private,
+            "expired_at": self.expired_at.__getitem__,
+            "updated_at": self.updated_at.__getitem__,
+        }
+        if field not in keys:
+            raise ValueError(f"Cannot sort by {field}")
+        return self.take(sorted(range(len(self)), key=keys[field], reverse=reverse))
+
+    def to_short_urls(self) -> list:
+        return [row.to_short_url() for row in self]
+
+    def nbytes(self) -> int:
+        return (
+            self.codes.nbytes()
+            + self.targets.nbytes()
+            + self.labels.nbytes()
+            + sys.getsizeof(self.private)
+            + sum(
+                sys.getsizeof(column)
+                for column in (self.expired_at, self.created_at, self.updated_at)
+            )
+        )
@@ -0,0 +1,295 @@
+import atexit
+import json
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Callable, Mapping, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from tui.metrics import Metrics, current_operation
+from tui.resilience import (
+    IDEMPOTENCY_HEADER,
+    IDEMPOTENT_METHODS,
+    NO_RETRY,
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    parse_retry_after,
+)
+
+BASE_URL = "http://localhost:8000/api/v1"
+DEFAULT_PROFILE = "local"
+ENV_PREFIX = "SHORTCAT_"
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    base_url: str = BASE_URL
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    connect_timeout: float = 3.05
+    read_timeout: float = 30.0
+    keep_alive: bool = True
+    dns_cache_ttl: float = 0.0
+    retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 10.0
+    breaker_threshold: int = 5
+    breaker_reset: float = 30.0
+    metrics_file: str = ""
+
+    def __post_init__(self):
+        if self.pool_connections < 1 or self.pool_maxsize < 1:
+            raise ValueError("Pool sizes must be at least 1")
+        if self.connect_timeout <= 0 or self.read_timeout <= 0:
+            raise ValueError("Timeouts must be positive")
+        if self.dns_cache_ttl < 0:
+            raise ValueError("DNS cache TTL cannot be negative")
+        if self.retries < 1:
+            raise ValueError("At least one attempt is required")
+        if self.breaker_threshold < 1 or self.breaker_reset < 0:
+            raise ValueError("Invalid circuit breaker settings")
+
+    @property
+    def timeout(self) -> tuple:
+        return self.connect_timeout, self.read_timeout
+
+    @property
+    def site_url(self) -> str:
+        parts = urlsplit(self.base_url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+
+PROFILES = {
+    DEFAULT_PROFILE: TransportConfig(),
+}
+
+
+def _parse_value(kind, raw: str):
+    if kind is bool:
+        lowered = raw.strip().lower()
+        if lowered in ("1", "true", "yes", "on"):
+            return True
+        if lowered in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"Invalid boolean value: {raw}")
+    if kind is int:
+        return int(raw)
+    if kind is float:
+        return float(raw)
+    return raw
+
+
+def load_profiles(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    profiles = {}
+    for name, values in data.get("profiles", {}).items():
+        try:
+            profiles[name] = TransportConfig(**values)
+        except TypeError as e:
+            raise ValueError(f"Invalid backend profile '{name}': {e}")
+    return profiles
+
+
+def load_config(env: Optional[Mapping[str, str]] = None) -> TransportConfig:
+    env = os.environ if env is None else env
+
+    profiles = dict(PROFILES)
+    path = env.get(f"{ENV_PREFIX}CONFIG")
+    if path:
+        profiles.update(load_profiles(path))
+
+    name = env.get(f"{ENV_PREFIX}PROFILE", DEFAULT_PROFILE)
+    if name not in profiles:
+        raise ValueError(f"Unknown backend profile: {name}")
+
+    overrides = {}
+    for f in fields(TransportConfig):
+        raw = env.get(f"{ENV_PREFIX}{f.name.upper()}")
+        if raw is not None:
+            overrides[f.name] = _parse_value(f.type, raw)
+    return replace(profiles[name], **overrides)
+
+
+class DnsCache:
+    def __init__(
+        self,
+        ttl: float,
+        resolver: Callable = socket.getaddrinfo,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.resolver = resolver
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def getaddrinfo(self, host, port, *args, **kwargs):
+        key = (host, port, args, tuple(sorted(kwargs.items())))
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] < self.ttl:
+                return entry[1]
+        result = self.resolver(host, port, *args, **kwargs)
+        with self._lock:
+            self._entries[key] = (now, result)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_dns_cache: Optional[DnsCache] = None
+
+
+def install_dns_cache(ttl: float) -> DnsCache:
+    # urllib3 resolves through socket.getaddrinfo, so the cache is process wide
+    global _dns_cache
+    if _dns_cache is None:
+        _dns_cache = DnsCache(ttl)
+        socket.getaddrinfo = _dns_cache.getaddrinfo
+    _dns_cache.ttl = ttl
+    return _dns_cache
+
+
+class KeepAliveAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+class TransportSession(requests.Session):
+    def __init__(self, config: TransportConfig):
+        super().__init__()
+        self.config = config
+
+        adapter_cls = KeepAliveAdapter if config.keep_alive else HTTPAdapter
+        adapter = adapter_cls(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+        )
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+        if not config.keep_alive:
+            self.headers["Connection"] = "close"
+        if config.dns_cache_ttl > 0:
+            install_dns_cache(config.dns_cache_ttl)
+
+        retry = RetryPolicy(config.retries, config.backoff, config.max_backoff)
+        self.policies = {method: retry for method in IDEMPOTENT_METHODS + ("POST",)}
+        self.breaker = CircuitBreaker(config.breaker_threshold, config.breaker_reset)
+        self.sleep = time.sleep
+
+        self.metrics = Metrics()
+        if config.metrics_file:
+            atexit.register(self.dump_metrics, config.metrics_file)
+
+    def retry_policy(self, method: str, headers: Optional[Mapping] = None):
+        method = method.upper()
+        # a POST is only replayed when the server can deduplicate it
+        if method == "POST" and not (headers or {}).get(IDEMPOTENCY_HEADER):
+            return NO_RETRY
+        return self.policies.get(method, NO_RETRY)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.config.timeout)
+        policy = self.retry_policy(method, kwargs.get("headers"))
+        name = current_operation() or f"{method.upper()} {urlsplit(url).path}"
+        started = time.perf_counter()
+
+        attempt = 0
+        while True:
+            try:
+                self.breaker.before_call()
+                response = super().request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = None
+                if not isinstance(e, CircuitOpenError):
+                    self.breaker.record_failure()
+                    delay = policy.delay(attempt)
+                if attempt + 1 >= policy.attempts or delay is None:
+                    self._record(name, started, None, attempt)
+                    raise
+            except requests.RequestException:
+                # protocol errors (broken chunking, redirect loops) are failed
+                # calls too, and must not leave a half-open probe running
+                self.breaker.record_failure()
+                self._record(name, started, None, attempt)
+                raise
+            except BaseException:
+                self.breaker.release_trial()
+                raise
+            else:
+                if response.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                delay = None
+                if (
+                    response.status_code in policy.statuses
+                    and attempt + 1 < policy.attempts
+                ):
+                    retry_after = response.headers.get("Retry-After")
+                    delay = policy.delay(attempt, parse_retry_after(retry_after))
+                if delay is None:
+                    self._record(name, started, response, attempt)
+                    return response
+                response.close()
+
+            self.sleep(delay)
+            attempt += 1
+
+    def _record(self, name, started, response, retries) -> None:
+        latency = time.perf_counter() - started
+        if response is None:
+            self.metrics.record(name, latency, retries=retries, error=True)
+            return
+        body = getattr(response.request, "body", None) or b""
+        self.metrics.record(
+            name,
+            latency,
+            status=response.status_code,
+            bytes_in=len(response.content or b""),
+            bytes_out=len(body),
+            retries=retries,
+        )
+
+    def connection_stats(self) -> dict:
+        opened = served = 0
+        # the same adapter is mounted for both schemes
+        adapters = {id(a): a for a in self.adapters.values()}.values()
+        for adapter in adapters:
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    served += pool.num_requests
+        return {
+            "connections_opened": opened,
+            "requests_sent": served,
+            "reused": max(0, served - opened),
+        }
+
+    def report(self) -> dict:
+        return {
+            "operations": self.metrics.snapshot(),
+            "connections": self.connection_stats(),
+        }
+
+    def dump_metrics(self, path: str) -> None:
+        self.metrics.dump(path, connections=self.connection_stats())
@@ -1,17 +1,46 @@
 import re
 from datetime import datetime
 from urllib.parse import urlparse
-from typing import Callable, Optional
+from typing import Callable, Iterable, Optional
 
-from typeguard import typechecked
+from tui.checks import typechecked
+
+USERNAME = r"^[\w.@+-]+$"
+EMAIL = r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$"
+LOWERCASE_EMAIL = r"^[a-z0-9._-]+@[a-z0-9-]+(\.[a-z0-9-]+)+$"
+ALPHANUMERIC = r"[a-zA-Z0-9]*"
+ALPHANUMERIC_SPACE = r"[a-zA-Z0-9 ]*"
+
+# "http(s)://" and a host of printable ASCII other than / ? # [ ], up to the
+# path, query or fragment; anything else (uppercase scheme, whitespace,
+# IPv6 brackets, non-ASCII hosts) is left to urlparse
+PLAIN_URL = r"https?://[\x21\x22\x24-\x2e\x30-\x3e\x40-\x5a\x5c\x5e-\x7e]+(?:[/?#]|\Z)"
+
+_compiled = {}
+_validators = {}
+
+
+def compiled(regex: str) -> re.Pattern:
+    # every validator pattern is compiled once and shared
+    compiled_pattern = _compiled.get(regex)
+    if compiled_pattern is None:
+        compiled_pattern = _compiled[regex] = re.compile(regex)
+    return compiled_pattern
 
 
 @typechecked
 def pattern(pattern: str) -> Callable[[str], bool]:
+    validator = _validators.get(pattern)
+    if validator is not None:
+        return validator
+
+    fullmatch = compiled(pattern).fullmatch
+
     def validator(value: str) -> bool:
-        return bool(re.fullmatch(pattern, value))
+        return fullmatch(value) is not None
 
     validator.__name__ = f"pattern ({pattern})"
+    _validators[pattern] = validator
 
     return validator
 
@@ -22,9 +51,7 @@ def is_valid_password(value: str) -> bool:
 
 
 def is_email(value: str) -> bool:
-
-    pattern = r"^[a-z0-9._-]+@[a-z0-9-]+(\.[a-z0-9-]+)+$"
-    if not re.fullmatch(pattern, value):
+    if not compiled(LOWERCASE_EMAIL).fullmatch(value):
         raise ValueError("Invalid email format")
     return True
 
@@ -32,6 +59,8 @@ def is_email(value: str) -> bool:
 def validate_url(url: str) -> str:
     if not url:
         raise ValueError("URL cannot be empty")
+    if compiled(PLAIN_URL).match(url):
+        return url
     parsed = urlparse(url)
     if parsed.scheme not in ("http", "https"):
         raise ValueError("URL must start with http:// or https://")
@@ -40,6 +69,21 @@ def validate_url(url: str) -> str:
     return url
 
 
+def validate_each(validator: Callable, values: Iterable) -> list:
+    # (True, value) or (False, error message) for every item, in order
+    results = []
+    for value in values:
+        try:
+            results.append((True, validator(value)))
+        except ValueError as e:
+            results.append((False, str(e)))
+    return results
+
+
+def validate_urls(urls: Iterable[str]) -> list:
+    return validate_each(validate_url, urls)
+
+
 def validate_label(label: str) -> str:
     if not label:
         raise ValueError("Label cannot be empty")